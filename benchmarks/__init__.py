@@ -0,0 +1,3 @@
+"""
+Performance benchmarks. Run each module with ``python -m benchmarks.<name>``.
+"""
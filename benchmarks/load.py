@@ -0,0 +1,361 @@
+"""
+Load test of the cart and inventory APIs: a mix of shopper actions at fixed concurrency.
+
+    python -m benchmarks.load --items 100000 --concurrency 50 --duration 20
+    python -m benchmarks.load --output bench.json --baseline baseline.json
+
+Each of ``--concurrency`` virtual shoppers has its own cart and loops over
+actions drawn from ``--mix``: viewing an item, browsing a category page,
+viewing the cart, and adding, updating or removing cart lines. Shoppers
+track their cart, so updates and removals target lines they hold (an empty
+cart adds instead). Popular items are picked more often (``--skew``).
+
+By default both apps run in-process behind httpx's ASGI transport, with the
+cart service calling inventory in-process too, against a seeded SQLite or
+TinyDB catalog of ``--items`` items. The shoppers share the event loop with
+the apps then, so latencies include waiting for it. Pass --cart-url and
+--inventory-url to drive running services instead; their catalog is read
+from the inventory.
+
+Throughput and p50/p95/p99 latencies are reported per action and overall,
+after ``--warmup`` seconds that are not counted. ``--output`` saves them as
+JSON; ``--baseline`` compares against a saved run and exits with status 1
+when throughput fell, or p99 rose, by more than ``--tolerance``.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+import httpx
+from tinydb import TinyDB
+
+from benchmarks.search import build_catalog
+from inventory_service.db import InventoryStorage, use_storage
+from inventory_service.db.sqlite_storage import SQLiteStorage
+from inventory_service.db.tinydb_storage import TinyDBStorage
+
+ACTIONS = ("view_item", "browse", "view_cart", "add", "update", "remove")
+DEFAULT_MIX = "view_item=35,browse=10,view_cart=20,add=20,update=10,remove=5"
+# Actions that need a line in the cart; shoppers with an empty cart add instead.
+NEEDS_LINE = {"update", "remove"}
+PAGE_SIZE = 20
+STOCK = 1_000_000  # never the bottleneck: every add succeeds
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for part in text.split(","):
+        action, _, weight = part.partition("=")
+        action = action.strip()
+        if action not in ACTIONS:
+            raise argparse.ArgumentTypeError(f"unknown action '{action}' (one of {ACTIONS})")
+        mix[action] = float(weight)
+    if sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError("the mix needs a positive weight")
+    return mix
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput": round(len(ordered) / elapsed, 1),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+    }
+
+
+class Recorder:
+    """Latencies and errors per action, counted only once the warmup is over."""
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = {action: [] for action in ACTIONS}
+        self.errors: dict[str, int] = dict.fromkeys(ACTIONS, 0)
+        self.counting = False
+
+    def record(self, action: str, seconds: float, ok: bool) -> None:
+        if not self.counting:
+            return
+        self.latencies[action].append(seconds)
+        if not ok:
+            self.errors[action] += 1
+
+    def report(self, elapsed: float) -> dict[str, Any]:
+        actions = {
+            action: summarize(latencies, self.errors[action], elapsed)
+            for action, latencies in self.latencies.items()
+            if latencies
+        }
+        every = list(itertools.chain.from_iterable(self.latencies.values()))
+        return {"actions": actions, "total": summarize(every, sum(self.errors.values()), elapsed)}
+
+
+class Shopper:
+    """One virtual user: a cart of its own and a loop of weighted actions."""
+
+    def __init__(
+        self,
+        user_id: str,
+        cart: httpx.AsyncClient,
+        inventory: httpx.AsyncClient,
+        items: list[str],
+        weights: list[float],
+        categories: list[int],
+        mix: dict[str, float],
+        rng: random.Random,
+    ) -> None:
+        self.user_id = user_id
+        self.cart = cart
+        self.inventory = inventory
+        self.items = items
+        self.weights = weights  # cumulative, for rng.choices
+        self.categories = categories
+        self.actions = list(mix)
+        self.action_weights = list(mix.values())
+        self.rng = rng
+        self.lines: dict[str, int] = {}
+
+    def _item(self) -> str:
+        return self.rng.choices(self.items, cum_weights=self.weights)[0]
+
+    def _action(self) -> tuple[str, Callable[[], Awaitable[httpx.Response]]]:
+        action = self.rng.choices(self.actions, self.action_weights)[0]
+        if action in NEEDS_LINE and not self.lines:
+            action = "add"
+        user = self.user_id
+        if action == "view_item":
+            item = self._item()
+            return action, lambda: self.inventory.get(f"/items/{item}")
+        if action == "browse":
+            category = self.rng.choice(self.categories)
+            url = f"/categories/{category}/items?limit={PAGE_SIZE}&sort=price"
+            return action, lambda: self.inventory.get(url)
+        if action == "view_cart":
+            return action, lambda: self.cart.get(f"/cart/{user}")
+        if action == "add":
+            item = self._item()
+            self.lines[item] = self.lines.get(item, 0) + 1
+            body = {"item_id": item, "quantity": 1}
+            return action, lambda: self.cart.post(f"/cart/{user}/add", json=body)
+        item = self.rng.choice(list(self.lines))
+        if action == "update":
+            quantity = self.lines[item] = self.rng.randint(1, 3)
+            body = {"quantity": quantity}
+            return action, lambda: self.cart.put(f"/cart/{user}/update/{item}", json=body)
+        del self.lines[item]
+        return action, lambda: self.cart.delete(f"/cart/{user}/remove/{item}")
+
+    async def run(self, recorder: Recorder, stop: float) -> None:
+        while time.perf_counter() < stop:
+            action, call = self._action()
+            started = time.perf_counter()
+            try:
+                ok = (await call()).status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            recorder.record(action, time.perf_counter() - started, ok)
+
+
+def seed(backend: str, workdir: Path, items: int) -> tuple[InventoryStorage, list[dict[str, Any]]]:
+    catalog = build_catalog(items, seed=42)
+    for category in catalog:
+        for item in category["items"]:
+            item["stock"] = STOCK
+    storage: InventoryStorage
+    if backend == "sqlite":
+        storage = SQLiteStorage(str(workdir / "bench.sqlite3"))
+    else:
+        storage = TinyDBStorage(TinyDB(workdir / "bench.json"))
+    storage.replace_all(catalog)
+    return storage, catalog
+
+
+async def read_catalog(inventory: httpx.AsyncClient, items: int) -> list[dict[str, Any]]:
+    """Up to ``items`` item ids of a running inventory service, spread over its categories."""
+    categories = (await inventory.get("/categories")).raise_for_status().json()["categories"]
+    per_category = max(1, items // max(len(categories), 1))
+    catalog = []
+    for category in categories:
+        rows: list[dict[str, Any]] = []
+        params: dict[str, Any] = {"limit": min(per_category, 500)}
+        while len(rows) < per_category:
+            response = await inventory.get(f"/categories/{category['id']}/items", params=params)
+            page = response.raise_for_status().json()
+            rows.extend(page["items"])
+            if "next_cursor" not in page:
+                break
+            params["cursor"] = page["next_cursor"]
+        catalog.append({"id": category["id"], "items": rows[:per_category]})
+    return catalog
+
+
+async def drive(
+    args: argparse.Namespace,
+    cart: httpx.AsyncClient,
+    inventory: httpx.AsyncClient,
+    catalog: list[dict[str, Any]],
+) -> dict[str, Any]:
+    items = [item["id"] for category in catalog for item in category["items"]]
+    if not items:
+        raise SystemExit("The catalog has no items.")
+    # Zipf-like popularity: the n-th item is picked in proportion to 1 / n ** skew.
+    weights = list(itertools.accumulate(1 / n**args.skew for n in range(1, len(items) + 1)))
+    random.Random(args.seed).shuffle(items)
+    categories = [category["id"] for category in catalog]
+    shoppers = [
+        Shopper(
+            f"bench-{args.seed}-{n}",
+            cart,
+            inventory,
+            items,
+            weights,
+            categories,
+            args.mix,
+            random.Random(args.seed * 100_003 + n),
+        )
+        for n in range(args.concurrency)
+    ]
+    recorder = Recorder()
+    started = time.perf_counter()
+    stop = started + args.warmup + args.duration
+    tasks = [asyncio.create_task(shopper.run(recorder, stop)) for shopper in shoppers]
+    await asyncio.sleep(args.warmup)
+    recorder.counting = True
+    counted_from = time.perf_counter()
+    await asyncio.gather(*tasks)
+    return recorder.report(time.perf_counter() - counted_from)
+
+
+async def run_in_process(args: argparse.Namespace) -> dict[str, Any]:
+    from cart_service.dependency import get_event_publisher
+    from cart_service.main import app as cart_app
+    from common.inventory_client import InventoryClient
+    from inventory_service.main import app as inventory_app
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage, catalog = seed(args.backend, Path(tmp), args.items)
+        use_storage(storage)
+        # The apps' lifespans are not run: the cart's client is wired to inventory here.
+        client = InventoryClient(transport=httpx.ASGITransport(app=inventory_app))
+        cart_app.state.inventory_client = client
+        cart_app.state.cache_invalidator = None
+        await get_event_publisher().start()
+        cart = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=cart_app), base_url="http://cart"
+        )
+        inventory = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=inventory_app), base_url="http://inventory"
+        )
+        try:
+            return await drive(args, cart, inventory, catalog)
+        finally:
+            await cart.aclose()
+            await inventory.aclose()
+            await client.aclose()
+            await get_event_publisher().aclose()
+            storage.close()
+
+
+async def run_over_http(args: argparse.Namespace) -> dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with (
+        httpx.AsyncClient(base_url=args.cart_url, limits=limits, timeout=30) as cart,
+        httpx.AsyncClient(base_url=args.inventory_url, limits=limits, timeout=30) as inventory,
+    ):
+        catalog = await read_catalog(inventory, args.items)
+        return await drive(args, cart, inventory, catalog)
+
+
+def compare(result: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Lines describing how ``result`` moved from ``baseline``; regressions are marked."""
+    lines = []
+    rows = {**result["actions"], "total": result["total"]}
+    before_rows = {**baseline["actions"], "total": baseline["total"]}
+    for name, now in rows.items():
+        before = before_rows.get(name)
+        if not before or not before["throughput"] or not before["p99_ms"]:
+            continue
+        throughput = now["throughput"] / before["throughput"] - 1
+        p99 = now["p99_ms"] / before["p99_ms"] - 1
+        regressed = throughput < -tolerance or p99 > tolerance
+        lines.append(
+            f"{'REGRESSION ' if regressed else ''}{name}: throughput {throughput:+.1%}, "
+            f"p99 {p99:+.1%}"
+        )
+    return lines
+
+
+def print_report(result: dict[str, Any]) -> None:
+    columns = ("requests", "errors", "req/s", "p50", "p95", "p99")
+    print(f"{'action':<10} " + " ".join(f"{c:>{7 if c == 'errors' else 9}}" for c in columns))
+    rows = {**result["actions"], "total": result["total"]}
+    for name, row in rows.items():
+        print(
+            f"{name:<10} {row['requests']:>9} {row['errors']:>7} {row['throughput']:>9,.0f} "
+            f"{row['p50_ms']:>7.2f}ms {row['p95_ms']:>7.2f}ms {row['p99_ms']:>7.2f}ms"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=10_000, help="catalog size")
+    parser.add_argument("--backend", choices=["tinydb", "sqlite"], default="sqlite")
+    parser.add_argument("--concurrency", type=int, default=50, help="shoppers at a time")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds measured")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds not measured")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--skew", type=float, default=1.0, help="0: every item equally popular")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cart-url", default=None)
+    parser.add_argument("--inventory-url", default=None)
+    parser.add_argument("--output", type=Path, default=None, help="save the results as JSON")
+    parser.add_argument("--baseline", type=Path, default=None, help="results to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+    if (args.cart_url is None) != (args.inventory_url is None):
+        parser.error("--cart-url and --inventory-url go together")
+
+    over_http = args.cart_url is not None
+    result = asyncio.run(run_over_http(args) if over_http else run_in_process(args))
+    result["settings"] = {
+        "target": "http" if over_http else "in-process",
+        "backend": None if over_http else args.backend,
+        "items": args.items,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "mix": args.mix,
+        "skew": args.skew,
+        "seed": args.seed,
+    }
+    print_report(result)
+    if args.output is not None:
+        args.output.write_text(json.dumps(result, indent=2) + "\n")
+        print(f"saved to {args.output}")
+    if args.baseline is not None:
+        lines = compare(result, json.loads(args.baseline.read_text()), args.tolerance)
+        print(f"against {args.baseline} (tolerance {args.tolerance:.0%}):")
+        print("\n".join(lines))
+        if any(line.startswith("REGRESSION") for line in lines):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Reservation throughput under contention: N concurrent clients reserving one SKU.
+
+    python -m benchmarks.reservations --clients 1000 --backend sqlite
+
+The inventory app runs in-process behind httpx's ASGI transport, so the numbers
+measure the route, the reservation writer and the storage backend, not the network.
+Pass --url to drive a running inventory service instead (it must have --sku).
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from tinydb import TinyDB
+
+from inventory_service.db import InventoryStorage, use_storage
+from inventory_service.db.sqlite_storage import SQLiteStorage
+from inventory_service.db.tinydb_storage import TinyDBStorage
+
+SKU = "1-1"
+
+
+def seed(backend: str, workdir: Path, stock: int) -> InventoryStorage:
+    storage: InventoryStorage
+    if backend == "sqlite":
+        storage = SQLiteStorage(str(workdir / "bench.sqlite3"))
+    else:
+        storage = TinyDBStorage(TinyDB(workdir / "bench.json"))
+    storage.replace_all(
+        [
+            {
+                "id": 1,
+                "name": "Footwear",
+                "items": [
+                    {
+                        "id": SKU,
+                        "name": "Hot Sneaker",
+                        "description": "Everyone wants one",
+                        "price": 99.0,
+                        "stock": stock,
+                    }
+                ],
+            }
+        ]
+    )
+    return storage
+
+
+async def client_loop(
+    ac: httpx.AsyncClient, sku: str, requests: int, latencies: list[float], outcomes: list[int]
+) -> None:
+    for _ in range(requests):
+        start = time.perf_counter()
+        r = await ac.post(f"/items/{sku}/reserve", json={"quantity": 1, "ttl_seconds": 600})
+        latencies.append(time.perf_counter() - start)
+        outcomes.append(r.status_code)
+
+
+async def run(args: argparse.Namespace) -> None:
+    latencies: list[float] = []
+    outcomes: list[int] = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.url:
+            transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(max_connections=args.clients)
+            )
+            base_url = args.url
+            storage = None
+        else:
+            from inventory_service.main import app
+
+            storage = seed(args.backend, Path(tmp), args.stock)
+            use_storage(storage)
+            transport = httpx.ASGITransport(app=app)
+            base_url = "http://bench"
+
+        async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60) as ac:
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    client_loop(ac, args.sku, args.requests, latencies, outcomes)
+                    for _ in range(args.clients)
+                )
+            )
+            elapsed = time.perf_counter() - start
+
+        reserved = outcomes.count(201)
+        latencies.sort()
+        print(f"backend={args.url or args.backend} clients={args.clients}")
+        print(f"requests={len(outcomes)} reserved={reserved} sold_out={outcomes.count(409)}")
+        print(f"elapsed={elapsed:.3f}s throughput={len(outcomes) / elapsed:,.0f} req/s")
+        print(
+            f"p50={statistics.median(latencies) * 1000:.2f}ms "
+            f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f}ms"
+        )
+        if storage is not None:
+            item = storage.find_item(args.sku)
+            remaining = item["stock"] if item else 0
+            assert remaining == args.stock - reserved, "stock does not match reservations"
+            print(f"remaining_stock={remaining} (consistent)")
+            storage.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=5, help="reservations per client")
+    parser.add_argument("--stock", type=int, default=4000)
+    parser.add_argument("--backend", choices=["tinydb", "sqlite"], default="sqlite")
+    parser.add_argument("--sku", default=SKU)
+    parser.add_argument("--url", default=None)
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Read-path throughput with and without SERVER_FAST_RESPONSES.
+
+    python -m benchmarks.responses --items 500 --cart-lines 50
+
+Serves ``GET /categories/{id}/items`` and ``GET /cart/{user_id}`` in-process
+behind httpx's ASGI transport and reports requests/sec for each route, first
+through the validating ``response_model`` path and then with the fast path
+(cached orjson payloads for the catalog, one pydantic dump for the cart).
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks.search import build_catalog
+from cart_service.dependency import get_cart_store
+from cart_service.models import Cart, CartItem
+from common import config
+from common.config import ServerConfig
+from common.serialization import ORJSON_ENABLED
+from inventory_service.db import use_storage
+from inventory_service.db.sqlite_storage import SQLiteStorage
+from inventory_service.providers.apparel_vocabulary import TYPES_BY_CATEGORY
+
+USER_ID = "bench-user"
+
+
+async def throughput(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as ac:
+        (await ac.get(path)).raise_for_status()  # warm caches and lazy imports
+
+        async def client(count: int) -> None:
+            for _ in range(count):
+                (await ac.get(path)).raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client(requests // concurrency) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return (requests // concurrency) * concurrency / elapsed
+
+
+async def run(args: argparse.Namespace) -> None:
+    from cart_service.main import app as cart_app
+    from inventory_service.main import app as inventory_app
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # build_catalog spreads items over every apparel type; keep the first category.
+        catalog = build_catalog(args.items * len(TYPES_BY_CATEGORY), seed=42)[:1]
+        storage = SQLiteStorage(str(Path(tmp) / "bench.sqlite3"))
+        storage.replace_all(catalog)
+        use_storage(storage)
+
+        lines = [
+            CartItem(item_id=f"1-{n}", name=f"Item {n}", quantity=1 + n % 3, price=9.99)
+            for n in range(1, args.cart_lines + 1)
+        ]
+        await get_cart_store().save(USER_ID, Cart(items=lines))
+
+        targets = [
+            (inventory_app, f"/categories/{catalog[0]['id']}/items"),
+            (cart_app, f"/cart/{USER_ID}"),
+        ]
+        print(f"orjson: {'yes' if ORJSON_ENABLED else 'no (stdlib json)'}")
+        for app, path in targets:
+            rates = {}
+            for fast in (False, True):
+                config.server_setting = ServerConfig(SERVER_FAST_RESPONSES=fast)
+                rates[fast] = await throughput(app, path, args.requests, args.concurrency)
+            print(
+                f"GET {path}: {rates[False]:,.0f} req/s -> {rates[True]:,.0f} req/s "
+                f"({rates[True] / rates[False]:.2f}x)"
+            )
+        storage.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, default=500, help="items in the listed category")
+    parser.add_argument("--cart-lines", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per route and mode")
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
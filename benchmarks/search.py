@@ -0,0 +1,90 @@
+"""
+Search latency on a synthetic catalog.
+
+    python -m benchmarks.search --items 500000
+
+Builds a catalog from the apparel provider's vocabulary, indexes it and times
+``SearchIndex.search`` for a mix of whole-word, prefix and multi-word queries,
+with the result cache disabled so every query is answered cold.
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Any
+
+from inventory_service.core.search import SearchIndex
+from inventory_service.providers.apparel_vocabulary import ADJECTIVES, TYPES_BY_CATEGORY
+
+QUERIES = [
+    "tee",
+    "classic",
+    "classic tee",
+    "premium hoodie",
+    "run",
+    "jack",
+    "heritage wool coat",
+    "sneakers",
+    "comfort",
+    "urban den",
+    "leggings athletic",
+    "tuxedo",
+]
+
+
+def build_catalog(items: int, seed: int) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    names = list(TYPES_BY_CATEGORY)
+    per_category = max(1, items // len(names))
+    catalog = []
+    for cid, category in enumerate(names, start=1):
+        types = TYPES_BY_CATEGORY[category]
+        rows = []
+        for iid in range(1, per_category + 1):
+            name = f"{rng.choice(ADJECTIVES)} {rng.choice(types)}"
+            rows.append(
+                {
+                    "id": f"{cid}-{iid}",
+                    "name": name,
+                    "description": f"{name} designed for comfort and everyday wear.",
+                    "price": 10.0,
+                    "stock": 5,
+                }
+            )
+        catalog.append({"id": cid, "name": category, "items": rows})
+    return catalog
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, default=500_000)
+    parser.add_argument("--rounds", type=int, default=50, help="passes over the query mix")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    catalog = build_catalog(args.items, args.seed)
+    index = SearchIndex(cache_size=0)
+    start = time.perf_counter()
+    index.build(catalog)
+    print(f"indexed {len(index)} items in {time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(args.seed)
+    latencies: list[float] = []
+    for _ in range(args.rounds):
+        for query in QUERIES:
+            offset = rng.choice([0, 0, 0, args.limit, 10 * args.limit])
+            start = time.perf_counter()
+            index.search(query, offset, args.limit)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    cuts = statistics.quantiles(latencies, n=100)
+    print(
+        f"{len(latencies)} queries: p50={cuts[49]:.2f}ms p95={cuts[94]:.2f}ms "
+        f"p99={cuts[98]:.2f}ms max={max(latencies):.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
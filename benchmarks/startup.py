@@ -0,0 +1,61 @@
+"""
+Import time of each package, measured in fresh interpreters.
+
+    python -m benchmarks.startup --repeat 5
+
+Every module is imported in its own ``python -c`` process, so nothing is
+cached between measurements; the median of ``--repeat`` runs is reported.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "common.config",
+    "common.inventory_client",
+    "inventory_service",
+    "inventory_service.db",
+    "inventory_service.core",
+    "inventory_service.main",
+    "cart_service",
+    "cart_service.store",
+    "cart_service.main",
+]
+
+_SNIPPET = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - start\n"
+    "heavy = [m for m in ('fastapi', 'faker', 'tinydb') if m in sys.modules]\n"
+    "print(elapsed, ','.join(heavy) or '-')\n"
+)
+
+
+def measure(module: str) -> tuple[float, str]:
+    out = subprocess.run(
+        [sys.executable, "-c", _SNIPPET.format(module=module)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    return float(out[0]), out[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    print(f"{'module':<28} {'median ms':>10}  heavy deps loaded")
+    for module in args.modules:
+        runs = [measure(module) for _ in range(args.repeat)]
+        median = statistics.median(seconds for seconds, _ in runs) * 1000
+        print(f"{module:<28} {median:>10.1f}  {runs[-1][1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,25 @@
 Cart Service package.
 """
 
+from typing import TYPE_CHECKING, Any
+
 __version__ = "0.1.0"
 
-# Optional convenience export
-from .main import app  # noqa: F401
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+    from .main import create_app
+
+    app: FastAPI
+
+__all__ = ["app", "create_app", "__version__"]
+
+
+def __getattr__(name: str) -> Any:
+    # The app (and FastAPI with it) is only imported when asked for, so
+    # importing a submodule such as cart_service.store stays cheap.
+    if name in ("app", "create_app"):
+        from . import main
 
-__all__ = ["app", "__version__"]
+        return getattr(main, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,30 +1,79 @@
 from collections.abc import AsyncGenerator
+from typing import cast
 
+from fastapi import Depends, Request
+
+from cart_service.locks import KeyedLocks, get_cart_locks
 from cart_service.models import Cart
-from common.inventory_client import InventoryClient
+from cart_service.store import CartStore, InMemoryCartStore, RedisCartStore
+from common import config
+from common.events import EventPublisher, create_event_publisher
+from common.inventory_client import CacheInvalidator, InventoryClient
+
+_cart_store: CartStore | None = None
+_event_publisher: EventPublisher | None = None
+
 
-# Simulating a user-based cart store for demonstration.
-# In a real application, this would be a database or cache.
-_cart_store: dict[str, Cart] = {}
+def create_cart_store(backend: str | None = None) -> CartStore:
+    """
+    Build the cart store named by ``backend`` or CART_STORE_BACKEND.
+    """
+    settings = config.cart_store_setting
+    backend = (backend or settings.CART_STORE_BACKEND).lower()
+    ttl = settings.CART_TTL_SECONDS
+    if backend == "memory":
+        return InMemoryCartStore(ttl)
+    if backend == "redis":
+        return RedisCartStore.from_url(settings.CART_REDIS_URL, ttl)
+    raise ValueError(f"Unknown cart store backend '{backend}'.")
+
+
+def get_cart_store() -> CartStore:
+    """
+    Provides the process-wide cart store.
+    """
+    global _cart_store
+    if _cart_store is None:
+        _cart_store = create_cart_store()
+    return _cart_store
+
+
+def get_event_publisher() -> EventPublisher:
+    """
+    Provides the process-wide publisher for cart events (EVENTS_* settings).
+    """
+    global _event_publisher
+    if _event_publisher is None:
+        _event_publisher = create_event_publisher()
+    return _event_publisher
+
+
+async def get_inventory_client(request: Request) -> InventoryClient:
+    """
+    Provides the process-wide InventoryClient created in the app lifespan.
+    """
+    return cast(InventoryClient, request.app.state.inventory_client)
 
 
-async def get_inventory_client() -> AsyncGenerator:
+async def get_cache_invalidator(request: Request) -> CacheInvalidator | None:
     """
-    Provides a singleton instance of the InventoryClient.
+    Provides the consumer keeping the InventoryClient's caches fresh, if running.
     """
-    print("Creating InventoryClient...")
-    client = InventoryClient()
-    try:
-        yield client
-    finally:
-        print("Closing InventoryClient...")
-        await client.aclose()
+    return cast(CacheInvalidator | None, getattr(request.app.state, "cache_invalidator", None))
 
 
-async def get_user_cart(user_id: str) -> Cart:
+async def get_user_cart(
+    user_id: str,
+    store: CartStore = Depends(get_cart_store),
+    locks: KeyedLocks = Depends(get_cart_locks),
+) -> AsyncGenerator[Cart, None]:
     """
-    Provides a user's cart from the simulated store.
+    Provides a user's cart from the cart store, or a new empty cart.
+    The user's lock is held until the request handler has finished, so the
+    read-modify-save of concurrent requests for one user cannot interleave
+    within this process. Writers in other processes are caught by the store's
+    version check instead.
     """
-    if user_id not in _cart_store:
-        _cart_store[user_id] = Cart(items=[])
-    return _cart_store[user_id]
+    async with locks.hold(user_id):
+        cart = await store.get(user_id)
+        yield cart if cart is not None else Cart(items=[])
@@ -1,7 +1,77 @@
-from fastapi import FastAPI
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 
-from cart_service.routers import cart
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
-app = FastAPI(title="Cart Service")
+from cart_service.dependency import get_cart_store, get_event_publisher
+from cart_service.middleware import DeadlineMiddleware
+from cart_service.routers import cart, stats
+from common import config
+from common.inventory_client import (
+    CacheInvalidator,
+    CircuitOpenError,
+    DeadlineExceeded,
+    InventoryClient,
+)
+from common.metrics.asgi import MetricsMiddleware, metrics
+from common.profiling.asgi import ProfilingMiddleware
+from common.tracing import get_tracer
+from common.tracing.asgi import TracingMiddleware
 
-app.include_router(cart.router, prefix="", tags=["Cart"])
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    # One pooled client for the whole process, reused by every request.
+    client = app.state.inventory_client = InventoryClient()
+    await get_event_publisher().start()
+    app.state.cache_invalidator = None
+    if config.inventory_api_setting.INVENTORY_CACHE_INVALIDATION and (
+        client.cache is not None or client.validators is not None
+    ):
+        # Inventory events arrive through the same broker cart events go to.
+        app.state.cache_invalidator = CacheInvalidator(client, get_event_publisher().broker)
+        await app.state.cache_invalidator.start()
+    yield
+    if app.state.cache_invalidator is not None:
+        await app.state.cache_invalidator.aclose()
+    await client.aclose()
+    await get_cart_store().aclose()
+    await get_event_publisher().aclose()  # sends what is still buffered
+    get_tracer().shutdown()
+
+
+async def inventory_unavailable(request: Request, exc: Exception) -> JSONResponse:
+    """
+    503 while the inventory circuit is open, 504 when the request's deadline
+    ran out waiting for inventory, instead of a generic 500.
+    """
+    if isinstance(exc, CircuitOpenError):
+        return JSONResponse(
+            {"detail": str(exc)},
+            status_code=503,
+            headers={"Retry-After": str(max(round(exc.retry_after), 1))},
+        )
+    return JSONResponse({"detail": str(exc)}, status_code=504)
+
+
+def create_app() -> FastAPI:
+    """
+    Build the cart app. The inventory client, cart store and event publisher
+    are created in the lifespan hook or on first use, so building the app
+    does no I/O.
+    """
+    app = FastAPI(title="Cart Service", lifespan=lifespan)
+    app.add_middleware(ProfilingMiddleware, service="cart")  # innermost
+    app.add_middleware(DeadlineMiddleware)
+    app.add_middleware(TracingMiddleware, service="cart")
+    app.add_middleware(MetricsMiddleware)  # outermost, so it times everything else
+    app.add_api_route("/metrics", metrics, include_in_schema=False)
+    app.add_exception_handler(CircuitOpenError, inventory_unavailable)
+    app.add_exception_handler(DeadlineExceeded, inventory_unavailable)
+    app.include_router(cart.router, prefix="", tags=["Cart"])
+    app.include_router(stats.router, prefix="", tags=["Stats"])
+    return app
+
+
+app = create_app()
@@ -0,0 +1,40 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from common import config
+from common.inventory_client.resilience import deadline
+
+# Time budget the caller grants this request, in seconds.
+TIMEOUT_HEADER = b"x-request-timeout"
+
+
+class DeadlineMiddleware:
+    """
+    Bounds the inventory calls made while handling a request by the request's
+    own deadline: X-Request-Timeout if the caller sent one, otherwise
+    HTTP_REQUEST_DEADLINE_SECONDS. A retry that could not finish in time is
+    not attempted, so a slow inventory cannot hold the request past it.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with deadline(self._seconds(scope)):
+            await self.app(scope, receive, send)
+
+    @staticmethod
+    def _seconds(scope: Scope) -> float | None:
+        for name, value in scope["headers"]:
+            if name == TIMEOUT_HEADER:
+                try:
+                    seconds = float(value)
+                except ValueError:
+                    break  # ignore a malformed header
+                if seconds > 0:
+                    return seconds
+                break
+        default = config.inventory_api_setting.HTTP_REQUEST_DEADLINE_SECONDS
+        return default if default > 0 else None
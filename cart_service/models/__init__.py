@@ -7,5 +7,7 @@ from . import models as _models
 Cart = _models.Cart
 CartItem = _models.CartItem
 AddItemRequest = _models.AddItemRequest
+CartOperation = _models.CartOperation
+BulkCartRequest = _models.BulkCartRequest
 
-__all__ = ["Cart", "CartItem", "AddItemRequest"]
+__all__ = ["Cart", "CartItem", "AddItemRequest", "CartOperation", "BulkCartRequest"]
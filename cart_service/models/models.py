@@ -1,4 +1,8 @@
-from pydantic import BaseModel, Field, computed_field
+from collections.abc import Iterable
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, PrivateAttr, computed_field, model_validator
+from pydantic.json_schema import SkipJsonSchema
 
 from common.inventory_client import InventoryClient
 
@@ -19,45 +23,94 @@ class UpdateItemRequest(BaseModel):
     quantity: int = Field(..., ge=0, description="Quantity must be a non-negative integer")
 
 
+class CartOperation(BaseModel):
+    op: Literal["add", "update"]
+    item_id: str
+    quantity: int = Field(..., ge=0, description="Quantity to add, or the new quantity to set")
+
+
+class BulkCartRequest(BaseModel):
+    operations: list[CartOperation] = Field(..., min_length=1, max_length=1000)
+
+
+# Lines are kept in an item_id-keyed dict (insertion ordered), so lookups, updates
+# and removals are O(1). total_cost is summed on first read after a change and
+# cached, rather than kept as a running float total that drifts with every update.
+# The JSON shape is unchanged: {"items": [...], "total_cost": ...}.
 class Cart(BaseModel):
-    items: list[CartItem] = []
+    lines: SkipJsonSchema[dict[str, CartItem]] = Field(
+        default_factory=dict, exclude=True, repr=False
+    )
+    _total: float | None = PrivateAttr(default=None)  # None until summed after a change
+    _version: int = PrivateAttr(default=0)
+
+    def __init__(self, items: Iterable[CartItem | dict[str, Any]] = (), **data: Any) -> None:
+        super().__init__(items=list(items), **data)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _lines_from_items(cls, data: Any) -> Any:
+        if isinstance(data, dict) and "items" in data:
+            data = dict(data)
+            items = data.pop("items") or []
+            if items or "lines" not in data:
+                data["lines"] = {_item_id(i): i for i in items}
+        return data
+
+    @property
+    def version(self) -> int:
+        """Version this cart was loaded or last saved at; 0 if never saved."""
+        return self._version
+
+    def set_version(self, version: int) -> None:
+        self._version = version
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def items(self) -> list[CartItem]:
+        return list(self.lines.values())
 
     @computed_field  # type: ignore[misc]
     @property
     def total_cost(self) -> float:
         """Calculate the total cost of all items in the cart."""
-        return sum(item.quantity * item.price for item in self.items)
+        if self._total is None:
+            self._total = sum(item.quantity * item.price for item in self.lines.values())
+        return self._total
 
     async def add_item(self, item_id: str, quantity: int, client: InventoryClient) -> None:
         item_data = await client.find_item(item_id)
+        self._add_checked(item_id, quantity, item_data)
+
+    def _add_checked(self, item_id: str, quantity: int, item_data: dict[str, Any] | None) -> None:
         if item_data is None:
             raise ValueError(f"Item with id '{item_id}' does not exist.")
         if int(item_data.get("stock", 0)) < quantity:
             raise ValueError(f"Item '{item_id}' does not have enough stock.")
 
-        existing = next((i for i in self.items if i.item_id == item_id), None)
+        existing = self.lines.get(item_id)
         if existing:
             existing.quantity += quantity
             existing.price = item_data.get("price", existing.price)
             existing.name = item_data.get("name", existing.name)
         else:
-            self.items.append(
-                CartItem(
-                    item_id=item_id,
-                    name=item_data.get("name", "Unknown"),
-                    quantity=quantity,
-                    price=item_data.get("price", 0.0),
-                )
+            item = CartItem(
+                item_id=item_id,
+                name=item_data.get("name", "Unknown"),
+                quantity=quantity,
+                price=item_data.get("price", 0.0),
             )
+            self.lines[item_id] = item
+        self._total = None
 
     async def remove_item(self, item_id: str) -> None:
         """
         Removes an item from the cart.
         Raises ValueError if the item is not found.
         """
-        item_to_remove = next((item for item in self.items if item.item_id == item_id), None)
+        item_to_remove = self.lines.pop(item_id, None)
         if item_to_remove:
-            self.items.remove(item_to_remove)
+            self._total = None
         else:
             raise ValueError(f"Item with id '{item_id}' not found in cart.")
 
@@ -66,11 +119,43 @@ class Cart(BaseModel):
         Updates the quantity of an item in the cart. If the new quantity is 0,
         the item is removed. Raises ValueError if the item is not found.
         """
-        existing_item = next((item for item in self.items if item.item_id == item_id), None)
+        existing_item = self.lines.get(item_id)
         if existing_item:
             if new_quantity == 0:
-                self.items.remove(existing_item)
+                await self.remove_item(item_id)
             else:
                 existing_item.quantity = new_quantity
+                self._total = None
         else:
             raise ValueError(f"Item with id '{item_id}' not found in cart.")
+
+    async def apply_operations(
+        self, operations: list[CartOperation], client: InventoryClient
+    ) -> None:
+        """
+        Applies a list of add/update operations as one unit.
+        Inventory data for every added item is fetched in a single batch request.
+        If any operation fails a ValueError is raised and the cart is left unchanged.
+        """
+        add_ids = [o.item_id for o in operations if o.op == "add"]
+        item_data = await client.find_items(add_ids) if add_ids else {}
+
+        staged = self.model_copy(deep=True)
+        for position, operation in enumerate(operations):
+            try:
+                if operation.op == "add":
+                    if operation.quantity == 0:
+                        raise ValueError("Quantity to add must be a positive integer.")
+                    staged._add_checked(
+                        operation.item_id, operation.quantity, item_data.get(operation.item_id)
+                    )
+                else:
+                    await staged.update_item_quantity(operation.item_id, operation.quantity)
+            except ValueError as ve:
+                raise ValueError(f"Operation {position}: {ve}") from ve
+        self.lines = staged.lines
+        self._total = None
+
+
+def _item_id(item: Any) -> str:
+    return str(item.item_id if isinstance(item, CartItem) else item["item_id"])
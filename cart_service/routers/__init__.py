@@ -3,5 +3,6 @@ Routers for Cart Service.
 """
 
 from .cart import router as cart_router  # noqa: F401
+from .stats import router as stats_router  # noqa: F401
 
-__all__ = ["cart_router"]
+__all__ = ["cart_router", "stats_router"]
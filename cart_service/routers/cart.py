@@ -1,67 +1,168 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
-from cart_service.dependency import get_inventory_client, get_user_cart
-from cart_service.models import AddItemRequest, Cart
+from cart_service.dependency import (
+    get_cart_store,
+    get_event_publisher,
+    get_inventory_client,
+    get_user_cart,
+)
+from cart_service.locks import KeyedLocks, get_cart_locks
+from cart_service.models import AddItemRequest, BulkCartRequest, Cart
 from cart_service.models.models import UpdateItemRequest
+from cart_service.store import CartStore, CartVersionConflict
+from common import config
+from common.events import EventPublisher
 from common.inventory_client import InventoryClient
+from common.responses import FastJSONResponse, model_response
 
 router = APIRouter()
 
 
+async def _save(store: CartStore, user_id: str, user_cart: Cart) -> None:
+    try:
+        await store.save(user_id, user_cart)
+    except CartVersionConflict as vc:
+        raise HTTPException(status_code=409, detail=str(vc)) from vc
+
+
+def _publish(
+    events: EventPublisher, event_type: str, user_id: str, user_cart: Cart | None, **details: Any
+) -> None:
+    """
+    Queue a cart event on CART_TOPIC, keyed by user so a user's events stay in
+    order. Never waits on the broker; a full buffer drops the event.
+    """
+    event = {"type": event_type, "user_id": user_id, **details}
+    if user_cart is not None:
+        event["cart"] = user_cart.model_dump(mode="json")
+    events.publish(config.events_setting.CART_TOPIC, event, key=user_id)
+
+
+def _changed(message: str, user_cart: Cart) -> dict[str, Any] | Response:
+    """
+    Body of the mutating routes. With SERVER_FAST_RESPONSES the cart is dumped
+    by pydantic once, instead of FastAPI walking the dict with jsonable_encoder.
+    """
+    if config.server_setting.SERVER_FAST_RESPONSES:
+        return FastJSONResponse({"message": message, "cart": user_cart.model_dump(mode="json")})
+    return {"message": message, "cart": user_cart}
+
+
 @router.get("/cart/{user_id}", response_model=Cart)
-async def view_cart(user_cart: Cart = Depends(get_user_cart)) -> Cart:
+async def view_cart(user_cart: Cart = Depends(get_user_cart)) -> Cart | Response:
     """
     Retrieve current cart contents
     """
+    if config.server_setting.SERVER_FAST_RESPONSES:
+        return model_response(user_cart)
     return user_cart
 
 
-@router.post("/cart/{user_id}/add")
+@router.post("/cart/{user_id}/add", response_model=None)
 async def add_to_cart(
     user_id: str,
     data: AddItemRequest,
     inventory_client: InventoryClient = Depends(get_inventory_client),
     user_cart: Cart = Depends(get_user_cart),
-) -> dict[str, Any]:
+    store: CartStore = Depends(get_cart_store),
+    events: EventPublisher = Depends(get_event_publisher),
+) -> dict[str, Any] | Response:
     """
     Add items to the cart for a user.
     """
     try:
         await user_cart.add_item(data.item_id, data.quantity, inventory_client)
-        return {"message": "Item added", "cart": user_cart}
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve)) from ve
+    await _save(store, user_id, user_cart)
+    _publish(events, "item_added", user_id, user_cart, item_id=data.item_id, quantity=data.quantity)
+    return _changed("Item added", user_cart)
 
 
-@router.delete("/cart/{user_id}/remove/{item_id}")
+@router.delete("/cart/{user_id}/remove/{item_id}", response_model=None)
 async def remove(
+    user_id: str,
     item_id: str,
     user_cart: Cart = Depends(get_user_cart),
-) -> dict[str, Any]:
+    store: CartStore = Depends(get_cart_store),
+    events: EventPublisher = Depends(get_event_publisher),
+) -> dict[str, Any] | Response:
     """
     Remove an item from the cart for a user.
     """
     try:
         await user_cart.remove_item(item_id)
-        return {"message": f"Item '{item_id}' removed", "cart": user_cart}
     except ValueError as ve:
         raise HTTPException(status_code=404, detail=str(ve)) from ve
+    await _save(store, user_id, user_cart)
+    _publish(events, "item_removed", user_id, user_cart, item_id=item_id)
+    return _changed(f"Item '{item_id}' removed", user_cart)
 
 
-@router.put("/cart/{user_id}/update/{item_id}")
+@router.put("/cart/{user_id}/update/{item_id}", response_model=None)
 async def update_item_in_cart(
+    user_id: str,
     item_id: str,
     data: UpdateItemRequest,
     user_cart: Cart = Depends(get_user_cart),
-) -> dict[str, Any]:
+    store: CartStore = Depends(get_cart_store),
+    events: EventPublisher = Depends(get_event_publisher),
+) -> dict[str, Any] | Response:
     """
     Update an item in the cart.
     If the new quantity is 0, the item will be removed.
     """
     try:
         await user_cart.update_item_quantity(item_id, data.quantity)
-        return {"message": f"Item '{item_id}' updated", "cart": user_cart}
     except ValueError as ve:
         raise HTTPException(status_code=404, detail=str(ve)) from ve
+    await _save(store, user_id, user_cart)
+    _publish(events, "item_updated", user_id, user_cart, item_id=item_id, quantity=data.quantity)
+    return _changed(f"Item '{item_id}' updated", user_cart)
+
+
+@router.post("/cart/{user_id}/bulk", response_model=None)
+async def bulk_update_cart(
+    user_id: str,
+    data: BulkCartRequest,
+    inventory_client: InventoryClient = Depends(get_inventory_client),
+    user_cart: Cart = Depends(get_user_cart),
+    store: CartStore = Depends(get_cart_store),
+    events: EventPublisher = Depends(get_event_publisher),
+) -> dict[str, Any] | Response:
+    """
+    Apply several add/update operations to the cart at once.
+    Either every operation is applied or none is.
+    """
+    try:
+        await user_cart.apply_operations(data.operations, inventory_client)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve)) from ve
+    await _save(store, user_id, user_cart)
+    _publish(
+        events,
+        "bulk_applied",
+        user_id,
+        user_cart,
+        operations=[op.model_dump() for op in data.operations],
+    )
+    return _changed(f"{len(data.operations)} operations applied", user_cart)
+
+
+@router.delete("/cart/{user_id}")
+async def clear_cart(
+    user_id: str,
+    store: CartStore = Depends(get_cart_store),
+    events: EventPublisher = Depends(get_event_publisher),
+    locks: KeyedLocks = Depends(get_cart_locks),
+) -> dict[str, Any]:
+    """
+    Delete a user's cart, under the user's lock like every other change.
+    """
+    async with locks.hold(user_id):
+        if not await store.delete(user_id):
+            raise HTTPException(status_code=404, detail=f"No cart found for user '{user_id}'.")
+    _publish(events, "cart_deleted", user_id, None)
+    return {"message": "Cart deleted"}
@@ -0,0 +1,43 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from cart_service.dependency import (
+    get_cache_invalidator,
+    get_event_publisher,
+    get_inventory_client,
+)
+from common.events import EventPublisher
+from common.inventory_client import CacheInvalidator, InventoryClient
+
+router = APIRouter()
+
+
+@router.get("/stats/inventory-client")
+async def inventory_client_stats(
+    inventory_client: InventoryClient = Depends(get_inventory_client),
+    invalidator: CacheInvalidator | None = Depends(get_cache_invalidator),
+) -> dict[str, Any]:
+    """
+    Connection-pool usage, circuit-breaker state, retry budget, item-cache,
+    revalidation and event-driven invalidation counters of the shared
+    InventoryClient.
+    """
+    return {
+        "pool": inventory_client.pool_stats(),
+        **inventory_client.resilience_stats(),
+        "cache": inventory_client.cache_stats(),
+        "validators": inventory_client.validator_stats(),
+        "invalidation": invalidator.info() if invalidator is not None else None,
+    }
+
+
+@router.get("/stats/events")
+async def event_publisher_stats(
+    events: EventPublisher = Depends(get_event_publisher),
+) -> dict[str, Any]:
+    """
+    Buffer usage and delivery counters of the cart event publisher; ``dropped``
+    counts events rejected because the buffer was full.
+    """
+    return events.info()
@@ -1,10 +1,20 @@
-import uvicorn
+from common import config
+from common.config import ServerConfig
+from common.launcher import serve, worker_count
+
+
+def prepare_workers(settings: ServerConfig) -> None:
+    """
+    Carts must be shared between processes: the in-memory store is per
+    process, so several workers need CART_STORE_BACKEND=redis.
+    """
+    backend = config.cart_store_setting.CART_STORE_BACKEND.lower()
+    if worker_count(settings) > 1 and backend != "redis":
+        raise ValueError(
+            f"Running {worker_count(settings)} workers needs CART_STORE_BACKEND=redis; "
+            f"the '{backend}' store keeps carts in process memory."
+        )
+
 
 if __name__ == "__main__":
-    # Run the FastAPI app with Uvicorn
-    uvicorn.run(
-        "cart_service.main:app",
-        host="0.0.0.0",
-        port=8002,
-        reload=True,
-    )
+    serve("cart_service.main:app", port=8002, prepare=prepare_workers)
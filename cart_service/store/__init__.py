@@ -0,0 +1,9 @@
+"""
+Cart persistence backends.
+"""
+
+from .base import CartStore, CartVersionConflict
+from .memory_store import InMemoryCartStore
+from .redis_store import RedisCartStore
+
+__all__ = ["CartStore", "CartVersionConflict", "InMemoryCartStore", "RedisCartStore"]
@@ -0,0 +1,47 @@
+from abc import ABC, abstractmethod
+
+from cart_service.models import Cart
+
+
+class CartVersionConflict(Exception):
+    """
+    Raised when a cart was saved by someone else since it was read.
+    """
+
+    def __init__(self, user_id: str, expected: int, actual: int) -> None:
+        super().__init__(
+            f"Cart for user '{user_id}' was modified concurrently "
+            f"(expected version {expected}, found {actual})."
+        )
+        self.user_id = user_id
+        self.expected = expected
+        self.actual = actual
+
+
+class CartStore(ABC):
+    """
+    Persistence for user carts with optimistic versioning.
+
+    ``get`` returns a cart carrying the version it was read at (0 for a cart
+    that has never been saved). ``save`` only succeeds if the stored version
+    still matches, then bumps it; otherwise it raises CartVersionConflict.
+    Carts that are not saved again within ``ttl_seconds`` expire.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+
+    @abstractmethod
+    async def get(self, user_id: str) -> Cart | None:
+        """Return the stored cart, or None if there is none (or it expired)."""
+
+    @abstractmethod
+    async def save(self, user_id: str, cart: Cart) -> int:
+        """Store ``cart`` if its version is current and return the new version."""
+
+    @abstractmethod
+    async def delete(self, user_id: str) -> bool:
+        """Remove the stored cart; returns whether one existed."""
+
+    async def aclose(self) -> None:  # noqa: B027 - optional hook
+        """Release any resources held by the store."""
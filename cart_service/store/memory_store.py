@@ -0,0 +1,54 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from cart_service.models import Cart
+from cart_service.store.base import CartStore, CartVersionConflict
+
+
+class InMemoryCartStore(CartStore):
+    """
+    Default, process-local cart store.
+
+    Entries are kept in save order; since every save uses the same TTL that is
+    also expiry order, so expired carts are swept from the front in O(1) each.
+    Stored carts are copies, so callers never share mutable state with the store.
+    """
+
+    def __init__(self, ttl_seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        super().__init__(ttl_seconds)
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Cart]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, user_id: str) -> Cart | None:
+        self._sweep()
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        return entry[1].model_copy(deep=True)
+
+    async def save(self, user_id: str, cart: Cart) -> int:
+        self._sweep()
+        entry = self._entries.get(user_id)
+        current = entry[1].version if entry else 0
+        if current != cart.version:
+            raise CartVersionConflict(user_id, cart.version, current)
+
+        cart.set_version(current + 1)
+        self._entries[user_id] = (self._clock() + self.ttl_seconds, cart.model_copy(deep=True))
+        self._entries.move_to_end(user_id)
+        return cart.version
+
+    async def delete(self, user_id: str) -> bool:
+        return self._entries.pop(user_id, None) is not None
+
+    def _sweep(self) -> None:
+        now = self._clock()
+        while self._entries:
+            user_id, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            del self._entries[user_id]
@@ -0,0 +1,72 @@
+import json
+from typing import Any
+
+from cart_service.models import Cart
+from cart_service.store.base import CartStore, CartVersionConflict
+
+
+class RedisCartStore(CartStore):
+    """
+    Cart store for any Redis-protocol server (Redis, Valkey, KeyDB, ...).
+
+    Each cart is one key holding ``{"version": n, "cart": {...}}`` with an
+    expiry of ``ttl_seconds``. Saves use WATCH/MULTI/EXEC, so a concurrent
+    write between the version check and the SET aborts the transaction.
+
+    ``client`` is a ``redis.asyncio.Redis`` (or a compatible stand-in such as
+    ``fakeredis.aioredis.FakeRedis``).
+    """
+
+    def __init__(self, client: Any, ttl_seconds: float, prefix: str = "cart:") -> None:
+        super().__init__(ttl_seconds)
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, ttl_seconds: float) -> "RedisCartStore":
+        # Imported lazily so the in-memory default does not need the redis package.
+        from redis.asyncio import Redis
+
+        return cls(Redis.from_url(url), ttl_seconds)
+
+    async def get(self, user_id: str) -> Cart | None:
+        raw = await self.client.get(self._key(user_id))
+        return _decode(raw) if raw is not None else None
+
+    async def save(self, user_id: str, cart: Cart) -> int:
+        from redis.exceptions import WatchError
+
+        key = self._key(user_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                raw = await pipe.get(key)
+                current = _decode(raw).version if raw is not None else 0
+                if current != cart.version:
+                    raise CartVersionConflict(user_id, cart.version, current)
+
+                new_version = current + 1
+                payload = json.dumps({"version": new_version, "cart": cart.model_dump(mode="json")})
+                pipe.multi()
+                pipe.set(key, payload, ex=max(1, int(self.ttl_seconds)))
+                await pipe.execute()
+            except WatchError as we:
+                raise CartVersionConflict(user_id, cart.version, -1) from we
+        cart.set_version(new_version)
+        return new_version
+
+    async def delete(self, user_id: str) -> bool:
+        return bool(await self.client.delete(self._key(user_id)))
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    def _key(self, user_id: str) -> str:
+        return f"{self.prefix}{user_id}"
+
+
+def _decode(raw: bytes | str) -> Cart:
+    data = json.loads(raw)
+    cart = Cart.model_validate(data["cart"])
+    cart.set_version(data["version"])
+    return cart
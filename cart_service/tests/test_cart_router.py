@@ -1,3 +1,4 @@
+import json
 from collections.abc import AsyncGenerator
 from unittest.mock import AsyncMock, patch
 
@@ -5,9 +6,17 @@ import pytest
 from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
 
-from cart_service.dependency import get_inventory_client, get_user_cart
+from cart_service.dependency import (
+    get_cart_store,
+    get_event_publisher,
+    get_inventory_client,
+    get_user_cart,
+)
 from cart_service.models import Cart, CartItem
 from cart_service.routers.cart import router as cart_router
+from cart_service.store import InMemoryCartStore
+from common.config import ServerConfig
+from common.events import EventPublisher, InMemoryBroker
 
 app = FastAPI()
 app.include_router(cart_router)
@@ -51,7 +60,9 @@ async def override_dependencies(
     Fixture to set up and tear down dependency overrides for testing.
     We only need to override get_inventory_client here.
     """
+    cart_store = InMemoryCartStore(ttl_seconds=60)
     app.dependency_overrides[get_inventory_client] = lambda: mock_inventory_client_dependency
+    app.dependency_overrides[get_cart_store] = lambda: cart_store
     app.dependency_overrides[get_user_cart] = lambda user_id: Cart(
         items=[]
     )  # Default empty cart for tests
@@ -237,3 +248,135 @@ async def test_update_item_in_cart_to_zero_quantity() -> None:
     assert response_data["message"] == f"Item '{item_id_to_update}' updated"
 
     mock_update_method.assert_awaited_once_with(item_id_to_update, payload["quantity"])
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_cart_success(mock_inventory_client_dependency: AsyncMock) -> None:
+    """Test applying several operations in one request."""
+    user_id = "testuser"
+    mock_inventory_client_dependency.find_items.return_value = {
+        "1-1": {"item_id": "1-1", "name": "Mock Item", "price": 9.99, "stock": 10},
+    }
+    payload = {
+        "operations": [
+            {"op": "add", "item_id": "1-1", "quantity": 2},
+            {"op": "update", "item_id": "1-1", "quantity": 4},
+        ]
+    }
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post(f"/cart/{user_id}/bulk", json=payload)
+
+    assert response.status_code == 200
+    response_data = response.json()
+    assert response_data["message"] == "2 operations applied"
+    assert response_data["cart"]["items"][0]["quantity"] == 4
+    mock_inventory_client_dependency.find_items.assert_awaited_once_with(["1-1"])
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_cart_failure(mock_inventory_client_dependency: AsyncMock) -> None:
+    """Test that a failing operation rejects the whole batch."""
+    user_id = "testuser"
+    mock_inventory_client_dependency.find_items.return_value = {"unknown-item": None}
+    payload = {"operations": [{"op": "add", "item_id": "unknown-item", "quantity": 1}]}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post(f"/cart/{user_id}/bulk", json=payload)
+
+    assert response.status_code == 400
+    assert "Operation 0: Item with id 'unknown-item' does not exist." in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_cart_is_persisted_between_requests() -> None:
+    """Test that mutations are saved to the cart store and survive across requests."""
+    user_id = "persisted-user"
+    del app.dependency_overrides[get_user_cart]
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        await ac.post(f"/cart/{user_id}/add", json={"item_id": "1-1", "quantity": 2})
+        await ac.post(f"/cart/{user_id}/add", json={"item_id": "1-1", "quantity": 1})
+        viewed = await ac.get(f"/cart/{user_id}")
+        deleted = await ac.delete(f"/cart/{user_id}")
+        deleted_again = await ac.delete(f"/cart/{user_id}")
+
+    assert viewed.json()["items"][0]["quantity"] == 3
+    assert deleted.status_code == 200
+    assert deleted_again.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_concurrent_modification_returns_conflict() -> None:
+    """Test that saving a cart read at an old version returns 409."""
+    user_id = "testuser"
+    store = InMemoryCartStore(ttl_seconds=60)
+    await store.save(user_id, Cart(items=[]))
+    app.dependency_overrides[get_cart_store] = lambda: store
+    app.dependency_overrides[get_user_cart] = lambda user_id: Cart(items=[])  # version 0
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post(f"/cart/{user_id}/add", json={"item_id": "1-1", "quantity": 1})
+
+    assert response.status_code == 409
+    assert "modified concurrently" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_fast_responses_keep_cart_shape(monkeypatch: pytest.MonkeyPatch) -> None:
+    cart = Cart(items=[CartItem(item_id="1-1", name="Mock Item", quantity=2, price=9.99)])
+    app.dependency_overrides[get_user_cart] = lambda user_id: cart
+    bodies = {}
+    for fast in (True, False):
+        monkeypatch.setattr(
+            "common.config.server_setting", ServerConfig(SERVER_FAST_RESPONSES=fast)
+        )
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            viewed = await ac.get("/cart/testuser")
+            updated = await ac.put("/cart/testuser/update/1-1", json={"quantity": 2})
+        bodies[fast] = (viewed.json(), updated.json())
+
+    assert bodies[True] == bodies[False]
+    assert bodies[True][0] == {
+        "items": [{"item_id": "1-1", "name": "Mock Item", "quantity": 2, "price": 9.99}],
+        "total_cost": 19.98,
+    }
+
+
+@pytest.mark.asyncio
+async def test_cart_changes_are_published() -> None:
+    """Successful mutations publish to cart.updated; failed ones publish nothing."""
+    user_id = "testuser"
+    broker = InMemoryBroker()
+    publisher = EventPublisher(broker, linger=0)
+    app.dependency_overrides[get_event_publisher] = lambda: publisher
+    del app.dependency_overrides[get_user_cart]
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        await ac.post(f"/cart/{user_id}/add", json={"item_id": "1-1", "quantity": 2})
+        await ac.put(f"/cart/{user_id}/update/1-1", json={"quantity": 1})
+        await ac.put(f"/cart/{user_id}/update/9-9", json={"quantity": 1})  # 404
+        await ac.delete(f"/cart/{user_id}/remove/1-1")
+        await ac.delete(f"/cart/{user_id}")
+    await publisher.aclose()
+
+    events = [json.loads(m.value) for m in broker.messages("cart.updated")]
+    assert [e["type"] for e in events] == [
+        "item_added",
+        "item_updated",
+        "item_removed",
+        "cart_deleted",
+    ]
+    assert events[0]["cart"]["items"][0] == {
+        "item_id": "1-1",
+        "name": "Mock Item",
+        "quantity": 2,
+        "price": 9.99,
+    }
+    assert {m.key for m in broker.messages("cart.updated")} == {b"testuser"}
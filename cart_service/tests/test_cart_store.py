@@ -0,0 +1,127 @@
+from collections.abc import AsyncGenerator
+
+import pytest
+
+from cart_service.dependency import create_cart_store
+from cart_service.models import Cart, CartItem
+from cart_service.run import prepare_workers
+from cart_service.store import CartStore, CartVersionConflict, InMemoryCartStore, RedisCartStore
+from common.config import CartStoreConfig, ServerConfig
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(params=["memory", "redis"])
+async def store(request: pytest.FixtureRequest) -> AsyncGenerator[CartStore, None]:
+    backend: CartStore
+    if request.param == "memory":
+        backend = InMemoryCartStore(ttl_seconds=60)
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        backend = RedisCartStore(fakeredis.aioredis.FakeRedis(), ttl_seconds=60)
+    yield backend
+    await backend.aclose()
+
+
+def _cart(quantity: int = 2) -> Cart:
+    return Cart(items=[CartItem(item_id="1-1", name="Mock Item", quantity=quantity, price=9.99)])
+
+
+@pytest.mark.asyncio
+async def test_save_and_get_round_trip(store: CartStore) -> None:
+    cart = _cart()
+
+    assert await store.get("u1") is None
+    assert await store.save("u1", cart) == 1
+    assert cart.version == 1
+
+    loaded = await store.get("u1")
+    assert loaded is not None
+    assert loaded.version == 1
+    assert loaded.model_dump() == cart.model_dump()
+
+
+@pytest.mark.asyncio
+async def test_loaded_cart_is_a_copy(store: CartStore) -> None:
+    await store.save("u1", _cart())
+
+    loaded = await store.get("u1")
+    assert loaded is not None
+    await loaded.update_item_quantity("1-1", 9)
+
+    again = await store.get("u1")
+    assert again is not None
+    assert again.items[0].quantity == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_save_is_rejected(store: CartStore) -> None:
+    await store.save("u1", _cart())
+    first = await store.get("u1")
+    second = await store.get("u1")
+    assert first is not None and second is not None
+
+    await store.save("u1", first)
+    with pytest.raises(CartVersionConflict, match="expected version 1, found 2"):
+        await store.save("u1", second)
+
+
+@pytest.mark.asyncio
+async def test_delete(store: CartStore) -> None:
+    await store.save("u1", _cart())
+
+    assert await store.delete("u1") is True
+    assert await store.delete("u1") is False
+    assert await store.get("u1") is None
+
+
+@pytest.mark.asyncio
+async def test_memory_store_expires_abandoned_carts() -> None:
+    clock = FakeClock()
+    store = InMemoryCartStore(ttl_seconds=10, clock=clock)
+    await store.save("old", _cart())
+    clock.now = 5
+    await store.save("new", _cart())
+
+    clock.now = 10
+    assert await store.get("old") is None
+    assert await store.get("new") is not None
+    assert len(store) == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_store_sets_expiry() -> None:
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.aioredis.FakeRedis()
+    store = RedisCartStore(client, ttl_seconds=120)
+
+    await store.save("u1", _cart())
+
+    assert 0 < await client.ttl("cart:u1") <= 120
+
+
+def test_create_cart_store() -> None:
+    assert isinstance(create_cart_store("memory"), InMemoryCartStore)
+    with pytest.raises(ValueError, match="Unknown cart store backend 'mongo'."):
+        create_cart_store("mongo")
+
+
+def test_multi_worker_launch_requires_redis(monkeypatch: pytest.MonkeyPatch) -> None:
+    prod = ServerConfig(SERVER_PROFILE="prod", SERVER_WORKERS=2)
+    monkeypatch.setattr(
+        "common.config.cart_store_setting", CartStoreConfig(CART_STORE_BACKEND="memory")
+    )
+    with pytest.raises(ValueError, match="redis"):
+        prepare_workers(prod)
+    prepare_workers(ServerConfig(SERVER_PROFILE="dev"))
+
+    monkeypatch.setattr(
+        "common.config.cart_store_setting", CartStoreConfig(CART_STORE_BACKEND="redis")
+    )
+    prepare_workers(prod)
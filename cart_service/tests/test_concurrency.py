@@ -0,0 +1,96 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from cart_service.dependency import get_cart_store, get_inventory_client
+from cart_service.locks import KeyedLocks, get_cart_locks
+from cart_service.routers.cart import router as cart_router
+from cart_service.store import InMemoryCartStore
+
+app = FastAPI()
+app.include_router(cart_router)
+
+
+class SlowInventoryClient:
+    """Yields to the event loop during lookups so concurrent requests interleave."""
+
+    async def find_item(self, item_id: str) -> dict[str, Any]:
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return {"item_id": item_id, "name": f"Item {item_id}", "price": 1.25, "stock": 10_000}
+
+
+@pytest.fixture
+async def cart_store() -> AsyncGenerator[InMemoryCartStore, None]:
+    store = InMemoryCartStore(ttl_seconds=60)
+    app.dependency_overrides[get_inventory_client] = SlowInventoryClient
+    app.dependency_overrides[get_cart_store] = lambda: store
+    yield store
+    app.dependency_overrides = {}
+
+
+@pytest.mark.asyncio
+async def test_keyed_locks_serialize_one_key_and_clean_up() -> None:
+    locks = KeyedLocks()
+    inside = 0
+    peak = 0
+
+    async def worker() -> None:
+        nonlocal inside, peak
+        async with locks.hold("user"):
+            inside += 1
+            peak = max(peak, inside)
+            await asyncio.sleep(0)
+            inside -= 1
+
+    await asyncio.gather(*(worker() for _ in range(50)))
+
+    assert peak == 1
+    assert len(locks) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_adds_for_one_user_are_not_lost(cart_store: InMemoryCartStore) -> None:
+    """Fire hundreds of concurrent adds for one user and check nothing is lost."""
+    user_id = "stress-user"
+    item_ids = ["1-1", "1-2", "1-3"]
+    adds_per_item = 100
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        responses = await asyncio.gather(
+            *(
+                ac.post(f"/cart/{user_id}/add", json={"item_id": item_id, "quantity": 1})
+                for _ in range(adds_per_item)
+                for item_id in item_ids
+            )
+        )
+
+    assert all(r.status_code == 200 for r in responses)
+    cart = await cart_store.get(user_id)
+    assert cart is not None
+    assert {i.item_id: i.quantity for i in cart.items} == dict.fromkeys(item_ids, adds_per_item)
+    assert cart.version == adds_per_item * len(item_ids)
+    assert cart.total_cost == 1.25 * adds_per_item * len(item_ids)
+    assert len(get_cart_locks()) == 0
+
+
+@pytest.mark.asyncio
+async def test_clearing_a_cart_waits_for_changes_in_progress(
+    cart_store: InMemoryCartStore,
+) -> None:
+    user_id = "clearing-user"
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        await ac.post(f"/cart/{user_id}/add", json={"item_id": "1-1", "quantity": 1})
+        added, cleared = await asyncio.gather(
+            ac.post(f"/cart/{user_id}/add", json={"item_id": "1-2", "quantity": 1}),
+            ac.delete(f"/cart/{user_id}"),
+        )
+
+    assert (added.status_code, cleared.status_code) == (200, 200)
+    assert await cart_store.get(user_id) is None  # the delete ran after the add
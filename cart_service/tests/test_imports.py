@@ -0,0 +1,22 @@
+import subprocess
+import sys
+
+import cart_service
+
+
+def test_package_import_does_not_load_the_app() -> None:
+    out = subprocess.run(
+        [sys.executable, "-c", "import sys, cart_service; print(' '.join(sys.modules))"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    assert "fastapi" not in out.split()
+
+
+def test_app_and_factory_are_exported_lazily() -> None:
+    from cart_service.main import app
+
+    assert cart_service.app is app
+    paths = {getattr(r, "path", None) for r in cart_service.create_app().routes}
+    assert "/cart/{user_id}" in paths
@@ -0,0 +1,56 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from cart_service.main import inventory_unavailable
+from cart_service.middleware import DeadlineMiddleware
+from common.config import InventoryAPIConfig
+from common.inventory_client import CircuitOpenError, DeadlineExceeded
+from common.inventory_client.resilience import time_left
+
+app = FastAPI()
+app.add_middleware(DeadlineMiddleware)
+app.add_exception_handler(CircuitOpenError, inventory_unavailable)
+app.add_exception_handler(DeadlineExceeded, inventory_unavailable)
+
+
+@app.get("/left")
+async def left() -> dict[str, float | None]:
+    return {"left": time_left()}
+
+
+@app.get("/open")
+async def circuit_open() -> None:
+    raise CircuitOpenError(retry_after=2.4)
+
+
+@app.get("/late")
+async def late() -> None:
+    raise DeadlineExceeded("too slow")
+
+
+@pytest.mark.asyncio
+async def test_deadline_comes_from_the_request(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        "common.config.inventory_api_setting",
+        InventoryAPIConfig(HTTP_REQUEST_DEADLINE_SECONDS=0),
+    )
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        given = (await ac.get("/left", headers={"X-Request-Timeout": "1.5"})).json()["left"]
+        malformed = (await ac.get("/left", headers={"X-Request-Timeout": "soon"})).json()
+        unbounded = (await ac.get("/left")).json()
+
+    assert 0 < given <= 1.5
+    assert malformed["left"] is None
+    assert unbounded["left"] is None
+
+
+@pytest.mark.asyncio
+async def test_inventory_outages_map_to_503_and_504() -> None:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        circuit = await ac.get("/open")
+        timed_out = await ac.get("/late")
+
+    assert circuit.status_code == 503
+    assert circuit.headers["Retry-After"] == "2"
+    assert timed_out.status_code == 504
@@ -2,7 +2,7 @@ from unittest.mock import AsyncMock
 
 import pytest
 
-from cart_service.models import Cart, CartItem
+from cart_service.models import Cart, CartItem, CartOperation
 from common.inventory_client.inventory_client import InventoryClient
 
 # --- Fixtures for testing ---
@@ -193,3 +193,128 @@ async def test_update_item_quantity_item_not_found(cart_with_multiple_items: Car
         match=f"Item with id '{item_id_to_update}' not found in cart.",
     ):
         await cart_with_multiple_items.update_item_quantity(item_id_to_update, new_quantity)
+
+
+# --- Test cases for Cart.apply_operations ---
+
+
+@pytest.fixture
+def batch_inventory_client() -> AsyncMock:
+    client = AsyncMock(spec=InventoryClient)
+    client.find_items.return_value = {
+        "1-1": {"item_id": "1-1", "name": "Mock Item", "price": 9.99, "stock": 10},
+        "3-3": {"item_id": "3-3", "name": "Mock Cap", "price": 12.00, "stock": 1},
+        "unknown-item": None,
+    }
+    return client
+
+
+@pytest.mark.asyncio
+async def test_apply_operations_success(
+    cart_with_multiple_items: Cart, batch_inventory_client: AsyncMock
+) -> None:
+    """Test that adds and updates are applied with a single batch lookup."""
+    operations = [
+        CartOperation(op="add", item_id="1-1", quantity=3),
+        CartOperation(op="add", item_id="3-3", quantity=1),
+        CartOperation(op="update", item_id="2-2", quantity=0),
+    ]
+
+    await cart_with_multiple_items.apply_operations(operations, batch_inventory_client)
+
+    quantities = {item.item_id: item.quantity for item in cart_with_multiple_items.items}
+    assert quantities == {"1-1": 5, "3-3": 1}
+    batch_inventory_client.find_items.assert_awaited_once_with(["1-1", "3-3"])
+    batch_inventory_client.find_item.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "failing, message",
+    [
+        (CartOperation(op="add", item_id="unknown-item", quantity=1), "does not exist"),
+        (CartOperation(op="add", item_id="3-3", quantity=2), "does not have enough stock"),
+        (CartOperation(op="add", item_id="1-1", quantity=0), "must be a positive integer"),
+        (CartOperation(op="update", item_id="9-9", quantity=1), "not found in cart"),
+    ],
+)
+async def test_apply_operations_rolls_back_on_failure(
+    cart_with_multiple_items: Cart,
+    batch_inventory_client: AsyncMock,
+    failing: CartOperation,
+    message: str,
+) -> None:
+    """Test that one failing operation leaves the cart untouched."""
+    before = cart_with_multiple_items.model_dump()
+    operations = [CartOperation(op="add", item_id="1-1", quantity=3), failing]
+
+    with pytest.raises(ValueError, match=f"Operation 1: .*{message}"):
+        await cart_with_multiple_items.apply_operations(operations, batch_inventory_client)
+
+    assert cart_with_multiple_items.model_dump() == before
+
+
+@pytest.mark.asyncio
+async def test_apply_operations_updates_only_skip_lookup(
+    cart_with_multiple_items: Cart, batch_inventory_client: AsyncMock
+) -> None:
+    """Test that update-only batches do not call the inventory service."""
+    await cart_with_multiple_items.apply_operations(
+        [CartOperation(op="update", item_id="1-1", quantity=7)], batch_inventory_client
+    )
+
+    assert cart_with_multiple_items.items[0].quantity == 7
+    batch_inventory_client.find_items.assert_not_awaited()
+
+
+# --- Test cases for the indexed cart representation ---
+
+
+@pytest.mark.asyncio
+async def test_total_tracks_mutations(mock_inventory_client: AsyncMock) -> None:
+    """Test that the cached total matches a full recomputation after each change."""
+    cart = Cart()
+
+    def recomputed() -> float:
+        return sum(item.quantity * item.price for item in cart.items)
+
+    await cart.add_item("1-1", 2, mock_inventory_client)
+    assert cart.total_cost == recomputed() == 19.98
+
+    mock_inventory_client.find_item.return_value = {"name": "Repriced", "price": 5.0, "stock": 10}
+    await cart.add_item("1-1", 1, mock_inventory_client)
+    assert cart.total_cost == recomputed() == 15.0
+
+    await cart.update_item_quantity("1-1", 4)
+    assert cart.total_cost == recomputed() == 20.0
+
+    await cart.remove_item("1-1")
+    assert cart.total_cost == 0.0
+    assert cart.items == []
+
+
+@pytest.mark.asyncio
+async def test_total_does_not_drift(mock_inventory_client: AsyncMock) -> None:
+    """Test that adding and removing lines leaves the exact sum, not float residue."""
+    cart = Cart()
+    for item_id, price in (("a", 0.1), ("b", 0.2), ("c", 0.3)):
+        mock_inventory_client.find_item.return_value = {"name": item_id, "price": price, "stock": 5}
+        await cart.add_item(item_id, 1, mock_inventory_client)
+        cart.total_cost  # noqa: B018 - read, as a response would between changes
+
+    await cart.remove_item("b")
+    assert cart.total_cost == 0.1 + 0.3  # a running total gives 0.4000000000000001
+
+    await cart.remove_item("a")
+    await cart.remove_item("c")
+    assert cart.total_cost == 0
+
+
+def test_cart_json_keeps_list_shape(cart_with_multiple_items: Cart) -> None:
+    """Test that the dict-backed cart still serializes items as a list."""
+    dumped = cart_with_multiple_items.model_dump()
+
+    assert set(dumped) == {"items", "total_cost"}
+    assert [i["item_id"] for i in dumped["items"]] == ["1-1", "2-2"]
+    assert dumped["total_cost"] == pytest.approx(44.98)
+    assert Cart.model_validate(dumped).model_dump() == dumped
@@ -0,0 +1,35 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from cart_service.main import app
+
+
+@pytest.mark.asyncio
+async def test_lifespan_shares_one_inventory_client() -> None:
+    async with app.router.lifespan_context(app):
+        client = app.state.inventory_client
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            first = await ac.get("/stats/inventory-client")
+            second = await ac.get("/stats/inventory-client")
+
+        assert app.state.inventory_client is client
+
+    assert first.status_code == 200
+    pool = first.json()["pool"]
+    assert pool["max_connections"] == client.limits.max_connections
+    assert pool["requests_in_flight"] == 0
+    assert first.json()["invalidation"]["running"]
+    assert second.json() == first.json()
+    assert client._client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_event_publisher_stats() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/stats/events")
+
+    assert response.status_code == 200
+    assert {"buffered", "buffer_size", "published", "dropped", "failed"} <= set(response.json())
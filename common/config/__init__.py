@@ -1,9 +1,61 @@
+from typing import Any
+
+from . import config
 from .config import (
+    CartStoreConfig,
+    EventsConfig,
     InventoryAPIConfig,
-    inventory_api_setting,
+    InventoryHTTPConfig,
+    InventoryReservationConfig,
+    InventorySeedConfig,
+    InventoryStorageConfig,
+    ProfilingConfig,
+    ServerConfig,
+    TracingConfig,
+    load_env,
 )
 
+# Built on first access (see config.__getattr__), so importing this package reads
+# nothing from the environment. Code that wants monkeypatched settings to apply
+# should look them up here at call time rather than binding them at import.
+cart_store_setting: CartStoreConfig
+inventory_api_setting: InventoryAPIConfig
+inventory_storage_setting: InventoryStorageConfig
+inventory_http_setting: InventoryHTTPConfig
+inventory_reservation_setting: InventoryReservationConfig
+inventory_seed_setting: InventorySeedConfig
+server_setting: ServerConfig
+events_setting: EventsConfig
+tracing_setting: TracingConfig
+profiling_setting: ProfilingConfig
+
 __all__ = [
+    "cart_store_setting",
     "inventory_api_setting",
+    "inventory_storage_setting",
+    "inventory_http_setting",
+    "inventory_reservation_setting",
+    "inventory_seed_setting",
+    "server_setting",
+    "events_setting",
+    "tracing_setting",
+    "profiling_setting",
     "InventoryAPIConfig",
+    "InventoryStorageConfig",
+    "InventoryHTTPConfig",
+    "InventoryReservationConfig",
+    "InventorySeedConfig",
+    "CartStoreConfig",
+    "ServerConfig",
+    "EventsConfig",
+    "TracingConfig",
+    "ProfilingConfig",
+    "load_env",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    setting = globals()[name] = getattr(config, name)
+    return setting
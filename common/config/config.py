@@ -1,9 +1,30 @@
+"""
+Settings read from the environment (and a ``.env`` file).
+
+Nothing is read at import time: the ``*_setting`` module attributes are built
+on first access by their ``load_*`` function, which loads ``.env`` once first.
+"""
+
 import os
+from collections.abc import Callable
+from typing import Any
 
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 
-load_dotenv()
+_env_loaded = False
+
+
+def load_env() -> None:
+    """Load ``.env`` into the process environment, once."""
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
 
 
 class InventoryAPIConfig(BaseModel):
@@ -13,11 +34,320 @@ class InventoryAPIConfig(BaseModel):
     HTTP_TIMEOUT_SECONDS: float = Field(
         default_factory=lambda: float(os.getenv("HTTP_TIMEOUT_SECONDS", "5.0"))
     )
+    # Attempts per idempotent call, including the first.
     HTTP_RETRIES: int = Field(default_factory=lambda: int(os.getenv("HTTP_RETRIES", "3")))
+    # Full-jitter backoff: retry n waits up to min(MAX, BASE * 2**n) seconds.
+    HTTP_BACKOFF_BASE_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("HTTP_BACKOFF_BASE_SECONDS", "0.1"))
+    )
+    HTTP_BACKOFF_MAX_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("HTTP_BACKOFF_MAX_SECONDS", "2.0"))
+    )
+    # Retries may add at most this fraction of calls, after a burst of HTTP_RETRY_BUDGET_BURST.
+    HTTP_RETRY_BUDGET_RATIO: float = Field(
+        default_factory=lambda: float(os.getenv("HTTP_RETRY_BUDGET_RATIO", "0.2"))
+    )
+    HTTP_RETRY_BUDGET_BURST: float = Field(
+        default_factory=lambda: float(os.getenv("HTTP_RETRY_BUDGET_BURST", "10"))
+    )
+    # Consecutive failures that open the circuit breaker, and how long it stays open.
+    HTTP_BREAKER_FAILURE_THRESHOLD: int = Field(
+        default_factory=lambda: int(os.getenv("HTTP_BREAKER_FAILURE_THRESHOLD", "5"))
+    )
+    HTTP_BREAKER_RESET_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("HTTP_BREAKER_RESET_SECONDS", "10.0"))
+    )
+    # Time budget of all inventory calls made for one incoming request, unless the
+    # request sends X-Request-Timeout; 0 disables it.
+    HTTP_REQUEST_DEADLINE_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("HTTP_REQUEST_DEADLINE_SECONDS", "10.0"))
+    )
+    HTTP_MAX_CONNECTIONS: int = Field(
+        default_factory=lambda: int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    )
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default_factory=lambda: int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    )
+    HTTP_KEEPALIVE_EXPIRY: float = Field(
+        default_factory=lambda: float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30.0"))
+    )
+    HTTP2: bool = Field(default_factory=lambda: _env_flag("HTTP2", "false"))
+    INVENTORY_CACHE_ENABLED: bool = Field(
+        default_factory=lambda: _env_flag("INVENTORY_CACHE_ENABLED", "false")
+    )
+    INVENTORY_CACHE_MAX_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("INVENTORY_CACHE_MAX_SIZE", "10000"))
+    )
+    INVENTORY_CACHE_TTL_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("INVENTORY_CACHE_TTL_SECONDS", "30.0"))
+    )
+    INVENTORY_CACHE_NEGATIVE_TTL_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("INVENTORY_CACHE_NEGATIVE_TTL_SECONDS", "5.0"))
+    )
+    # Remember ETag'd GET bodies and revalidate them with If-None-Match.
+    INVENTORY_CONDITIONAL_REQUESTS: bool = Field(
+        default_factory=lambda: _env_flag("INVENTORY_CONDITIONAL_REQUESTS", "true")
+    )
+    INVENTORY_VALIDATOR_CACHE_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("INVENTORY_VALIDATOR_CACHE_SIZE", "10000"))
+    )
+    # Evict or update cached items when inventory.* events report a stock change.
+    INVENTORY_CACHE_INVALIDATION: bool = Field(
+        default_factory=lambda: _env_flag("INVENTORY_CACHE_INVALIDATION", "true")
+    )
 
 
 def load_inventory_api() -> InventoryAPIConfig:
+    load_env()
     return InventoryAPIConfig()
 
 
-inventory_api_setting: InventoryAPIConfig = load_inventory_api()
+inventory_api_setting: InventoryAPIConfig
+
+
+class InventoryStorageConfig(BaseModel):
+    INVENTORY_STORAGE_BACKEND: str = Field(
+        default_factory=lambda: os.getenv("INVENTORY_STORAGE_BACKEND", "tinydb")
+    )
+    INVENTORY_TINYDB_PATH: str = Field(
+        default_factory=lambda: os.getenv(
+            "INVENTORY_TINYDB_PATH", "inventory_service/db/inventory_db.json"
+        )
+    )
+    INVENTORY_SQLITE_PATH: str = Field(
+        default_factory=lambda: os.getenv(
+            "INVENTORY_SQLITE_PATH", "inventory_service/db/inventory.sqlite3"
+        )
+    )
+
+
+def load_inventory_storage() -> InventoryStorageConfig:
+    load_env()
+    return InventoryStorageConfig()
+
+
+inventory_storage_setting: InventoryStorageConfig
+
+
+class InventoryHTTPConfig(BaseModel):
+    # Cache-Control of the ETag'd catalog routes. "no-cache" lets clients and CDNs
+    # store the body but revalidate it (a cheap 304) before every reuse.
+    INVENTORY_HTTP_CACHE_CONTROL: str = Field(
+        default_factory=lambda: os.getenv("INVENTORY_HTTP_CACHE_CONTROL", "no-cache")
+    )
+
+
+def load_inventory_http() -> InventoryHTTPConfig:
+    load_env()
+    return InventoryHTTPConfig()
+
+
+inventory_http_setting: InventoryHTTPConfig
+
+
+class InventorySeedConfig(BaseModel):
+    INVENTORY_SEED: int = Field(default_factory=lambda: int(os.getenv("INVENTORY_SEED", "42")))
+    INVENTORY_SEED_CATEGORIES: int = Field(
+        default_factory=lambda: int(os.getenv("INVENTORY_SEED_CATEGORIES", "10"))
+    )
+    INVENTORY_SEED_ITEMS_PER_CATEGORY: int = Field(
+        default_factory=lambda: int(os.getenv("INVENTORY_SEED_ITEMS_PER_CATEGORY", "5"))
+    )
+    # 0 uses one worker process per CPU; 1 generates in-process.
+    INVENTORY_SEED_WORKERS: int = Field(
+        default_factory=lambda: int(os.getenv("INVENTORY_SEED_WORKERS", "0"))
+    )
+    INVENTORY_SEED_BATCH_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("INVENTORY_SEED_BATCH_SIZE", "10000"))
+    )
+    # reuse: keep the stored catalog if it was generated from the same settings;
+    # reseed: regenerate on every start; skip: never seed on start.
+    INVENTORY_STARTUP_MODE: str = Field(
+        default_factory=lambda: os.getenv("INVENTORY_STARTUP_MODE", "reuse")
+    )
+
+
+def load_inventory_seed() -> InventorySeedConfig:
+    load_env()
+    return InventorySeedConfig()
+
+
+inventory_seed_setting: InventorySeedConfig
+
+
+class InventoryReservationConfig(BaseModel):
+    RESERVATION_DEFAULT_TTL_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("RESERVATION_DEFAULT_TTL_SECONDS", "900"))
+    )
+    RESERVATION_MAX_TTL_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("RESERVATION_MAX_TTL_SECONDS", "3600"))
+    )
+    RESERVATION_SWEEP_INTERVAL_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("RESERVATION_SWEEP_INTERVAL_SECONDS", "1.0"))
+    )
+
+
+def load_inventory_reservation() -> InventoryReservationConfig:
+    load_env()
+    return InventoryReservationConfig()
+
+
+inventory_reservation_setting: InventoryReservationConfig
+
+
+class CartStoreConfig(BaseModel):
+    CART_STORE_BACKEND: str = Field(
+        default_factory=lambda: os.getenv("CART_STORE_BACKEND", "memory")
+    )
+    CART_REDIS_URL: str = Field(
+        default_factory=lambda: os.getenv("CART_REDIS_URL", "redis://localhost:6379/0")
+    )
+    CART_TTL_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("CART_TTL_SECONDS", str(7 * 24 * 3600)))
+    )
+
+
+def load_cart_store() -> CartStoreConfig:
+    load_env()
+    return CartStoreConfig()
+
+
+cart_store_setting: CartStoreConfig
+
+
+class EventsConfig(BaseModel):
+    # memory: in-process stand-in that keeps recent messages; kafka: kafka-python producer.
+    EVENTS_BACKEND: str = Field(default_factory=lambda: os.getenv("EVENTS_BACKEND", "memory"))
+    KAFKA_BOOTSTRAP_SERVERS: str = Field(
+        default_factory=lambda: os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
+    )
+    # How long the publisher waits for a batch to fill before sending it anyway.
+    EVENTS_LINGER_MS: float = Field(
+        default_factory=lambda: float(os.getenv("EVENTS_LINGER_MS", "5"))
+    )
+    EVENTS_BATCH_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("EVENTS_BATCH_SIZE", "500"))
+    )
+    # Events waiting to be sent; beyond this, new events are dropped (and counted).
+    EVENTS_BUFFER_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("EVENTS_BUFFER_SIZE", "10000"))
+    )
+    # gzip | snappy | lz4 | zstd | none (Kafka only; all but gzip need extra packages)
+    EVENTS_COMPRESSION: str = Field(default_factory=lambda: os.getenv("EVENTS_COMPRESSION", "gzip"))
+    CART_TOPIC: str = Field(default_factory=lambda: os.getenv("CART_TOPIC", "cart.updated"))
+    INVENTORY_RESERVED_TOPIC: str = Field(
+        default_factory=lambda: os.getenv("INVENTORY_RESERVED_TOPIC", "inventory.reserved")
+    )
+    INVENTORY_FAIL_TOPIC: str = Field(
+        default_factory=lambda: os.getenv("INVENTORY_FAIL_TOPIC", "inventory.failed")
+    )
+    # Every stock change (reservations, releases, expiries) and catalog reseeds.
+    INVENTORY_STOCK_TOPIC: str = Field(
+        default_factory=lambda: os.getenv("INVENTORY_STOCK_TOPIC", "inventory.stock_changed")
+    )
+
+
+def load_events() -> EventsConfig:
+    load_env()
+    return EventsConfig()
+
+
+events_setting: EventsConfig
+
+
+class TracingConfig(BaseModel):
+    # Fraction of new traces recorded (0..1). Requests that arrive with a traceparent
+    # follow the caller's decision instead, so a trace is kept or dropped as a whole.
+    TRACING_SAMPLE_RATIO: float = Field(
+        default_factory=lambda: float(os.getenv("TRACING_SAMPLE_RATIO", "0.01"))
+    )
+    # log: one JSON line per span on the "common.tracing" logger; memory: keep recent
+    # spans in process (tests); none: record nothing, only propagate the context.
+    TRACING_EXPORTER: str = Field(default_factory=lambda: os.getenv("TRACING_EXPORTER", "log"))
+
+
+def load_tracing() -> TracingConfig:
+    load_env()
+    return TracingConfig()
+
+
+tracing_setting: TracingConfig
+
+
+class ProfilingConfig(BaseModel):
+    # Fraction of requests profiled (0..1); 0 leaves profiling to the debug header.
+    PROFILING_SAMPLE_RATIO: float = Field(
+        default_factory=lambda: float(os.getenv("PROFILING_SAMPLE_RATIO", "0"))
+    )
+    # Requests sending "X-Debug-Profile: <token>" are profiled; empty disables the header.
+    PROFILING_DEBUG_TOKEN: str = Field(
+        default_factory=lambda: os.getenv("PROFILING_DEBUG_TOKEN", "")
+    )
+    # Time between stack samples of a profiled request.
+    PROFILING_INTERVAL_MS: float = Field(
+        default_factory=lambda: float(os.getenv("PROFILING_INTERVAL_MS", "1"))
+    )
+    # Folded stacks are appended to <dir>/<service>/<METHOD>_<route>.folded.
+    PROFILING_DIR: str = Field(default_factory=lambda: os.getenv("PROFILING_DIR", "profiles"))
+
+
+def load_profiling() -> ProfilingConfig:
+    load_env()
+    return ProfilingConfig()
+
+
+profiling_setting: ProfilingConfig
+
+
+class ServerConfig(BaseModel):
+    # dev: one process with auto-reload; prod: SERVER_WORKERS processes, no reload.
+    SERVER_PROFILE: str = Field(default_factory=lambda: os.getenv("SERVER_PROFILE", "dev"))
+    SERVER_HOST: str = Field(default_factory=lambda: os.getenv("SERVER_HOST", "0.0.0.0"))
+    # 0 starts one worker per CPU core (prod profile only).
+    SERVER_WORKERS: int = Field(default_factory=lambda: int(os.getenv("SERVER_WORKERS", "0")))
+    # Opt-in speedups: SERVER_LOOP=uvloop, SERVER_HTTP=httptools (used when installed).
+    SERVER_LOOP: str = Field(default_factory=lambda: os.getenv("SERVER_LOOP", "asyncio"))
+    SERVER_HTTP: str = Field(default_factory=lambda: os.getenv("SERVER_HTTP", "h11"))
+    SERVER_BACKLOG: int = Field(default_factory=lambda: int(os.getenv("SERVER_BACKLOG", "2048")))
+    SERVER_KEEPALIVE_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("SERVER_KEEPALIVE_SECONDS", "5"))
+    )
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("SERVER_GRACEFUL_SHUTDOWN_SECONDS", "30"))
+    )
+    LOG_LEVEL: str = Field(default_factory=lambda: os.getenv("LOG_LEVEL", "INFO"))
+    # Serialize read responses directly (orjson when installed, cached catalog
+    # payloads) instead of re-validating them through the route's response_model.
+    SERVER_FAST_RESPONSES: bool = Field(
+        default_factory=lambda: _env_flag("SERVER_FAST_RESPONSES", "true")
+    )
+
+
+def load_server() -> ServerConfig:
+    load_env()
+    return ServerConfig()
+
+
+server_setting: ServerConfig
+
+
+_LOADERS: dict[str, Callable[[], BaseModel]] = {
+    "inventory_api_setting": load_inventory_api,
+    "inventory_storage_setting": load_inventory_storage,
+    "inventory_http_setting": load_inventory_http,
+    "inventory_seed_setting": load_inventory_seed,
+    "inventory_reservation_setting": load_inventory_reservation,
+    "cart_store_setting": load_cart_store,
+    "server_setting": load_server,
+    "events_setting": load_events,
+    "tracing_setting": load_tracing,
+    "profiling_setting": load_profiling,
+}
+
+
+def __getattr__(name: str) -> Any:
+    loader = _LOADERS.get(name)
+    if loader is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    setting = globals()[name] = loader()
+    return setting
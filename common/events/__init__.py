@@ -0,0 +1,22 @@
+"""
+Asynchronous, batched event publishing (Kafka or in-memory).
+"""
+
+from .broker import EventBroker, InMemoryBroker, KafkaBroker, Message
+from .publisher import (
+    EventPublisher,
+    PublisherStats,
+    create_broker,
+    create_event_publisher,
+)
+
+__all__ = [
+    "EventBroker",
+    "InMemoryBroker",
+    "KafkaBroker",
+    "Message",
+    "EventPublisher",
+    "PublisherStats",
+    "create_broker",
+    "create_event_publisher",
+]
@@ -0,0 +1,159 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import AsyncGenerator, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+# Compression codecs Kafka understands; "gzip" needs no extra package.
+COMPRESSION_TYPES = ("gzip", "snappy", "lz4", "zstd")
+# Longest a Kafka consumer poll blocks its worker thread.
+POLL_TIMEOUT_MS = 500
+
+
+@dataclass(frozen=True)
+class Message:
+    topic: str
+    key: bytes | None
+    value: bytes
+
+
+class EventBroker(ABC):
+    """
+    Destination of the batches an ``EventPublisher`` assembles, and source
+    of the messages background consumers read.
+
+    ``send`` is awaited from the publisher's background task only, never
+    from a request, so a slow broker delays delivery but not responses.
+    """
+
+    @abstractmethod
+    async def send(self, messages: list[Message]) -> None:
+        """Deliver ``messages`` in order; raise if any of them was not accepted."""
+
+    @abstractmethod
+    def consume(self, topics: Iterable[str]) -> AsyncGenerator[Message, None]:
+        """
+        Yield the messages sent to ``topics`` from now on, in order per key.
+        Every consumer sees every message (there is no consumer group); close
+        the iterator, or cancel the task reading it, to unsubscribe.
+        """
+
+    async def close(self) -> None:  # noqa: B027 - optional hook
+        """Release connections held by the broker."""
+
+
+class InMemoryBroker(EventBroker):
+    """
+    Broker stand-in for tests and local runs without Kafka: keeps the last
+    ``retention`` messages of every topic in memory and hands new ones to
+    the consumers of this instance (so only within one process).
+    """
+
+    def __init__(self, retention: int = 10_000) -> None:
+        self.retention = retention
+        self._topics: dict[str, deque[Message]] = {}
+        self._consumers: list[tuple[frozenset[str], asyncio.Queue[Message]]] = []
+
+    async def send(self, messages: list[Message]) -> None:
+        for message in messages:
+            log = self._topics.get(message.topic)
+            if log is None:
+                log = self._topics[message.topic] = deque(maxlen=self.retention)
+            log.append(message)
+            for topics, queue in self._consumers:
+                if message.topic in topics:
+                    queue.put_nowait(message)
+
+    async def consume(self, topics: Iterable[str]) -> AsyncGenerator[Message, None]:
+        consumer = (frozenset(topics), asyncio.Queue[Message]())
+        self._consumers.append(consumer)
+        try:
+            while True:
+                yield await consumer[1].get()
+        finally:
+            self._consumers.remove(consumer)
+
+    def messages(self, topic: str) -> list[Message]:
+        return list(self._topics.get(topic, ()))
+
+
+class KafkaBroker(EventBroker):
+    """
+    Produces to Kafka with kafka-python. The producer is created on first use
+    and driven from a worker thread, since both connecting and flushing block.
+    Batching happens in the publisher, so each ``send`` is flushed right away
+    and failures surface to the publisher's metrics.
+
+    ``consume`` polls a consumer without a group id, so every subscriber gets
+    every message from the latest offset on, and nothing is committed.
+    """
+
+    def __init__(
+        self,
+        bootstrap_servers: str | Iterable[str],
+        compression: str | None = None,
+        **producer_options: Any,
+    ) -> None:
+        if compression is not None and compression not in COMPRESSION_TYPES:
+            raise ValueError(f"Unknown compression '{compression}'.")
+        if isinstance(bootstrap_servers, str):
+            bootstrap_servers = bootstrap_servers.split(",")
+        self.bootstrap_servers = list(bootstrap_servers)
+        self.compression = compression
+        self._producer_options = producer_options
+        self._producer: Any = None
+
+    async def send(self, messages: list[Message]) -> None:
+        await asyncio.to_thread(self._send, messages)
+
+    def _send(self, messages: list[Message]) -> None:
+        if self._producer is None:
+            # Imported lazily so services that never publish do not need kafka-python.
+            from kafka import KafkaProducer
+
+            self._producer = KafkaProducer(
+                bootstrap_servers=self.bootstrap_servers,
+                compression_type=self.compression,
+                **self._producer_options,
+            )
+        futures = [self._producer.send(m.topic, key=m.key, value=m.value) for m in messages]
+        self._producer.flush()
+        for future in futures:
+            future.get()  # re-raises the delivery error, if any
+
+    async def close(self) -> None:
+        if self._producer is not None:
+            await asyncio.to_thread(self._producer.close)
+            self._producer = None
+
+    async def consume(self, topics: Iterable[str]) -> AsyncGenerator[Message, None]:
+        from kafka import KafkaConsumer
+
+        loop = asyncio.get_running_loop()
+        # KafkaConsumer is not thread-safe: with a single worker, the close
+        # below waits for a poll still in flight instead of racing it.
+        worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kafka-consumer")
+        consumer = await loop.run_in_executor(
+            worker,
+            partial(
+                KafkaConsumer,
+                *topics,
+                bootstrap_servers=self.bootstrap_servers,
+                group_id=None,
+                auto_offset_reset="latest",
+            ),
+        )
+        try:
+            while True:
+                polled = await loop.run_in_executor(
+                    worker, partial(consumer.poll, timeout_ms=POLL_TIMEOUT_MS)
+                )
+                for records in polled.values():
+                    for record in records:
+                        yield Message(topic=record.topic, key=record.key, value=record.value)
+        finally:
+            await loop.run_in_executor(worker, consumer.close)
+            worker.shutdown(wait=False)
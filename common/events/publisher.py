@@ -0,0 +1,181 @@
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from common import config
+from common.config import EventsConfig
+from common.events.broker import EventBroker, InMemoryBroker, KafkaBroker, Message
+from common.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PublisherStats:
+    enqueued: int = 0
+    published: int = 0
+    # Rejected because the buffer was full (backpressure).
+    dropped: int = 0
+    # Handed to the broker in a batch that failed.
+    failed: int = 0
+    batches: int = 0
+    # Highest number of events waiting in the buffer so far.
+    max_buffered: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class EventPublisher:
+    """
+    Non-blocking, batched event publisher.
+
+    ``publish`` only appends to a bounded in-memory buffer and returns at
+    once; a background task sends the buffer to the broker in batches of up
+    to ``batch_size`` events, waiting up to ``linger`` seconds for a batch to
+    fill. When the broker falls behind and the buffer is full, new events are
+    dropped and counted rather than slowing down the caller. Delivery is
+    therefore best effort; ``stats`` shows what was dropped or failed.
+    """
+
+    def __init__(
+        self,
+        broker: EventBroker,
+        linger: float = 0.005,
+        batch_size: int = 500,
+        buffer_size: int = 10_000,
+    ) -> None:
+        if batch_size <= 0 or buffer_size <= 0:
+            raise ValueError("batch_size and buffer_size must be positive integers")
+        self.broker = broker
+        self.linger = linger
+        self.batch_size = batch_size
+        self.buffer_size = buffer_size
+        self.stats = PublisherStats()
+        self._buffer: asyncio.Queue[Message] | None = None
+        self._batch_ready: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def publish(self, topic: str, event: dict[str, Any], key: str | None = None) -> bool:
+        """
+        Queue ``event`` for ``topic``; events with the same ``key`` keep their
+        order. Returns False if the buffer is full and the event was dropped.
+        Must be called from the event loop the publisher runs on.
+        """
+        buffer = self._ensure_started()
+        message = Message(
+            topic=topic,
+            key=key.encode() if key is not None else None,
+            value=dumps({**event, "ts": time.time()}),
+        )
+        try:
+            buffer.put_nowait(message)
+        except asyncio.QueueFull:
+            self.stats.dropped += 1
+            return False
+        self.stats.enqueued += 1
+        buffered = buffer.qsize()
+        self.stats.max_buffered = max(self.stats.max_buffered, buffered)
+        if buffered >= self.batch_size:
+            assert self._batch_ready is not None
+            self._batch_ready.set()
+        return True
+
+    def info(self) -> dict[str, Any]:
+        return {
+            "buffered": self._buffer.qsize() if self._buffer is not None else 0,
+            "buffer_size": self.buffer_size,
+            "batch_size": self.batch_size,
+            "linger": self.linger,
+            **self.stats.as_dict(),
+        }
+
+    def _ensure_started(self) -> "asyncio.Queue[Message]":
+        loop = asyncio.get_running_loop()
+        if self._buffer is None or self._loop is not loop:
+            # First use, or the previous loop is gone (e.g. the app was restarted).
+            self._loop = loop
+            self._buffer = asyncio.Queue(maxsize=self.buffer_size)
+            self._batch_ready = asyncio.Event()
+            self._task = None
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        return self._buffer
+
+    async def start(self) -> None:
+        """Start the background sender now rather than on the first ``publish``."""
+        self._ensure_started()
+
+    async def _run(self) -> None:
+        assert self._buffer is not None and self._batch_ready is not None
+        while True:
+            batch = [await self._buffer.get()]
+            if self.linger > 0 and self._buffer.qsize() + 1 < self.batch_size:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._batch_ready.wait(), self.linger)
+            self._batch_ready.clear()
+            while len(batch) < self.batch_size and not self._buffer.empty():
+                batch.append(self._buffer.get_nowait())
+            await self._send(batch)
+            for _ in batch:
+                self._buffer.task_done()
+
+    async def _send(self, batch: list[Message]) -> None:
+        self.stats.batches += 1
+        try:
+            await self.broker.send(batch)
+        except Exception:
+            self.stats.failed += len(batch)
+            logger.warning("Could not publish %d events.", len(batch), exc_info=True)
+        else:
+            self.stats.published += len(batch)
+
+    async def aclose(self, timeout: float = 5.0) -> None:
+        """
+        Wait (at most ``timeout`` seconds) for buffered events to be sent,
+        then stop the background task and close the broker.
+        """
+        if self._loop is asyncio.get_running_loop() and self._task is not None:
+            assert self._buffer is not None and self._batch_ready is not None
+            self._batch_ready.set()  # no point lingering any more
+            try:
+                await asyncio.wait_for(self._buffer.join(), timeout)
+            except asyncio.TimeoutError:
+                self.stats.failed += self._buffer.qsize()
+                logger.warning("Gave up flushing %d events.", self._buffer.qsize())
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        self._buffer = self._batch_ready = self._task = self._loop = None
+        await self.broker.close()
+
+
+def create_broker(settings: EventsConfig | None = None) -> EventBroker:
+    """
+    Build the broker named by EVENTS_BACKEND.
+    """
+    settings = settings or config.events_setting
+    backend = settings.EVENTS_BACKEND.lower()
+    if backend == "memory":
+        return InMemoryBroker()
+    if backend == "kafka":
+        compression = settings.EVENTS_COMPRESSION.lower()
+        return KafkaBroker(
+            settings.KAFKA_BOOTSTRAP_SERVERS,
+            compression=None if compression == "none" else compression,
+        )
+    raise ValueError(f"Unknown events backend '{backend}'.")
+
+
+def create_event_publisher(settings: EventsConfig | None = None) -> EventPublisher:
+    settings = settings or config.events_setting
+    return EventPublisher(
+        create_broker(settings),
+        linger=settings.EVENTS_LINGER_MS / 1000,
+        batch_size=settings.EVENTS_BATCH_SIZE,
+        buffer_size=settings.EVENTS_BUFFER_SIZE,
+    )
@@ -1,3 +1,19 @@
+from .cache import CacheStats, TTLCache, ValidatorCache, ValidatorStats
+from .invalidation import CacheInvalidator, InvalidationStats
 from .inventory_client import InventoryClient
+from .resilience import CircuitBreaker, CircuitOpenError, DeadlineExceeded, RetryBudget, deadline
 
-__all__ = ["InventoryClient"]
+__all__ = [
+    "InventoryClient",
+    "TTLCache",
+    "CacheStats",
+    "ValidatorCache",
+    "ValidatorStats",
+    "CacheInvalidator",
+    "InvalidationStats",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "DeadlineExceeded",
+    "RetryBudget",
+    "deadline",
+]
@@ -0,0 +1,221 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import Any, Generic, TypeVar
+
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class TTLCache(Generic[V]):
+    """
+    Bounded read-through cache with per-entry TTL and LRU eviction.
+
+    A loader result of ``None`` means "not found" and is cached for
+    ``negative_ttl`` seconds. Concurrent misses for the same key share a
+    single in-flight load; the load is shielded, so a cancelled caller does
+    not cancel it for the others.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        negative_ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be a positive integer")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, V | None]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task[V | None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self._lookup(key)[0]
+
+    def get(self, key: str) -> tuple[bool, V | None]:
+        """
+        Return ``(found, value)`` without loading; ``value`` is None for negative entries.
+        """
+        found, value = self._lookup(key)
+        if found:
+            if value is None:
+                self.stats.negative_hits += 1
+            else:
+                self.stats.hits += 1
+        return found, value
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[V | None]]) -> V | None:
+        found, value = self.get(key)
+        if found:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats.misses += 1
+            task = asyncio.ensure_future(self._load(key, loader))
+            self._inflight[key] = task
+        else:
+            self.stats.coalesced += 1
+        return await asyncio.shield(task)
+
+    async def get_or_load_many(
+        self,
+        keys: Sequence[str],
+        loader: Callable[[list[str]], Awaitable[dict[str, V | None]]],
+    ) -> dict[str, V | None]:
+        """
+        ``get_or_load`` for many keys with one call of ``loader``, which gets
+        the keys neither cached nor being loaded and returns their values (a
+        missing key counts as None). Keys already in flight, from either
+        method, share that load, and later callers share this one.
+        """
+        result: dict[str, V | None] = {}
+        waiting: dict[str, asyncio.Task[V | None]] = {}
+        missing: list[str] = []
+        for key in keys:
+            found, value = self.get(key)
+            if found:
+                result[key] = value
+            elif (task := self._inflight.get(key)) is not None:
+                self.stats.coalesced += 1
+                waiting[key] = task
+            else:
+                missing.append(key)
+
+        if missing:
+            self.stats.misses += len(missing)
+            batch = asyncio.ensure_future(loader(missing))
+            for key in missing:
+                task = asyncio.ensure_future(self._load(key, partial(_pick, batch, key)))
+                self._inflight[key] = waiting[key] = task
+        values = await asyncio.gather(*(asyncio.shield(task) for task in waiting.values()))
+        result.update(zip(waiting, values, strict=True))
+        return result
+
+    def set(self, key: str, value: V | None) -> None:
+        ttl = self.ttl if value is not None else self.negative_ttl
+        if ttl <= 0:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """
+        Drop ``key``. A load already in flight still answers its callers but
+        is not cached, since it may have read the data before the change.
+        """
+        self._entries.pop(key, None)
+        self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._inflight.clear()
+
+    def info(self) -> dict[str, Any]:
+        return {"size": len(self._entries), "max_size": self.max_size, **self.stats.as_dict()}
+
+    def _lookup(self, key: str) -> tuple[bool, V | None]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[V | None]]) -> V | None:
+        task = asyncio.current_task()
+        try:
+            value = await loader()
+            if self._inflight.get(key) is task:  # not invalidated meanwhile
+                self.set(key, value)
+            return value
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+
+
+async def _pick(batch: "asyncio.Future[dict[str, V | None]]", key: str) -> V | None:
+    return (await batch).get(key)
+
+
+@dataclass
+class ValidatorStats:
+    not_modified: int = 0
+    modified: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class ValidatorCache:
+    """
+    Bodies of earlier GET responses with their ETags, keyed by URL, so a
+    later request can be made conditional (If-None-Match) and a 304 answered
+    from the stored body. Bounded with LRU eviction; entries never expire,
+    since the server revalidates them on every use.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be a positive integer")
+        self.max_size = max_size
+        self.stats = ValidatorStats()
+        self._entries: OrderedDict[str, tuple[str, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, url: str) -> tuple[str, Any] | None:
+        """Return ``(etag, body)`` stored for ``url``, or None."""
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+        return entry
+
+    def set(self, url: str, etag: str, body: Any) -> None:
+        self._entries[url] = (etag, body)
+        self._entries.move_to_end(url)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, url: str) -> None:
+        self._entries.pop(url, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def info(self) -> dict[str, Any]:
+        return {"size": len(self._entries), "max_size": self.max_size, **self.stats.as_dict()}
@@ -0,0 +1,150 @@
+import asyncio
+import contextlib
+import json
+import logging
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+from common import config
+from common.config import EventsConfig
+from common.events import EventBroker, Message
+
+if TYPE_CHECKING:
+    from common.inventory_client.inventory_client import InventoryClient
+
+logger = logging.getLogger(__name__)
+
+# Pause before subscribing again after the broker failed.
+RETRY_SECONDS = 1.0
+
+
+@dataclass
+class InvalidationStats:
+    received: int = 0
+    # Cached items replaced with the item carried by a stock_changed event.
+    updated: int = 0
+    evicted: int = 0
+    # Whole caches dropped (catalog reseed, or events possibly missed).
+    cleared: int = 0
+    # Unreadable messages and broker failures.
+    errors: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class CacheInvalidator:
+    """
+    Keeps an InventoryClient's item cache and ETag'd bodies fresh from the
+    inventory service's events, so cached items can live for long TTLs.
+
+    A background task reads INVENTORY_STOCK_TOPIC, INVENTORY_RESERVED_TOPIC
+    and INVENTORY_FAIL_TOPIC: ``stock_changed`` replaces the cached item with
+    the one in the event, ``reserved`` and ``reservation_failed`` evict it
+    (they are not ordered with ``stock_changed``, so their counts are not
+    trusted over it), and ``catalog_reset`` drops everything. If the broker
+    fails, events may have been missed, so the caches are cleared before
+    subscribing again.
+
+    Invalidation needs EVENTS_BACKEND=kafka. The ``memory`` broker only links
+    publishers and consumers of one process, so the inventory service's events
+    never reach the cart service through it; ``start`` warns about this.
+    """
+
+    def __init__(
+        self,
+        client: "InventoryClient",
+        broker: EventBroker,
+        settings: EventsConfig | None = None,
+    ) -> None:
+        settings = settings or config.events_setting
+        self.client = client
+        self.broker = broker
+        self.backend = settings.EVENTS_BACKEND.lower()
+        self.stock_topic = settings.INVENTORY_STOCK_TOPIC
+        self.topics = [
+            settings.INVENTORY_STOCK_TOPIC,
+            settings.INVENTORY_RESERVED_TOPIC,
+            settings.INVENTORY_FAIL_TOPIC,
+        ]
+        self.stats = InvalidationStats()
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self.backend != "kafka":
+            logger.warning(
+                "EVENTS_BACKEND is %r, which does not carry the inventory service's events "
+                "to this process; cached inventory items are only refreshed by their TTL.",
+                self.backend,
+            )
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            await asyncio.sleep(0)  # subscribed once this returns
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def info(self) -> dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "topics": self.topics,
+            **self.stats.as_dict(),
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async for message in self.broker.consume(self.topics):
+                    self.handle(message)
+            except Exception:
+                self.stats.errors += 1
+                logger.warning("Inventory event consumer failed; retrying.", exc_info=True)
+            self._clear()
+            await asyncio.sleep(RETRY_SECONDS)
+
+    def handle(self, message: Message) -> None:
+        """Apply one inventory event to the client's caches."""
+        self.stats.received += 1
+        try:
+            event = json.loads(message.value)
+            kind = event["type"]
+            if kind == "catalog_reset":
+                self._clear()
+            elif kind == "stock_changed" and message.topic == self.stock_topic:
+                self._update(event["item"])
+            else:
+                self._evict(str(event["item_id"]))
+        except (ValueError, TypeError, KeyError):
+            self.stats.errors += 1
+            logger.warning("Ignoring malformed inventory event on %s.", message.topic)
+
+    def _update(self, item: dict[str, Any]) -> None:
+        item_id = item["id"]
+        if self.client.validators is not None:
+            self.client.validators.invalidate(f"/items/{item_id}")
+        cache = self.client.cache
+        if cache is not None and item_id in cache:
+            cache.set(item_id, item)
+            self.stats.updated += 1
+        elif cache is not None:
+            cache.invalidate(item_id)  # a load in flight may predate the change
+
+    def _evict(self, item_id: str) -> None:
+        if self.client.validators is not None:
+            self.client.validators.invalidate(f"/items/{item_id}")
+        cache = self.client.cache
+        if cache is not None:
+            if item_id in cache:
+                self.stats.evicted += 1
+            cache.invalidate(item_id)
+
+    def _clear(self) -> None:
+        if self.client.validators is not None:
+            self.client.validators.clear()
+        if self.client.cache is not None:
+            self.client.cache.clear()
+        self.stats.cleared += 1
@@ -1,9 +1,50 @@
 import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from importlib.util import find_spec
+from time import perf_counter
 from typing import Any, cast
 
 import httpx
 
-from common.config import inventory_api_setting
+from common import config
+from common.config import InventoryAPIConfig
+from common.inventory_client.cache import TTLCache, ValidatorCache
+from common.inventory_client.resilience import (
+    RETRYABLE_STATUS,
+    CircuitBreaker,
+    DeadlineExceeded,
+    RetryBudget,
+    backoff_delay,
+    time_left,
+)
+from common.metrics import Counter, Gauge, Histogram
+from common.tracing import CLIENT, get_tracer, inject
+
+# Matches the inventory service's MAX_BATCH_SIZE for POST /items:batch.
+BATCH_SIZE = 1000
+
+# Request errors that another attempt would hit again.
+NOT_TRANSIENT = (httpx.DecodingError, httpx.TooManyRedirects, httpx.UnsupportedProtocol)
+
+UPSTREAM_CALLS = Histogram(
+    "inventory_client_call_duration_seconds",
+    "Duration of inventory calls, including retries and backoff.",
+    ("method",),
+)
+UPSTREAM_ATTEMPTS = Histogram(
+    "inventory_client_attempt_duration_seconds",
+    "Duration of each HTTP attempt to inventory, by status code (or error / deadline).",
+    ("method", "outcome"),
+)
+UPSTREAM_RETRIES = Counter(
+    "inventory_client_retries_total",
+    "Inventory attempts repeated after a transient error.",
+    ("method",),
+)
+BREAKER_STATE = Gauge(
+    "inventory_client_circuit_state",
+    "Circuit breaker state of the inventory client: 0 closed, 1 half-open, 2 open.",
+)
 
 
 class InventoryClient:
@@ -13,34 +54,279 @@ class InventoryClient:
       - GET /categories -> {"categories":[{"id":1,"name":"..."}]}
       - GET /categories/{category_id}/items -> {"category": {... or name}, "items":[...]}
       - GET /categories/{category_id}/items/{item_id} -> Item JSON
+      - GET /items/{item_id} -> Item JSON
+      - POST /items:batch {"ids":[...]} -> {"items":[...], "missing":[...]}
+
+    One instance is meant to be shared by the whole process so its
+    connection pool (and keep-alive connections) survive across requests.
+
+    GET bodies that came with an ETag are remembered (``validators``) and
+    later GETs of the same URL are sent with If-None-Match, so an unchanged
+    item costs a 304 without a body.
+
+    Only idempotent calls are retried, and only after transport errors or
+    429/502/503/504 answers, with full-jitter backoff and within a retry
+    budget shared by all calls. A circuit breaker fails calls fast while
+    upstream keeps failing (transport errors and 5xx answers), and calls
+    never outlive the ``deadline`` of the request they are made for.
     """
 
-    def __init__(self) -> None:
-        self.base_url = inventory_api_setting.INVENTORY_BASE_URL
-        self.timeout = inventory_api_setting.HTTP_TIMEOUT_SECONDS
-        self.retries = inventory_api_setting.HTTP_RETRIES
-        self._client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout)
+    def __init__(
+        self,
+        settings: InventoryAPIConfig | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        settings = settings or config.inventory_api_setting
+        self.base_url = settings.INVENTORY_BASE_URL
+        self.timeout = settings.HTTP_TIMEOUT_SECONDS
+        self.retries = settings.HTTP_RETRIES
+        self.backoff_base = settings.HTTP_BACKOFF_BASE_SECONDS
+        self.backoff_max = settings.HTTP_BACKOFF_MAX_SECONDS
+        self.retry_budget = RetryBudget(
+            settings.HTTP_RETRY_BUDGET_RATIO, settings.HTTP_RETRY_BUDGET_BURST
+        )
+        self.breaker = CircuitBreaker(
+            settings.HTTP_BREAKER_FAILURE_THRESHOLD, settings.HTTP_BREAKER_RESET_SECONDS
+        )
+        # One client is shared per process, so the gauge follows the latest one.
+        BREAKER_STATE.labels().set_function(self.breaker.state_code)
+        self.limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        )
+        # HTTP/2 needs the optional "h2" package; fall back to HTTP/1.1 without it.
+        self.http2 = settings.HTTP2 and find_spec("h2") is not None
+        # A transport (e.g. httpx.ASGITransport) replaces the connection pool,
+        # to call an inventory app in the same process.
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=self.http2,
+            transport=transport,
+        )
+        self._in_flight = 0
+        self.cache: TTLCache[dict[str, Any]] | None = None
+        if settings.INVENTORY_CACHE_ENABLED:
+            self.cache = TTLCache(
+                max_size=settings.INVENTORY_CACHE_MAX_SIZE,
+                ttl=settings.INVENTORY_CACHE_TTL_SECONDS,
+                negative_ttl=settings.INVENTORY_CACHE_NEGATIVE_TTL_SECONDS,
+            )
+        self.validators: ValidatorCache | None = None
+        if settings.INVENTORY_CONDITIONAL_REQUESTS:
+            self.validators = ValidatorCache(settings.INVENTORY_VALIDATOR_CACHE_SIZE)
 
     async def aclose(self) -> None:
         await self._client.aclose()
 
-    async def _get(self, url: str) -> httpx.Response:
-        last_exc: BaseException | None = None
-        for attempt in range(self.retries - 1):
-            try:
-                r = await self._client.get(url)
-                r.raise_for_status()
-                return r
-            except BaseException as e:
-                last_exc = e
-                await asyncio.sleep(0.1 * (2**attempt))
-        raise last_exc if last_exc is not None else RuntimeError("Unknown error during GET request")
+    def pool_stats(self) -> dict[str, Any]:
+        """
+        Connection pool limits and the requests to inventory awaiting an answer;
+        more of those than ``max_connections`` means requests queue for the pool.
+        httpx does not expose its pool's connections, so they are not reported.
+        """
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "requests_in_flight": self._in_flight,
+        }
+
+    async def _get(self, url: str, headers: dict[str, str] | None = None) -> httpx.Response:
+        with get_tracer().start_span("GET inventory", CLIENT) as span:
+            span.set_attribute("http.url", url)
+            headers = inject(headers)  # the trace continues in the inventory service
+            if headers is None:
+                response = await self._send("GET", lambda: self._client.get(url))
+            else:
+                response = await self._send("GET", lambda: self._client.get(url, headers=headers))
+            span.set_attribute("http.status_code", response.status_code)
+            return response
+
+    async def _get_json(self, url: str) -> Any:
+        """
+        GET ``url`` and return its JSON body, conditionally if an ETag'd body
+        is remembered for it; a 304 returns the remembered body.
+        """
+        if self.validators is None:
+            return (await self._get(url)).json()
+        cached = self.validators.get(url)
+        headers = {"If-None-Match": cached[0]} if cached is not None else None
+        response = await self._get(url, headers)
+        if cached is not None and response.status_code == 304:
+            self.validators.stats.not_modified += 1
+            return cached[1]
+        if cached is not None:
+            self.validators.stats.modified += 1
+        body = response.json()
+        etag = response.headers.get("ETag")
+        if etag:
+            self.validators.set(url, etag, body)
+        else:
+            self.validators.invalidate(url)
+        return body
+
+    async def _post(self, url: str, json: Any, idempotent: bool = False) -> httpx.Response:
+        with get_tracer().start_span("POST inventory", CLIENT) as span:
+            span.set_attribute("http.url", url)
+            headers = inject()
+            if headers is None:
+                response = await self._send(
+                    "POST", lambda: self._client.post(url, json=json), idempotent
+                )
+            else:
+                response = await self._send(
+                    "POST", lambda: self._client.post(url, json=json, headers=headers), idempotent
+                )
+            span.set_attribute("http.status_code", response.status_code)
+            return response
+
+    async def _send(
+        self,
+        method: str,
+        call: Callable[[], Awaitable[httpx.Response]],
+        idempotent: bool = True,
+    ) -> httpx.Response:
+        """
+        Make ``call``, retrying it (if ``idempotent``) while the error is
+        transient, attempts, budget and deadline allow. Raises the last error,
+        CircuitOpenError while the breaker is open, or DeadlineExceeded.
+        """
+        attempts = max(self.retries, 1) if idempotent else 1
+        self.retry_budget.deposit()
+        attempt = 0
+        started = perf_counter()
+        try:
+            while True:
+                trial = self.breaker.before_call()
+                try:
+                    response = await self._attempt(method, call)
+                except NOT_TRANSIENT:
+                    self.breaker.record_no_verdict(trial)
+                    raise
+                except httpx.RequestError as e:  # connection errors and timeouts
+                    self.breaker.record_failure(trial)
+                    error: Exception = e
+                except BaseException:  # cancelled, past the deadline, or a bug
+                    self.breaker.record_no_verdict(trial)
+                    raise
+                else:
+                    if response.status_code not in RETRYABLE_STATUS:
+                        if response.is_server_error:  # not worth a retry, but upstream is broken
+                            self.breaker.record_failure(trial)
+                        else:
+                            self.breaker.record_success(trial)  # 4xx included: upstream is up
+                        if response.status_code != httpx.codes.NOT_MODIFIED:  # conditional GET
+                            response.raise_for_status()
+                        return response
+                    self.breaker.record_failure(trial)
+                    try:
+                        response.raise_for_status()
+                    except httpx.HTTPStatusError as e:
+                        error = e
+
+                attempt += 1
+                delay = backoff_delay(attempt - 1, self.backoff_base, self.backoff_max)
+                left = time_left()
+                if (
+                    attempt >= attempts
+                    or (left is not None and delay >= left)
+                    or not self.retry_budget.withdraw()
+                ):
+                    raise error
+                UPSTREAM_RETRIES.labels(method).inc()
+                await asyncio.sleep(delay)
+        finally:
+            UPSTREAM_CALLS.labels(method).observe(perf_counter() - started)
+
+    async def _attempt(
+        self, method: str, call: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """One try of ``call`` within the deadline, timed in UPSTREAM_ATTEMPTS."""
+        outcome = "error"
+        started = perf_counter()
+        self._in_flight += 1
+        try:
+            left = time_left()
+            if left is None:
+                response = await call()
+            elif left <= 0:
+                raise DeadlineExceeded("Deadline passed before calling inventory.")
+            else:
+                try:
+                    response = await asyncio.wait_for(call(), left)
+                except asyncio.TimeoutError:
+                    raise DeadlineExceeded(
+                        f"No inventory answer within the {left:.3f}s left."
+                    ) from None
+            outcome = str(response.status_code)
+            return response
+        except DeadlineExceeded:
+            outcome = "deadline"
+            raise
+        finally:
+            self._in_flight -= 1
+            UPSTREAM_ATTEMPTS.labels(method, outcome).observe(perf_counter() - started)
+
+    def cache_stats(self) -> dict[str, Any] | None:
+        """
+        Hit/miss/eviction counters of the item cache, or None when it is disabled.
+        """
+        return self.cache.info() if self.cache is not None else None
+
+    def resilience_stats(self) -> dict[str, Any]:
+        """
+        Circuit breaker state (``state_code``: 0 closed, 1 half-open, 2 open)
+        and retry budget counters.
+        """
+        return {"breaker": self.breaker.info(), "retry_budget": self.retry_budget.info()}
+
+    def validator_stats(self) -> dict[str, Any] | None:
+        """
+        304/200 revalidation counters, or None when conditional requests are off.
+        """
+        return self.validators.info() if self.validators is not None else None
 
     async def find_item(self, item_id: str) -> dict[str, Any] | None:
+        if self.cache is not None:
+            return await self.cache.get_or_load(item_id, lambda: self._fetch_item(item_id))
+        return await self._fetch_item(item_id)
+
+    async def _fetch_item(self, item_id: str) -> dict[str, Any] | None:
         try:
-            response = await self._get(f"/items/{item_id}")
-            return cast(dict[str, Any], response.json())
+            return cast(dict[str, Any], await self._get_json(f"/items/{item_id}"))
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
+                if self.validators is not None:
+                    self.validators.invalidate(f"/items/{item_id}")
                 return None  # Return None if the item is not found
             raise  #
+
+    async def find_items(self, item_ids: Iterable[str]) -> dict[str, dict[str, Any] | None]:
+        """
+        Look up many items in one request.
+        Every requested id is a key of the result; ids that do not exist map to None.
+        Cached entries are served locally, ids already being fetched (by
+        ``find_item`` or another batch) wait for that fetch, and only the
+        remaining ids go upstream.
+        """
+        ids = list(dict.fromkeys(item_ids))
+        if self.cache is not None:
+            found = await self.cache.get_or_load_many(ids, self._fetch_items)
+        else:
+            found = await self._fetch_items(ids)
+        return {item_id: found.get(item_id) for item_id in ids}
+
+    async def _fetch_items(self, ids: list[str]) -> dict[str, dict[str, Any] | None]:
+        result: dict[str, dict[str, Any] | None] = {}
+        for start in range(0, len(ids), BATCH_SIZE):
+            chunk = ids[start : start + BATCH_SIZE]
+            # A lookup despite the POST, so safe to retry.
+            response = await self._post("/items:batch", json={"ids": chunk}, idempotent=True)
+            payload = response.json()
+            result.update(dict.fromkeys(payload["missing"]))
+            result.update((item["id"], item) for item in payload["items"])
+        return result
@@ -0,0 +1,198 @@
+import contextlib
+import random
+import time
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any
+
+# Upstream answers worth another attempt: overload and gateway failures.
+RETRYABLE_STATUS = frozenset({429, 502, 503, 504})
+
+# Absolute time.monotonic() by which the current call chain must be done.
+_deadline: ContextVar[float | None] = ContextVar("inventory_deadline", default=None)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling upstream while the circuit breaker is open."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"Inventory circuit is open; retry in {retry_after:.1f}s.")
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(TimeoutError):
+    """The caller's deadline passed before the inventory call completed."""
+
+
+@contextlib.contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """
+    Bound every inventory call made inside the block (in this task and the
+    tasks it starts) to ``seconds`` from now. Nested deadlines only shorten
+    the outer one; ``None`` leaves it unchanged.
+    """
+    if seconds is None:
+        yield
+        return
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(at, current))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_left() -> float | None:
+    """Seconds until the current deadline (may be negative), or None without one."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Full-jitter exponential backoff: a uniform pick in [0, min(cap, base * 2**attempt)],
+    so clients that failed together do not retry together.
+    """
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+@dataclass
+class RetryBudgetStats:
+    retries: int = 0
+    # Retries refused because the budget was spent.
+    exhausted: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of the calls made, shared by every call of a
+    client: each call adds ``ratio`` of a retry to the balance and each retry
+    takes one. The balance starts at, and never exceeds, ``burst``, so a quiet
+    client can still retry a few times in a row. When upstream is down, the
+    load retries add is therefore at most ``ratio`` of the normal load.
+    """
+
+    def __init__(self, ratio: float, burst: float) -> None:
+        if ratio < 0 or burst < 0:
+            raise ValueError("ratio and burst must not be negative")
+        self.ratio = ratio
+        self.burst = burst
+        self.balance = burst
+        self.stats = RetryBudgetStats()
+
+    def deposit(self) -> None:
+        self.balance = min(self.burst, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.balance < 1:
+            self.stats.exhausted += 1
+            return False
+        self.balance -= 1
+        self.stats.retries += 1
+        return True
+
+    def info(self) -> dict[str, Any]:
+        return {"balance": round(self.balance, 3), "ratio": self.ratio, **self.stats.as_dict()}
+
+
+@dataclass
+class BreakerStats:
+    # Times the breaker went from closed (or half-open) to open.
+    opened: int = 0
+    # Calls failed fast while open.
+    rejected: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class CircuitBreaker:
+    """
+    Closed: calls go through; ``failure_threshold`` failures in a row open it.
+    Open: calls fail fast with CircuitOpenError for ``reset_timeout`` seconds.
+    Half-open: one trial call goes through; its success closes the breaker,
+    its failure opens it again.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+    # Numeric state for dashboards and alerts.
+    STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold <= 0:
+            raise ValueError("failure_threshold must be a positive integer")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.stats = BreakerStats()
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial: object | None = None  # token of the half-open trial in flight
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def state_code(self) -> int:
+        return self.STATE_CODES[self.state]
+
+    def before_call(self) -> object | None:
+        """
+        Raise CircuitOpenError unless a call may go upstream now. The half-open
+        trial gets a token (other calls None) to hand to the ``record_*`` method
+        when it ends, so only the trial's own outcome decides or frees the trial.
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return None
+        if state == self.HALF_OPEN and self._trial is None:
+            self._trial = trial = object()
+            return trial
+        self.stats.rejected += 1
+        assert self._opened_at is not None
+        raise CircuitOpenError(max(self._opened_at + self.reset_timeout - self._clock(), 0.0))
+
+    def record_success(self, trial: object | None = None) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial = None  # closed; a trial still in flight no longer matters
+
+    def record_failure(self, trial: object | None = None) -> None:
+        self._failures += 1
+        is_trial = trial is not None and trial is self._trial
+        if is_trial or self._failures >= self.failure_threshold:
+            if self._opened_at is None or is_trial:
+                self.stats.opened += 1
+            self._opened_at = self._clock()
+        self._end_trial(trial)
+
+    def record_no_verdict(self, trial: object | None = None) -> None:
+        """The call ended without telling whether upstream is healthy (e.g. cancelled)."""
+        self._end_trial(trial)
+
+    def _end_trial(self, trial: object | None) -> None:
+        if trial is not None and trial is self._trial:
+            self._trial = None
+
+    def info(self) -> dict[str, Any]:
+        state = self.state
+        return {
+            "state": state,
+            "state_code": self.STATE_CODES[state],
+            "consecutive_failures": self._failures,
+            **self.stats.as_dict(),
+        }
@@ -0,0 +1,138 @@
+"""
+Shared uvicorn launcher for the services.
+
+    python -m inventory_service.run --profile prod --workers 8 --loop uvloop --http httptools
+
+Defaults come from ServerConfig (SERVER_* settings); command-line flags override
+them. The ``dev`` profile runs one auto-reloading process. The ``prod`` profile
+runs SERVER_WORKERS processes (one per core by default) without reload.
+"""
+
+import argparse
+import copy
+import logging
+import os
+from collections.abc import Callable
+from importlib.util import find_spec
+from typing import Any
+
+from common import config
+from common.config import ServerConfig
+
+logger = logging.getLogger(__name__)
+
+PROFILES = ("dev", "prod")
+# Optional implementations and the package each one needs.
+_OPTIONAL = {"uvloop": "uvloop", "httptools": "httptools"}
+
+
+def worker_count(settings: ServerConfig) -> int:
+    """Processes to start: always 1 for ``dev``, SERVER_WORKERS or the core count for ``prod``."""
+    if settings.SERVER_PROFILE == "dev":
+        return 1
+    return settings.SERVER_WORKERS or os.cpu_count() or 1
+
+
+def _available(choice: str, fallback: str) -> str:
+    package = _OPTIONAL.get(choice)
+    if package is not None and find_spec(package) is None:
+        logger.warning("%s is not installed; falling back to %s.", choice, fallback)
+        return fallback
+    return choice
+
+
+def uvicorn_options(app: str, port: int, settings: ServerConfig) -> dict[str, Any]:
+    """Keyword arguments for ``uvicorn.run`` serving ``app`` ("module:attr") with ``settings``."""
+    if settings.SERVER_PROFILE not in PROFILES:
+        raise ValueError(f"Unknown server profile '{settings.SERVER_PROFILE}'.")
+    dev = settings.SERVER_PROFILE == "dev"
+    package = app.split(".", 1)[0].split(":", 1)[0]
+    workers = worker_count(settings)
+    if workers > 1:
+        logger.warning(
+            "Metrics are kept per process: with %d workers, each /metrics scrape "
+            "reports only the worker that answered it. Run one worker to scrape them.",
+            workers,
+        )
+
+    # Route the service's own loggers (e.g. startup timings) through uvicorn's handler.
+    log_config = copy.deepcopy(_uvicorn_logging_config())
+    log_config["loggers"][package] = {"handlers": ["default"], "level": settings.LOG_LEVEL}
+
+    return {
+        "app": app,
+        "host": settings.SERVER_HOST,
+        "port": port,
+        "reload": dev,
+        "workers": workers,
+        "loop": _available(settings.SERVER_LOOP, "asyncio"),
+        "http": _available(settings.SERVER_HTTP, "h11"),
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout_keep_alive": settings.SERVER_KEEPALIVE_SECONDS,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        "log_level": settings.LOG_LEVEL.lower(),
+        "log_config": log_config,
+    }
+
+
+def _uvicorn_logging_config() -> dict[str, Any]:
+    from uvicorn.config import LOGGING_CONFIG
+
+    return LOGGING_CONFIG
+
+
+def parse_args(argv: list[str] | None, port: int) -> tuple[ServerConfig, int]:
+    parser = argparse.ArgumentParser(description="Run a service with uvicorn.")
+    parser.add_argument("--profile", choices=PROFILES)
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int, default=port)
+    parser.add_argument("--workers", type=int, help="prod only; 0 = one per CPU core")
+    parser.add_argument("--loop", choices=["asyncio", "uvloop"])
+    parser.add_argument("--http", choices=["h11", "httptools"])
+    parser.add_argument("--backlog", type=int, help="pending connections the socket queues")
+    parser.add_argument("--keep-alive", type=int, help="idle keep-alive timeout in seconds")
+    parser.add_argument(
+        "--graceful-timeout", type=int, help="seconds to drain in-flight requests on shutdown"
+    )
+    parser.add_argument("--log-level")
+    args = parser.parse_args(argv)
+
+    overrides = {
+        "SERVER_PROFILE": args.profile,
+        "SERVER_HOST": args.host,
+        "SERVER_WORKERS": args.workers,
+        "SERVER_LOOP": args.loop,
+        "SERVER_HTTP": args.http,
+        "SERVER_BACKLOG": args.backlog,
+        "SERVER_KEEPALIVE_SECONDS": args.keep_alive,
+        "SERVER_GRACEFUL_SHUTDOWN_SECONDS": args.graceful_timeout,
+        "LOG_LEVEL": args.log_level,
+    }
+    settings = config.server_setting.model_copy(
+        update={k: v for k, v in overrides.items() if v is not None}
+    )
+    return settings, args.port
+
+
+def serve(
+    app: str,
+    port: int,
+    argv: list[str] | None = None,
+    prepare: Callable[[ServerConfig], None] | None = None,
+) -> None:
+    """
+    Run ``app`` under uvicorn. ``prepare`` runs once in the launching process
+    before any worker starts; services use it to reject settings that are not
+    safe with several workers and to do one-off work such as seeding.
+    Raises SystemExit with the message of a ValueError raised by ``prepare``.
+    """
+    import uvicorn
+
+    settings, port = parse_args(argv, port)
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    if prepare is not None:
+        try:
+            prepare(settings)
+        except ValueError as ve:
+            raise SystemExit(str(ve)) from ve
+    uvicorn.run(**uvicorn_options(app, port, settings))
@@ -0,0 +1,31 @@
+"""
+Prometheus-style metrics: counters, gauges and histograms in a process-wide
+registry, rendered in the Prometheus text format. The ASGI middleware and
+the /metrics endpoint live in ``common.metrics.asgi``, so code that only
+records metrics does not import Starlette.
+
+Metrics are per process and not aggregated across workers, so a service
+whose /metrics is scraped must run with a single worker.
+"""
+
+from .registry import (
+    CONTENT_TYPE,
+    DEFAULT_BUCKETS,
+    FAST_BUCKETS,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+)
+
+__all__ = [
+    "CONTENT_TYPE",
+    "DEFAULT_BUCKETS",
+    "FAST_BUCKETS",
+    "REGISTRY",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Registry",
+]
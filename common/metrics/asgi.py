@@ -0,0 +1,73 @@
+from time import perf_counter
+
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from common.metrics.registry import CONTENT_TYPE, REGISTRY, Counter, Gauge, Histogram
+
+# Route label of requests no route matched, so unknown paths cannot grow the label set.
+UNMATCHED = "unmatched"
+# Method label of any other verb, for the same reason.
+OTHER_METHOD = "other"
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled.", ("method", "route", "status")
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving an HTTP request until its response was sent.",
+    ("method", "route"),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being handled; by method, as the route is only known after routing.",
+    ("method",),
+)
+
+
+class MetricsMiddleware:
+    """
+    Counts requests by method, route template (e.g. ``/items/{item_id}``)
+    and status, and records their latency and how many are in flight.
+
+    Plain ASGI rather than BaseHTTPMiddleware, so a request costs a few dict
+    lookups and two clock reads. The route is read from the scope after the
+    app ran, since FastAPI's router stores the matched route there.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        if method not in KNOWN_METHODS:
+            method = OTHER_METHOD
+        in_flight = HTTP_IN_FLIGHT.labels(method)
+        status = 500  # unless the app sends something else
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight.inc()
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = perf_counter() - started
+            in_flight.dec()
+            route = getattr(scope.get("route"), "path", UNMATCHED)
+            HTTP_LATENCY.labels(method, route).observe(elapsed)
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
+
+
+async def metrics(request: Request) -> Response:
+    """Every metric of the process in the Prometheus text format (GET /metrics)."""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,10 @@
+"""
+On-demand request profiling: a sampling profiler whose samples are written
+as folded stacks, ready for flamegraph.pl or speedscope. The ASGI
+middleware lives in ``common.profiling.asgi``, so the sampler can be used
+without Starlette.
+"""
+
+from .sampler import Profile, StackSampler
+
+__all__ = ["Profile", "StackSampler"]
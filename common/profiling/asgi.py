@@ -0,0 +1,100 @@
+import asyncio
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from common import config
+from common.config import ProfilingConfig
+from common.profiling.sampler import StackSampler
+
+# "X-Debug-Profile: <PROFILING_DEBUG_TOKEN>" profiles the request.
+DEBUG_HEADER = b"x-debug-profile"
+UNMATCHED = "unmatched"
+_UNSAFE = re.compile(r"[^\w{}.-]+")
+
+_sampler: StackSampler | None = None
+
+
+def get_sampler() -> StackSampler:
+    """The process-wide sampler, sampling every PROFILING_INTERVAL_MS."""
+    global _sampler
+    if _sampler is None:
+        _sampler = StackSampler(config.profiling_setting.PROFILING_INTERVAL_MS / 1000)
+    return _sampler
+
+
+def profile_path(directory: str, service: str, method: str, route: str) -> str:
+    """Where the folded stacks of ``method route`` go, e.g. ``GET_items_{item_id}.folded``."""
+    name = _UNSAFE.sub("_", route.strip("/")) or "root"
+    return os.path.join(directory, service, f"{method}_{name}.folded")
+
+
+def append_folded(path: str, folded: str) -> None:
+    """
+    Add a profile to the route's file. Tools summing the counts of equal
+    stacks (flamegraph.pl, speedscope) then show every profile of the route
+    together, including those of other workers appending to the same file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(folded)
+
+
+class ProfilingMiddleware:
+    """
+    Profiles PROFILING_SAMPLE_RATIO of the requests, and those sending
+    ``X-Debug-Profile`` with PROFILING_DEBUG_TOKEN, with a StackSampler.
+    Each profile is appended as folded stacks to a file per route under
+    PROFILING_DIR, written off the event loop after the response was sent.
+
+    Added innermost, so the stacks start at the app rather than at the
+    other middleware. Requests that are not profiled cost a random draw
+    (and a header scan when a token is set).
+    """
+
+    def __init__(self, app: ASGIApp, service: str) -> None:
+        self.app = app
+        self.service = service
+        self.pending: set[asyncio.Future[None]] = set()  # profiles being written
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        settings = config.profiling_setting
+        if not self._wanted(scope, settings):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = get_sampler()
+        profile = sampler.start(sys._getframe(), threading.get_ident())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            sampler.stop(profile)
+            if profile.samples:
+                method = scope["method"]
+                route = getattr(scope.get("route"), "path", UNMATCHED)
+                path = profile_path(settings.PROFILING_DIR, self.service, method, route)
+                future = asyncio.get_running_loop().run_in_executor(
+                    None, append_folded, path, profile.folded(f"{method} {route}")
+                )
+                self.pending.add(future)
+                future.add_done_callback(self.pending.discard)
+
+    @staticmethod
+    def _wanted(scope: Scope, settings: ProfilingConfig) -> bool:
+        ratio = settings.PROFILING_SAMPLE_RATIO
+        if ratio > 0 and random.random() < ratio:
+            return True
+        token = settings.PROFILING_DEBUG_TOKEN
+        if token:
+            for name, value in scope["headers"]:
+                if name == DEBUG_HEADER:
+                    return hmac.compare_digest(value, token.encode("latin-1"))
+        return False
@@ -0,0 +1,130 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType, FrameType
+
+_SITE_PACKAGES = f"site-packages{os.sep}"
+
+
+class Profile:
+    """
+    Stack samples of one request: how often each call stack, from the
+    profiled coroutine (``root``, excluded) to the running function, was
+    seen on ``thread_id``. Samples are taken only while the request runs on
+    that thread, so time spent awaiting I/O or other requests is not counted.
+    """
+
+    __slots__ = ("root", "thread_id", "samples")
+
+    def __init__(self, root: FrameType, thread_id: int) -> None:
+        self.root = root
+        self.thread_id = thread_id
+        self.samples: Counter[tuple[str, ...]] = Counter()
+
+    def folded(self, prefix: str) -> str:
+        """
+        The samples in the folded-stack format of flamegraph.pl, speedscope
+        and similar tools: ``frame;frame;frame count`` per line, root first,
+        with ``prefix`` (e.g. the route) as the bottom frame.
+        """
+        return "".join(
+            f"{';'.join((prefix, *stack))} {count}\n" for stack, count in self.samples.items()
+        )
+
+
+class StackSampler:
+    """
+    A sampling profiler: a daemon thread that, every ``interval`` seconds,
+    reads the current stack of each thread running a profiled request
+    (``sys._current_frames``) and counts it in that request's Profile.
+
+    The profiled code is not instrumented, so it runs at full speed; the
+    cost is the sampler thread taking the GIL for a moment per sample. For
+    it to get the GIL on time, the interpreter's switch interval is lowered
+    to ``interval`` while anything is profiled. Use one sampler per process,
+    so that setting is restored correctly. The thread is started on first
+    use and sleeps while nothing is profiled.
+    """
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self._profiles: set[Profile] = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._labels: dict[CodeType, str] = {}
+        self._switch_interval = sys.getswitchinterval()
+
+    def start(self, root: FrameType, thread_id: int | None = None) -> Profile:
+        """Profile what runs on top of ``root`` on ``thread_id`` (default: this thread)."""
+        profile = Profile(root, thread_id if thread_id is not None else threading.get_ident())
+        with self._lock:
+            if not self._profiles:
+                # Let the sampler in at least every interval, rather than every 5 ms.
+                self._switch_interval = sys.getswitchinterval()
+                sys.setswitchinterval(min(self._switch_interval, self.interval))
+            self._profiles.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+            self._wakeup.set()
+        return profile
+
+    def stop(self, profile: Profile) -> Profile:
+        with self._lock:
+            if profile in self._profiles:
+                self._profiles.discard(profile)
+                if not self._profiles:
+                    sys.setswitchinterval(self._switch_interval)
+        return profile
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._profiles:
+                    self._wakeup.clear()
+            self._wakeup.wait()  # returns at once while anything is profiled
+            time.sleep(self.interval)
+            with self._lock:
+                profiles = list(self._profiles)
+            self.sample(profiles)
+
+    def sample(self, profiles: list[Profile]) -> None:
+        frames = sys._current_frames()
+        for profile in profiles:
+            frame: FrameType | None = frames.get(profile.thread_id)
+            stack = []
+            code = None
+            while frame is not None and frame is not profile.root:
+                code = frame.f_code
+                stack.append(self._label(code))
+                frame = frame.f_back
+            # Only while the request is running, and not when it is stopping its profile.
+            if frame is not None and stack and code is not _STOP_CODE:
+                stack.reverse()
+                profile.samples[tuple(stack)] += 1
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)  # Python 3.11+
+            label = self._labels[code] = (
+                f"{name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+            )
+        return label
+
+
+_STOP_CODE = StackSampler.stop.__code__
+
+
+def _short_path(filename: str) -> str:
+    _, found, rest = filename.rpartition(_SITE_PACKAGES)
+    if found:
+        return rest
+    try:
+        relative = os.path.relpath(filename)
+    except ValueError:  # another drive on Windows
+        return filename
+    return filename if relative.startswith("..") else relative
@@ -0,0 +1,33 @@
+"""
+JSON responses that skip FastAPI's ``response_model`` round trip.
+
+A route that returns a ``Response`` is sent as is: FastAPI neither validates
+it against the ``response_model`` (which still documents the route) nor runs
+it through ``jsonable_encoder``. Routes use these classes for data they have
+already validated, serializing it with ``common.serialization.dumps``.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from common.serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with ``dumps``; ``content`` must be plain JSON data."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class RawJSONResponse(Response):
+    """A response body that is already serialized JSON, e.g. a cached payload."""
+
+    media_type = "application/json"
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> RawJSONResponse:
+    """Serialize ``model`` with pydantic's own (compiled) JSON serializer."""
+    return RawJSONResponse(model.model_dump_json(), status_code=status_code)
@@ -0,0 +1,23 @@
+"""
+Compact JSON encoding, with orjson when it is installed.
+"""
+
+import json
+from importlib.util import find_spec
+from typing import Any
+
+# orjson is an optional speedup (pip install orjson); the stdlib is the fallback.
+ORJSON_ENABLED = find_spec("orjson") is not None
+
+if ORJSON_ENABLED:
+    import orjson
+
+    def dumps(content: Any) -> bytes:
+        """Compact JSON for plain dicts, lists and scalars."""
+        return orjson.dumps(content)
+
+else:  # pragma: no cover - orjson is an optional speedup
+
+    def dumps(content: Any) -> bytes:
+        """Compact JSON for plain dicts, lists and scalars."""
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
@@ -0,0 +1,180 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import Request, Response
+
+from common.config import InventoryAPIConfig
+from common.inventory_client import InventoryClient, TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock: FakeClock) -> TTLCache[str]:
+    return TTLCache(max_size=2, ttl=10.0, negative_ttl=1.0, clock=clock)
+
+
+@pytest.mark.asyncio
+async def test_read_through_hit_and_miss(cache: TTLCache[str]) -> None:
+    loader = AsyncMock(return_value="v")
+
+    assert await cache.get_or_load("a", loader) == "v"
+    assert await cache.get_or_load("a", loader) == "v"
+
+    loader.assert_awaited_once()
+    assert cache.stats.misses == 1
+    assert cache.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl(cache: TTLCache[str], clock: FakeClock) -> None:
+    loader = AsyncMock(side_effect=["old", "new"])
+
+    await cache.get_or_load("a", loader)
+    clock.now = 10.0
+
+    assert await cache.get_or_load("a", loader) == "new"
+    assert cache.stats.expirations == 1
+
+
+@pytest.mark.asyncio
+async def test_negative_results_use_negative_ttl(cache: TTLCache[str], clock: FakeClock) -> None:
+    loader = AsyncMock(side_effect=[None, "found"])
+
+    assert await cache.get_or_load("a", loader) is None
+    assert await cache.get_or_load("a", loader) is None
+    assert cache.stats.negative_hits == 1
+
+    clock.now = 1.0
+    assert await cache.get_or_load("a", loader) == "found"
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction(cache: TTLCache[str]) -> None:
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert "a" in cache  # touch "a" so "b" is least recently used
+    cache.set("c", "3")
+
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.stats.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_are_coalesced(cache: TTLCache[str]) -> None:
+    release = asyncio.Event()
+    calls = 0
+
+    async def loader() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "v"
+
+    waiters = [asyncio.create_task(cache.get_or_load("a", loader)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["v"] * 5
+    assert calls == 1
+    assert cache.stats.coalesced == 4
+
+
+@pytest.mark.asyncio
+async def test_batch_loads_share_loads_in_flight(clock: FakeClock) -> None:
+    cache: TTLCache[str] = TTLCache(max_size=10, ttl=10.0, negative_ttl=1.0, clock=clock)
+    release = asyncio.Event()
+    batches: list[list[str]] = []
+
+    async def load_one() -> str:
+        await release.wait()
+        return "single"
+
+    async def load_many(keys: list[str]) -> dict[str, str | None]:
+        batches.append(keys)
+        await release.wait()
+        return {key: key.upper() for key in keys if key != "gone"}
+
+    cache.set("cached", "hit")
+    single = asyncio.create_task(cache.get_or_load("a", load_one))
+    first = asyncio.create_task(cache.get_or_load_many(["a", "b", "gone"], load_many))
+    second = asyncio.create_task(cache.get_or_load_many(["b", "c", "cached"], load_many))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await single == "single"
+    assert await first == {"a": "single", "b": "B", "gone": None}
+    assert await second == {"cached": "hit", "b": "B", "c": "C"}
+    assert batches == [["b", "gone"], ["c"]]
+    assert (cache.stats.misses, cache.stats.coalesced) == (4, 2)
+    assert cache.get("gone") == (True, None)
+
+
+@pytest.mark.asyncio
+async def test_loader_errors_are_not_cached(cache: TTLCache[str]) -> None:
+    loader = AsyncMock(side_effect=[RuntimeError("boom"), "v"])
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load("a", loader)
+
+    assert await cache.get_or_load("a", loader) == "v"
+
+
+@pytest.mark.asyncio
+async def test_invalidate_discards_a_load_in_flight(cache: TTLCache[str]) -> None:
+    release = asyncio.Event()
+
+    async def loader() -> str:
+        await release.wait()
+        return "stale"
+
+    waiter = asyncio.create_task(cache.get_or_load("a", loader))
+    await asyncio.sleep(0)
+    cache.invalidate("a")  # the data changed while it was being read
+    release.set()
+
+    assert await waiter == "stale"
+    assert "a" not in cache
+
+
+def test_invalid_size() -> None:
+    with pytest.raises(ValueError):
+        TTLCache(max_size=0, ttl=1.0, negative_ttl=1.0)
+
+
+@pytest.mark.asyncio
+async def test_inventory_client_caches_find_item() -> None:
+    settings = InventoryAPIConfig(
+        INVENTORY_BASE_URL="http://mock-inventory-api", INVENTORY_CACHE_ENABLED=True
+    )
+    client = InventoryClient(settings)
+    response = Response(
+        200,
+        json={"id": "item123", "stock": 10},
+        request=Request("GET", "http://mock-inventory-api/items/item123"),
+    )
+
+    with patch.object(client._client, "get", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = response
+        first = await client.find_item("item123")
+        second = await client.find_item("item123")
+
+    assert first == second == {"id": "item123", "stock": 10}
+    mock_get.assert_awaited_once()
+    stats = client.cache_stats()
+    assert stats is not None
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    await client.aclose()
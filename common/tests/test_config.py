@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import common.config
+from common.config import CartStoreConfig, config
+
+
+def test_importing_config_reads_nothing() -> None:
+    snippet = (
+        "import common.config as c; print(c.config._env_loaded, 'cart_store_setting' in vars(c))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", snippet],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    assert out.split() == ["False", "False"]
+
+
+def test_settings_are_built_once_on_first_access(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delitem(vars(common.config), "cart_store_setting", raising=False)
+    monkeypatch.delitem(vars(config), "cart_store_setting", raising=False)
+    monkeypatch.setenv("CART_STORE_BACKEND", "redis")
+
+    first = common.config.cart_store_setting
+    monkeypatch.setenv("CART_STORE_BACKEND", "memory")
+
+    assert isinstance(first, CartStoreConfig)
+    assert first.CART_STORE_BACKEND == "redis"
+    assert common.config.cart_store_setting is first
+
+
+def test_load_env_reads_dotenv_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Stands in for python-dotenv, whose search for .env depends on the caller's frame.
+    calls: list[None] = []
+
+    def fake_load_dotenv() -> bool:
+        calls.append(None)
+        os.environ["CART_TTL_SECONDS"] = "12"
+        return True
+
+    monkeypatch.setattr(config, "load_dotenv", fake_load_dotenv)
+    monkeypatch.delenv("CART_TTL_SECONDS", raising=False)
+    monkeypatch.setattr(config, "_env_loaded", False)
+
+    assert config.load_cart_store().CART_TTL_SECONDS == 12
+    monkeypatch.delenv("CART_TTL_SECONDS")
+    assert config.load_cart_store().CART_TTL_SECONDS == 7 * 24 * 3600
+    assert len(calls) == 1
+
+
+def test_unknown_attribute() -> None:
+    with pytest.raises(AttributeError):
+        common.config.no_such_setting  # noqa: B018
@@ -0,0 +1,135 @@
+import asyncio
+import json
+
+import pytest
+
+from common.config import EventsConfig
+from common.events import (
+    EventPublisher,
+    InMemoryBroker,
+    KafkaBroker,
+    Message,
+    create_broker,
+    create_event_publisher,
+)
+
+
+class GatedBroker(InMemoryBroker):
+    """Holds every send until ``gate`` is set; fails while ``failing`` is True."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gate = asyncio.Event()
+        self.failing = False
+        self.batches: list[int] = []
+
+    async def send(self, messages: list[Message]) -> None:
+        await self.gate.wait()
+        self.batches.append(len(messages))
+        if self.failing:
+            raise ConnectionError("broker down")
+        await super().send(messages)
+
+
+def values(broker: InMemoryBroker, topic: str) -> list[int]:
+    return [json.loads(m.value)["n"] for m in broker.messages(topic)]
+
+
+async def test_events_are_sent_in_batches_in_order() -> None:
+    broker = GatedBroker()
+    publisher = EventPublisher(broker, linger=0, batch_size=2)
+
+    for n in range(5):
+        assert publisher.publish("cart.updated", {"n": n}, key="u1")
+    broker.gate.set()
+    await publisher.aclose()
+
+    assert values(broker, "cart.updated") == [0, 1, 2, 3, 4]
+    assert broker.messages("cart.updated")[0].key == b"u1"
+    assert max(broker.batches) == 2
+    assert publisher.stats.published == 5
+
+
+async def test_linger_collects_a_batch() -> None:
+    broker = InMemoryBroker()
+    publisher = EventPublisher(broker, linger=0.05, batch_size=100)
+
+    for n in range(3):
+        publisher.publish("t", {"n": n})
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.1)
+
+    assert values(broker, "t") == [0, 1, 2]
+    assert publisher.stats.batches == 1
+    await publisher.aclose()
+
+
+async def test_full_buffer_drops_instead_of_blocking() -> None:
+    broker = GatedBroker()
+    publisher = EventPublisher(broker, linger=0, batch_size=1, buffer_size=2)
+
+    publisher.publish("t", {"n": 0})
+    await asyncio.sleep(0)  # the sender takes event 0 and waits on the broker
+    accepted = [publisher.publish("t", {"n": n}) for n in range(1, 5)]
+
+    assert accepted == [True, True, False, False]
+    assert publisher.info()["buffered"] == 2
+    assert publisher.stats.dropped == 2
+    assert publisher.stats.max_buffered == 2
+    broker.gate.set()
+    await publisher.aclose()
+    assert values(broker, "t") == [0, 1, 2]
+
+
+async def test_broker_failures_are_counted() -> None:
+    broker = GatedBroker()
+    broker.failing = True
+    broker.gate.set()
+    publisher = EventPublisher(broker, linger=0)
+
+    publisher.publish("t", {"n": 0})
+    await asyncio.sleep(0.01)
+
+    assert publisher.stats.failed == 1
+    assert publisher.stats.published == 0
+    await publisher.aclose()
+
+
+async def test_in_memory_consumers_get_new_messages_of_their_topics() -> None:
+    broker = InMemoryBroker()
+    await broker.send([Message("a", None, b"before")])
+    consumer = broker.consume(["a", "b"])
+    first = asyncio.ensure_future(consumer.__anext__())
+    await asyncio.sleep(0)
+
+    await broker.send([Message("c", None, b"other"), Message("b", b"k", b"1")])
+    await broker.send([Message("a", None, b"2")])
+
+    assert (await first).value == b"1"
+    assert (await consumer.__anext__()).value == b"2"
+    await consumer.aclose()
+    assert broker._consumers == []
+
+
+def test_settings_pick_the_broker() -> None:
+    publisher = create_event_publisher(
+        EventsConfig(EVENTS_BACKEND="memory", EVENTS_LINGER_MS=20, EVENTS_BATCH_SIZE=50)
+    )
+    assert isinstance(publisher.broker, InMemoryBroker)
+    assert (publisher.linger, publisher.batch_size) == (0.02, 50)
+
+    kafka = create_broker(
+        EventsConfig(
+            EVENTS_BACKEND="kafka",
+            KAFKA_BOOTSTRAP_SERVERS="a:9092,b:9092",
+            EVENTS_COMPRESSION="none",
+        )
+    )
+    assert isinstance(kafka, KafkaBroker)
+    assert kafka.bootstrap_servers == ["a:9092", "b:9092"]
+    assert kafka.compression is None
+
+    with pytest.raises(ValueError, match="compression"):
+        KafkaBroker("localhost:9092", compression="brotli")
+    with pytest.raises(ValueError, match="events backend"):
+        create_broker(EventsConfig(EVENTS_BACKEND="rabbit"))
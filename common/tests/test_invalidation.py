@@ -0,0 +1,124 @@
+import asyncio
+from collections.abc import AsyncGenerator, Iterable
+from typing import Any
+
+import pytest
+
+from common.config import EventsConfig, InventoryAPIConfig
+from common.events import EventPublisher, InMemoryBroker, Message
+from common.inventory_client import CacheInvalidator, InventoryClient
+
+
+@pytest.fixture
+def client() -> InventoryClient:
+    client = InventoryClient(
+        InventoryAPIConfig(
+            INVENTORY_BASE_URL="http://mock-inventory-api",
+            INVENTORY_CACHE_ENABLED=True,
+            INVENTORY_CACHE_TTL_SECONDS=3600,
+        )
+    )
+    assert client.cache is not None and client.validators is not None
+    client.cache.set("1-1", {"id": "1-1", "stock": 10})
+    client.cache.set("1-2", {"id": "1-2", "stock": 5})
+    client.validators.set("/items/1-1", 'W/"a-1"', {"id": "1-1", "stock": 10})
+    return client
+
+
+async def deliver(publisher: EventPublisher, events: list[tuple[str, dict[str, Any]]]) -> None:
+    for topic, event in events:
+        publisher.publish(topic, event)
+    await publisher.aclose()
+    await asyncio.sleep(0)  # let the consumer task handle them
+
+
+@pytest.mark.asyncio
+async def test_stock_events_update_and_evict_cached_items(client: InventoryClient) -> None:
+    broker = InMemoryBroker()
+    invalidator = CacheInvalidator(client, broker)
+    await invalidator.start()
+
+    await deliver(
+        EventPublisher(broker, linger=0),
+        [
+            (
+                "inventory.stock_changed",
+                {"type": "stock_changed", "item_id": "1-1", "item": {"id": "1-1", "stock": 7}},
+            ),
+            ("inventory.reserved", {"type": "reserved", "item_id": "1-2", "remaining_stock": 4}),
+            ("inventory.failed", {"type": "reservation_failed", "item_id": "9-9"}),
+        ],
+    )
+
+    assert client.cache is not None and client.validators is not None
+    assert client.cache.get("1-1") == (True, {"id": "1-1", "stock": 7})
+    assert "1-2" not in client.cache
+    assert client.validators.get("/items/1-1") is None
+    assert invalidator.stats.as_dict() == {
+        "received": 3,
+        "updated": 1,
+        "evicted": 1,
+        "cleared": 0,
+        "errors": 0,
+    }
+    await invalidator.aclose()
+    assert not invalidator.info()["running"]
+
+
+@pytest.mark.asyncio
+async def test_catalog_reset_and_bad_events(client: InventoryClient) -> None:
+    invalidator = CacheInvalidator(client, InMemoryBroker())
+
+    invalidator.handle(Message("inventory.stock_changed", None, b"not json"))
+    invalidator.handle(Message("inventory.stock_changed", None, b'{"type": "catalog_reset"}'))
+
+    assert client.cache is not None and len(client.cache) == 0
+    assert invalidator.stats.errors == 1
+    assert invalidator.stats.cleared == 1
+
+
+class FlakyBroker(InMemoryBroker):
+    """The first subscription fails; later ones work."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.subscriptions = 0
+
+    async def consume(self, topics: Iterable[str]) -> AsyncGenerator[Message, None]:
+        self.subscriptions += 1
+        if self.subscriptions == 1:
+            raise ConnectionError("broker down")
+        async for message in super().consume(topics):
+            yield message
+
+
+@pytest.mark.asyncio
+async def test_broker_failure_clears_caches_and_resubscribes(
+    client: InventoryClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("common.inventory_client.invalidation.RETRY_SECONDS", 0)
+    broker = FlakyBroker()
+    invalidator = CacheInvalidator(client, broker)
+
+    await invalidator.start()
+    await asyncio.sleep(0.01)
+
+    assert broker.subscriptions == 2
+    assert client.cache is not None and len(client.cache) == 0  # events may have been missed
+    assert (invalidator.stats.errors, invalidator.stats.cleared) == (1, 1)
+    await invalidator.aclose()
+
+
+@pytest.mark.asyncio
+async def test_warns_when_events_cannot_cross_processes(
+    client: InventoryClient, caplog: pytest.LogCaptureFixture
+) -> None:
+    for backend in ("memory", "kafka"):
+        invalidator = CacheInvalidator(
+            client, InMemoryBroker(), EventsConfig(EVENTS_BACKEND=backend)
+        )
+        await invalidator.start()
+        await invalidator.aclose()
+
+    warnings = [r.getMessage() for r in caplog.records if r.levelname == "WARNING"]
+    assert len(warnings) == 1 and "'memory'" in warnings[0]
@@ -1,10 +1,12 @@
+import asyncio
+from typing import Any
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from httpx import Request, RequestError, Response, TimeoutException
 
 from common.config import InventoryAPIConfig
-from common.inventory_client import InventoryClient
+from common.inventory_client import InventoryClient, ValidatorCache
 
 
 @pytest.fixture(autouse=True)
@@ -80,3 +82,159 @@ async def test_get_timeout_retries_and_fails(mock_inventory_api_settings: AsyncM
             await client.find_item("item123")
 
         assert mock_get.call_count == mock_inventory_api_settings.HTTP_RETRIES
+
+
+@pytest.mark.asyncio
+async def test_client_uses_configured_pool_limits() -> None:
+    settings = InventoryAPIConfig(
+        INVENTORY_BASE_URL="http://mock-inventory-api",
+        HTTP_MAX_CONNECTIONS=7,
+        HTTP_MAX_KEEPALIVE_CONNECTIONS=3,
+        HTTP_KEEPALIVE_EXPIRY=12.5,
+        HTTP2=False,
+    )
+    client = InventoryClient(settings)
+
+    stats = client.pool_stats()
+
+    assert stats["max_connections"] == 7
+    assert stats["max_keepalive_connections"] == 3
+    assert stats["keepalive_expiry"] == 12.5
+    assert stats["http2"] is False
+    assert stats["requests_in_flight"] == 0
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_count_requests_awaiting_an_answer() -> None:
+    client = InventoryClient(InventoryAPIConfig(INVENTORY_BASE_URL="http://mock-inventory-api"))
+    answered = asyncio.Event()
+    seen: list[int] = []
+
+    async def slow_get(*args: Any, **kwargs: Any) -> Response:
+        seen.append(client.pool_stats()["requests_in_flight"])
+        await answered.wait()
+        return Response(404, request=Request("GET", "http://mock-inventory-api/items/a"))
+
+    with patch.object(client._client, "get", new=slow_get):
+        lookups = [asyncio.create_task(client.find_item(i)) for i in ("a", "b")]
+        await asyncio.sleep(0)
+        assert client.pool_stats()["requests_in_flight"] == 2
+        answered.set()
+        await asyncio.gather(*lookups)
+
+    assert seen == [1, 2]
+    assert client.pool_stats()["requests_in_flight"] == 0
+    await client.aclose()
+
+
+def _batch_response(items: list[dict[str, Any]], missing: list[str]) -> Response:
+    return Response(
+        200,
+        json={"items": items, "missing": missing},
+        request=Request("POST", "http://mock-inventory-api/items:batch"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_find_items_single_round_trip() -> None:
+    client = InventoryClient()
+
+    with patch.object(client._client, "post", new_callable=AsyncMock) as mock_post:
+        mock_post.return_value = _batch_response([{"id": "a", "stock": 1}], ["b"])
+
+        result = await client.find_items(["a", "b", "a"])
+
+    assert result == {"a": {"id": "a", "stock": 1}, "b": None}
+    mock_post.assert_awaited_once_with("/items:batch", json={"ids": ["a", "b"]})
+
+
+@pytest.mark.asyncio
+async def test_find_items_serves_cached_ids_locally() -> None:
+    client = InventoryClient(
+        InventoryAPIConfig(
+            INVENTORY_BASE_URL="http://mock-inventory-api", INVENTORY_CACHE_ENABLED=True
+        )
+    )
+    assert client.cache is not None
+    client.cache.set("a", {"id": "a", "stock": 1})
+    client.cache.set("gone", None)
+
+    with patch.object(client._client, "post", new_callable=AsyncMock) as mock_post:
+        mock_post.return_value = _batch_response([{"id": "b", "stock": 2}], [])
+
+        result = await client.find_items(["a", "gone", "b"])
+
+    assert result == {"a": {"id": "a", "stock": 1}, "gone": None, "b": {"id": "b", "stock": 2}}
+    mock_post.assert_awaited_once_with("/items:batch", json={"ids": ["b"]})
+    assert client.cache.get("b") == (True, {"id": "b", "stock": 2})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_find_items_share_one_request() -> None:
+    client = InventoryClient(
+        InventoryAPIConfig(
+            INVENTORY_BASE_URL="http://mock-inventory-api", INVENTORY_CACHE_ENABLED=True
+        )
+    )
+    answered = asyncio.Event()
+
+    async def post(*args: Any, **kwargs: Any) -> Response:
+        await answered.wait()
+        return _batch_response([{"id": "a", "stock": 1}], ["b"])
+
+    with patch.object(client._client, "post", new_callable=AsyncMock) as mock_post:
+        mock_post.side_effect = post
+        lookups = [asyncio.create_task(client.find_items(["a", "b"])) for _ in range(2)]
+        await asyncio.sleep(0)
+        answered.set()
+        first, second = await asyncio.gather(*lookups)
+
+    assert first == second == {"a": {"id": "a", "stock": 1}, "b": None}
+    mock_post.assert_awaited_once_with("/items:batch", json={"ids": ["a", "b"]})
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_find_item_revalidates_with_etag() -> None:
+    client = InventoryClient()
+    request = Request("GET", "http://mock-inventory-api/items/item123")
+    item = {"id": "item123", "stock": 10}
+    responses = [
+        Response(200, json=item, headers={"ETag": 'W/"e-1"'}, request=request),
+        Response(304, headers={"ETag": 'W/"e-1"'}, request=request),
+        Response(200, json={**item, "stock": 9}, headers={"ETag": 'W/"e-2"'}, request=request),
+    ]
+
+    with patch.object(client._client, "get", new_callable=AsyncMock) as mock_get:
+        mock_get.side_effect = responses
+
+        first = await client.find_item("item123")
+        second = await client.find_item("item123")
+        third = await client.find_item("item123")
+
+    assert first == second == item
+    assert third == {**item, "stock": 9}
+    assert mock_get.await_args_list[0].args == ("/items/item123",)
+    assert mock_get.await_args_list[1].kwargs == {"headers": {"If-None-Match": 'W/"e-1"'}}
+    assert client.validator_stats() == {
+        "size": 1,
+        "max_size": 10000,
+        "not_modified": 1,
+        "modified": 1,
+        "evictions": 0,
+    }
+    assert client.validators is not None
+    assert client.validators.get("/items/item123") == ('W/"e-2"', third)
+
+
+def test_validator_cache_is_bounded() -> None:
+    cache = ValidatorCache(max_size=2)
+    for key in "abc":
+        cache.set(key, f'"{key}"', key)
+
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.stats.evictions == 1
+    with pytest.raises(ValueError):
+        ValidatorCache(max_size=0)
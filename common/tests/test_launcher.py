@@ -0,0 +1,96 @@
+from typing import Any
+
+import pytest
+
+from common import launcher
+from common.config import ServerConfig
+
+
+def server(**overrides: Any) -> ServerConfig:
+    values: dict[str, Any] = {
+        "SERVER_PROFILE": "prod",
+        "SERVER_HOST": "127.0.0.1",
+        "SERVER_WORKERS": 4,
+        "SERVER_LOOP": "asyncio",
+        "SERVER_HTTP": "h11",
+        "SERVER_BACKLOG": 4096,
+        "SERVER_KEEPALIVE_SECONDS": 15,
+        "SERVER_GRACEFUL_SHUTDOWN_SECONDS": 20,
+        "LOG_LEVEL": "WARNING",
+    }
+    return ServerConfig(**{**values, **overrides})
+
+
+def test_prod_profile_options() -> None:
+    options = launcher.uvicorn_options("inventory_service.main:app", 8000, server())
+
+    assert options["app"] == "inventory_service.main:app"
+    assert options["reload"] is False
+    assert options["workers"] == 4
+    assert (options["backlog"], options["timeout_keep_alive"]) == (4096, 15)
+    assert options["timeout_graceful_shutdown"] == 20
+    assert options["log_level"] == "warning"
+    assert options["log_config"]["loggers"]["inventory_service"]["level"] == "WARNING"
+
+
+def test_several_workers_warn_that_metrics_are_per_process(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    launcher.uvicorn_options("app:app", 1, server(SERVER_WORKERS=2))
+    launcher.uvicorn_options("app:app", 1, server(SERVER_WORKERS=1))
+
+    assert [r.getMessage() for r in caplog.records if "/metrics" in r.getMessage()] == [
+        "Metrics are kept per process: with 2 workers, each /metrics scrape reports only "
+        "the worker that answered it. Run one worker to scrape them."
+    ]
+
+
+def test_dev_profile_reloads_in_one_process() -> None:
+    options = launcher.uvicorn_options("cart_service.main:app", 8002, server(SERVER_PROFILE="dev"))
+    assert options["reload"] is True
+    assert options["workers"] == 1
+
+
+def test_workers_default_to_core_count(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(launcher.os, "cpu_count", lambda: 6)
+    assert launcher.worker_count(server(SERVER_WORKERS=0)) == 6
+
+
+def test_optional_speedups_fall_back_when_missing(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(launcher, "find_spec", lambda name: None)
+    options = launcher.uvicorn_options(
+        "app:app", 1, server(SERVER_LOOP="uvloop", SERVER_HTTP="httptools")
+    )
+    assert (options["loop"], options["http"]) == ("asyncio", "h11")
+
+    monkeypatch.setattr(launcher, "find_spec", lambda name: object())
+    options = launcher.uvicorn_options(
+        "app:app", 1, server(SERVER_LOOP="uvloop", SERVER_HTTP="httptools")
+    )
+    assert (options["loop"], options["http"]) == ("uvloop", "httptools")
+
+
+def test_unknown_profile() -> None:
+    with pytest.raises(ValueError):
+        launcher.uvicorn_options("app:app", 1, server(SERVER_PROFILE="staging"))
+
+
+def test_flags_override_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("common.config.server_setting", server())
+
+    settings, port = launcher.parse_args(["--workers", "2", "--keep-alive", "30"], port=8000)
+
+    assert port == 8000
+    assert settings.SERVER_WORKERS == 2
+    assert settings.SERVER_KEEPALIVE_SECONDS == 30
+    assert settings.SERVER_BACKLOG == 4096
+
+
+def test_serve_turns_prepare_errors_into_exit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("common.config.server_setting", server())
+
+    def refuse(settings: ServerConfig) -> None:
+        raise ValueError("needs sqlite")
+
+    with pytest.raises(SystemExit, match="needs sqlite"):
+        launcher.serve("app:app", 1, argv=[], prepare=refuse)
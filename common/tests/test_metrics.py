@@ -0,0 +1,83 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from common.metrics import CONTENT_TYPE, Counter, Gauge, Histogram, Registry
+from common.metrics.asgi import HTTP_IN_FLIGHT, HTTP_REQUESTS, MetricsMiddleware, metrics
+
+
+def test_registry_renders_the_prometheus_text_format() -> None:
+    registry = Registry()
+    requests = Counter("requests_total", "Requests.", ("route",), registry=registry)
+    depth = Gauge("queue_depth", "Queued jobs.", registry=registry)
+    latency = Histogram("latency_seconds", "Latency.", ("route",), (0.1, 1), registry=registry)
+
+    requests.labels('/a"b').inc()
+    requests.labels('/a"b').inc(2)
+    depth.labels().set_function(lambda: 7)
+    for seconds in (0.05, 0.1, 0.5, 3):
+        latency.labels("/x").observe(seconds)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a\\"b"} 3.0',
+        "# HELP queue_depth Queued jobs.",
+        "# TYPE queue_depth gauge",
+        "queue_depth 7.0",
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/x",le="0.1"} 2',
+        'latency_seconds_bucket{route="/x",le="1.0"} 3',
+        'latency_seconds_bucket{route="/x",le="+Inf"} 4',
+        'latency_seconds_sum{route="/x"} 3.65',
+        'latency_seconds_count{route="/x"} 4',
+    ]
+
+
+def test_names_and_labels_are_checked() -> None:
+    registry = Registry()
+    counter = Counter("jobs_total", "Jobs.", ("queue",), registry=registry)
+
+    with pytest.raises(ValueError, match="already registered"):
+        Counter("jobs_total", "Jobs again.", registry=registry)
+    with pytest.raises(ValueError, match="takes labels"):
+        counter.labels("a", "b")
+
+
+app = FastAPI()
+app.add_middleware(MetricsMiddleware)
+app.add_api_route("/metrics", metrics, include_in_schema=False)
+
+
+@app.get("/things/{thing_id}")
+async def get_thing(thing_id: str) -> dict[str, str]:
+    return {"id": thing_id}
+
+
+@pytest.mark.asyncio
+async def test_middleware_labels_requests_by_route_template() -> None:
+    found = HTTP_REQUESTS.labels("GET", "/things/{thing_id}", "200")
+    unmatched = HTTP_REQUESTS.labels("GET", "unmatched", "404")
+    other = HTTP_REQUESTS.labels("other", "unmatched", "404")
+    scrapes = HTTP_REQUESTS.labels("GET", "/metrics", "200")
+    before = found.value, unmatched.value, other.value, scrapes.value
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        await ac.get("/things/1")
+        await ac.get("/things/2")
+        await ac.get("/nowhere")
+        await ac.request("FROB", "/things/1")
+        await ac.request("FROBNICATE", "/nowhere")
+        exposition = await ac.get("/metrics")
+
+    assert (found.value - before[0], unmatched.value - before[1]) == (2, 1)
+    assert other.value - before[2] == 1  # unknown verbs share one label
+    assert scrapes.value - before[3] == 1  # under its own route, not "unmatched"
+    assert 'http_requests_in_progress{method="GET"} 1.0' in exposition.text  # itself
+    assert HTTP_IN_FLIGHT.labels("GET").value == 0
+    assert exposition.headers["content-type"] == CONTENT_TYPE
+    assert 'method="FROB' not in exposition.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/things/{thing_id}"}' in (
+        exposition.text
+    )
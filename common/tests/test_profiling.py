@@ -0,0 +1,78 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from pytest import MonkeyPatch
+
+from common.config import ProfilingConfig
+from common.profiling import StackSampler
+from common.profiling.asgi import ProfilingMiddleware, profile_path
+
+
+def hot_loop(seconds: float) -> None:
+    until = time.perf_counter() + seconds
+    while time.perf_counter() < until:
+        pass
+
+
+def test_sampler_counts_the_stacks_above_the_root() -> None:
+    sampler = StackSampler(interval=0.001)
+    switch_interval = sys.getswitchinterval()
+
+    profile = sampler.start(sys._getframe())
+    hot_loop(0.05)
+    sampler.stop(profile)
+
+    assert sys.getswitchinterval() == switch_interval  # restored
+    assert sum(profile.samples.values()) > 1
+    stacks = profile.folded("GET /things").splitlines()
+    assert any(
+        line.startswith("GET /things;hot_loop (common/tests/test_profiling.py:") for line in stacks
+    )
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
+
+
+def test_routes_map_to_safe_file_names() -> None:
+    assert profile_path("p", "inventory", "GET", "/items/{item_id}") == str(
+        Path("p", "inventory", "GET_items_{item_id}.folded")
+    )
+    assert profile_path("p", "cart", "GET", "/") == str(Path("p", "cart", "GET_root.folded"))
+
+
+app = FastAPI()
+
+
+@app.get("/things/{thing_id}")
+async def get_thing(thing_id: str) -> dict[str, str]:
+    hot_loop(0.05)
+    return {"id": thing_id}
+
+
+@pytest.mark.asyncio
+async def test_debug_header_profiles_a_request(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        "common.config.profiling_setting",
+        ProfilingConfig(PROFILING_DEBUG_TOKEN="s3cret", PROFILING_DIR=str(tmp_path)),
+    )
+    middleware = ProfilingMiddleware(app, service="things")
+
+    async with AsyncClient(transport=ASGITransport(app=middleware), base_url="http://t") as ac:
+        assert (await ac.get("/things/1")).status_code == 200
+        await ac.get("/things/2", headers={"X-Debug-Profile": "guess"})
+        await asyncio.gather(*middleware.pending)
+        assert not (tmp_path / "things").exists()  # nothing profiled yet
+        assert (await ac.get("/things/3", headers={"X-Debug-Profile": "s3cret"})).json() == {
+            "id": "3"
+        }
+    await asyncio.gather(*middleware.pending)
+
+    (written,) = (tmp_path / "things").iterdir()
+    assert written.name == "GET_things_{thing_id}.folded"
+    lines = written.read_text().splitlines()
+    assert all(line.startswith("GET /things/{thing_id};") for line in lines)
+    assert any(";get_thing (common/tests/test_profiling.py:" in line for line in lines)
+    assert any("hot_loop" in line for line in lines)
@@ -0,0 +1,203 @@
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ConnectError, HTTPStatusError, Request, Response
+
+from common.config import InventoryAPIConfig
+from common.inventory_client import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    InventoryClient,
+    RetryBudget,
+    deadline,
+)
+from common.inventory_client.inventory_client import BREAKER_STATE, UPSTREAM_RETRIES
+from common.inventory_client.resilience import backoff_delay, time_left
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_client(**settings: Any) -> InventoryClient:
+    return InventoryClient(
+        InventoryAPIConfig(
+            INVENTORY_BASE_URL="http://mock-inventory-api",
+            HTTP_RETRIES=3,
+            HTTP_BACKOFF_BASE_SECONDS=0,
+            **settings,
+        )
+    )
+
+
+def answer(status: int) -> Response:
+    return Response(
+        status, json={"id": "a"}, request=Request("GET", "http://mock-inventory-api/items/a")
+    )
+
+
+def test_breaker_opens_fails_fast_and_recovers_through_one_trial() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.info()["state_code"] == 2
+    with pytest.raises(CircuitOpenError) as open_error:
+        breaker.before_call()
+    assert open_error.value.retry_after == 10
+
+    clock.now = 10
+    assert breaker.state == "half_open"
+    trial = breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one at a time
+    breaker.record_failure(trial)
+    assert breaker.state == "open"
+
+    clock.now = 20
+    breaker.record_success(breaker.before_call())
+    assert breaker.info() == {
+        "state": "closed",
+        "state_code": 0,
+        "consecutive_failures": 0,
+        "opened": 2,
+        "rejected": 2,
+    }
+
+
+def test_only_the_trial_frees_the_half_open_slot() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    earlier = breaker.before_call()  # still in flight when another call opens the breaker
+    breaker.record_failure(breaker.before_call())
+
+    clock.now = 10
+    trial = breaker.before_call()
+    assert earlier is None and trial is not None
+    breaker.record_no_verdict(earlier)  # cancelled while the trial runs
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_no_verdict(trial)
+    assert breaker.before_call() is not None  # the next trial
+
+
+def test_retry_budget_refills_with_calls() -> None:
+    budget = RetryBudget(ratio=0.5, burst=1)
+
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+    assert budget.stats.as_dict() == {"retries": 2, "exhausted": 1}
+
+
+def test_backoff_is_jittered_and_capped() -> None:
+    delays = [backoff_delay(10, base=0.1, cap=2.0) for _ in range(200)]
+    assert all(0 <= d <= 2.0 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_nested_deadlines_only_shorten() -> None:
+    assert time_left() is None
+    with deadline(5):
+        with deadline(60):
+            left = time_left()
+            assert left is not None and left <= 5
+        with deadline(None):
+            assert time_left() is not None
+    assert time_left() is None
+
+
+@pytest.mark.asyncio
+async def test_only_transient_errors_are_retried() -> None:
+    client = make_client()
+    retries = UPSTREAM_RETRIES.labels("GET").value
+
+    with patch.object(client._client, "get", new_callable=AsyncMock) as mock_get:
+        mock_get.side_effect = [answer(503), answer(200)]
+        assert await client.find_item("a") == {"id": "a"}
+        assert mock_get.call_count == 2
+        assert UPSTREAM_RETRIES.labels("GET").value == retries + 1
+
+        mock_get.reset_mock(side_effect=True)
+        mock_get.return_value = answer(404)
+        assert await client.find_item("a") is None
+        assert mock_get.call_count == 1  # a 404 is an answer, not an outage
+
+    with patch.object(client._client, "post", new_callable=AsyncMock) as mock_post:
+        mock_post.side_effect = ConnectError("down")
+        with pytest.raises(ConnectError):
+            await client._post("/reservations", json={})
+        assert mock_post.call_count == 1  # not idempotent
+
+
+@pytest.mark.asyncio
+async def test_spent_retry_budget_stops_retrying() -> None:
+    client = make_client(HTTP_RETRY_BUDGET_BURST=1, HTTP_RETRY_BUDGET_RATIO=0)
+
+    with patch.object(client._client, "get", new_callable=AsyncMock) as mock_get:
+        mock_get.side_effect = ConnectError("down")
+        for _ in range(2):
+            with pytest.raises(ConnectError):
+                await client.find_item("a")
+
+    assert mock_get.call_count == 3  # 2 + 1: only the first call found a retry in the budget
+    assert client.resilience_stats()["retry_budget"]["exhausted"] == 2
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_fails_fast() -> None:
+    client = make_client(HTTP_BREAKER_FAILURE_THRESHOLD=3)
+
+    with patch.object(client._client, "get", new_callable=AsyncMock) as mock_get:
+        mock_get.side_effect = ConnectError("down")
+        with pytest.raises(ConnectError):
+            await client.find_item("a")
+        with pytest.raises(CircuitOpenError):
+            await client.find_item("a")
+
+    assert mock_get.call_count == 3
+    assert client.resilience_stats()["breaker"]["state"] == "open"
+    assert BREAKER_STATE.labels().get() == 2
+
+
+@pytest.mark.asyncio
+async def test_server_errors_open_the_breaker_without_retries() -> None:
+    client = make_client(HTTP_BREAKER_FAILURE_THRESHOLD=2)
+
+    with patch.object(client._client, "get", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = answer(500)
+        for _ in range(2):
+            with pytest.raises(HTTPStatusError):
+                await client.find_item("a")
+        with pytest.raises(CircuitOpenError):
+            await client.find_item("a")
+
+    assert mock_get.call_count == 2  # one attempt each
+    assert client.resilience_stats()["breaker"]["state"] == "open"
+
+
+@pytest.mark.asyncio
+async def test_calls_stop_at_the_deadline() -> None:
+    client = make_client()
+
+    async def slow(*args: object, **kwargs: object) -> Response:
+        await asyncio.sleep(1)
+        return answer(200)
+
+    with patch.object(client._client, "get", new=slow):
+        with deadline(0.01), pytest.raises(DeadlineExceeded):
+            await client.find_item("a")
+
+    assert client.breaker.info()["consecutive_failures"] == 0  # the caller ran out of time
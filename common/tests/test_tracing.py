@@ -0,0 +1,157 @@
+import logging
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient, Request, Response
+
+from common.config import InventoryAPIConfig
+from common.inventory_client import InventoryClient
+from common.tracing import (
+    CLIENT,
+    SERVER,
+    InMemoryExporter,
+    LoggingExporter,
+    RatioSampler,
+    SpanContext,
+    Tracer,
+    current_context,
+    inject,
+    parse_traceparent,
+    use_tracer,
+)
+from common.tracing.asgi import TracingMiddleware
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture
+def exporter() -> Iterator[InMemoryExporter]:
+    exporter = InMemoryExporter()
+    previous = use_tracer(Tracer(exporter, RatioSampler(1.0)))
+    yield exporter
+    use_tracer(previous)
+
+
+def test_traceparent_is_parsed_strictly() -> None:
+    assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01") == SpanContext(
+        TRACE_ID, PARENT_ID, True
+    )
+    assert parse_traceparent(f"01-{TRACE_ID}-{PARENT_ID}-00-extra") == SpanContext(
+        TRACE_ID, PARENT_ID, False
+    )
+    for header in (
+        None,
+        "",
+        f"00-{TRACE_ID}-{PARENT_ID}-01-extra",  # version 00 has exactly four fields
+        f"ff-{TRACE_ID}-{PARENT_ID}-01",
+        f"00-{'0' * 32}-{PARENT_ID}-01",
+        f"00-{TRACE_ID}-{'0' * 16}-01",
+        f"00-{TRACE_ID.upper()}-{PARENT_ID}-01",
+    ):
+        assert parse_traceparent(header) is None
+
+
+def test_ratio_sampler_decides_from_the_trace_id() -> None:
+    assert not RatioSampler(0).should_sample("f" * 32)
+    assert RatioSampler(1).should_sample("f" * 32)
+    half = RatioSampler(0.5)
+    assert half.should_sample("f" * 16 + "0" * 16)
+    assert not half.should_sample("0" * 16 + "f" * 16)
+    with pytest.raises(ValueError):
+        RatioSampler(2)
+
+
+def test_children_follow_the_sampling_decision(exporter: InMemoryExporter) -> None:
+    tracer = Tracer(exporter, RatioSampler(0))
+
+    with tracer.start_span("internal"):
+        assert current_context() is None  # internal work does not start traces
+    with tracer.start_span("GET /", SERVER) as root:
+        context = current_context()
+        assert context is not None and not context.sampled
+        with tracer.start_span("storage.find_item") as child:
+            assert not child.recording
+        assert inject() == {"traceparent": context.traceparent()}
+    assert not root.recording and exporter.finished() == []
+
+    caller = SpanContext(TRACE_ID, PARENT_ID, True)
+    with pytest.raises(KeyError):
+        with tracer.start_span("GET /", SERVER, caller):
+            with tracer.start_span("storage.find_item"):
+                raise KeyError("1-1")
+    child, server = exporter.finished()
+    assert (server.context.trace_id, server.parent_id) == (TRACE_ID, PARENT_ID)
+    assert (child.context.trace_id, child.parent_id) == (TRACE_ID, server.context.span_id)
+    assert child.error == server.error == "KeyError: '1-1'"
+    assert current_context() is None
+
+
+def test_logging_exporter_writes_one_json_line(caplog: pytest.LogCaptureFixture) -> None:
+    tracer = Tracer(LoggingExporter(), RatioSampler(1.0))
+    with caplog.at_level(logging.INFO, logger="common.tracing"):
+        with tracer.start_span("GET /", SERVER) as span:
+            span.set_attribute("http.status_code", 200)
+
+    (record,) = caplog.records
+    assert span.context is not None
+    assert f'"trace_id":"{span.context.trace_id}"' in record.getMessage()
+    assert '"attributes":{"http.status_code":200}' in record.getMessage()
+
+
+app = FastAPI()
+app.add_middleware(TracingMiddleware, service="things")
+
+
+@app.get("/things/{thing_id}")
+async def get_thing(thing_id: str) -> dict[str, str | None]:
+    context = current_context()
+    return {"id": thing_id, "trace_id": context.trace_id if context else None}
+
+
+@pytest.mark.asyncio
+async def test_middleware_continues_the_callers_trace(exporter: InMemoryExporter) -> None:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        traced = await ac.get("/things/1", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"})
+        unsampled = await ac.get(
+            "/things/2", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-00"}
+        )
+        await ac.get("/nowhere")
+
+    assert traced.json()["trace_id"] == unsampled.json()["trace_id"] == TRACE_ID
+    server, unmatched = exporter.finished()
+    assert server.name == "GET /things/{thing_id}"
+    assert server.kind == SERVER and server.parent_id == PARENT_ID
+    assert server.attributes == {
+        "service": "things",
+        "http.method": "GET",
+        "http.route": "/things/{thing_id}",
+        "http.target": "/things/1",
+        "http.status_code": 200,
+    }
+    assert unmatched.name == "GET unmatched" and unmatched.parent_id is None
+
+
+@pytest.mark.asyncio
+async def test_client_injects_the_trace_context(exporter: InMemoryExporter) -> None:
+    client = InventoryClient(InventoryAPIConfig(INVENTORY_BASE_URL="http://mock-inventory-api"))
+    answer = Response(
+        200, json={"id": "a"}, request=Request("GET", "http://mock-inventory-api/items/a")
+    )
+
+    with patch.object(client._client, "get", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = answer
+        await client.find_item("a")  # outside a trace: the request is left alone
+        mock_get.assert_awaited_once_with("/items/a")
+
+        client.cache = None
+        with Tracer(exporter, RatioSampler(1.0)).start_span("GET /cart", SERVER):
+            await client.find_item("a")
+
+    (call, server) = exporter.finished()
+    assert call.kind == CLIENT and call.parent_id == server.context.span_id
+    assert call.attributes == {"http.url": "/items/a", "http.status_code": 200}
+    headers = mock_get.await_args_list[-1].kwargs["headers"]
+    assert headers["traceparent"] == call.context.traceparent()
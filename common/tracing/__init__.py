@@ -0,0 +1,49 @@
+"""
+Distributed tracing with W3C Trace Context (``traceparent``) propagation.
+Spans of sampled traces go to a pluggable ``SpanExporter``; the ASGI
+middleware lives in ``common.tracing.asgi``, so code that only starts spans
+does not import Starlette.
+"""
+
+from .exporters import InMemoryExporter, LoggingExporter, SpanExporter, create_exporter
+from .tracer import (
+    CLIENT,
+    INTERNAL,
+    SERVER,
+    TRACEPARENT,
+    NonRecordingSpan,
+    RatioSampler,
+    Sampler,
+    Span,
+    SpanContext,
+    Tracer,
+    create_tracer,
+    current_context,
+    get_tracer,
+    inject,
+    parse_traceparent,
+    use_tracer,
+)
+
+__all__ = [
+    "CLIENT",
+    "INTERNAL",
+    "SERVER",
+    "TRACEPARENT",
+    "InMemoryExporter",
+    "LoggingExporter",
+    "NonRecordingSpan",
+    "RatioSampler",
+    "Sampler",
+    "Span",
+    "SpanContext",
+    "SpanExporter",
+    "Tracer",
+    "create_exporter",
+    "create_tracer",
+    "current_context",
+    "get_tracer",
+    "inject",
+    "parse_traceparent",
+    "use_tracer",
+]
@@ -0,0 +1,57 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from common.tracing.tracer import SERVER, NonRecordingSpan, get_tracer, parse_traceparent
+
+_TRACEPARENT = b"traceparent"
+
+
+class TracingMiddleware:
+    """
+    Continues the trace of the ``traceparent`` header a request carries, or
+    starts one, with a server span named after the route template (e.g.
+    ``GET /items/{item_id}``). Spans started while the request is handled,
+    such as storage access and calls to other services, are its children.
+
+    Plain ASGI, like MetricsMiddleware; for unsampled requests it only makes
+    the trace context active so it reaches downstream services.
+    """
+
+    def __init__(self, app: ASGIApp, service: str) -> None:
+        self.app = app
+        self.service = service
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        header = None
+        for name, value in scope["headers"]:
+            if name == _TRACEPARENT:
+                header = value.decode("latin-1")
+                break
+        method = scope["method"]
+        span = get_tracer().start_span(method, SERVER, parse_traceparent(header))
+        if isinstance(span, NonRecordingSpan):
+            with span:
+                await self.app(scope, receive, send)
+            return
+
+        status = 500  # unless the app sends something else
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with span:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                span.name = f"{method} {route or 'unmatched'}"
+                span.set_attribute("service", self.service)
+                span.set_attribute("http.method", method)
+                span.set_attribute("http.route", route)
+                span.set_attribute("http.target", scope["path"])
+                span.set_attribute("http.status_code", status)
@@ -0,0 +1,63 @@
+import logging
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import TYPE_CHECKING
+
+from common.serialization import dumps
+
+if TYPE_CHECKING:
+    from common.tracing.tracer import Span
+
+
+class SpanExporter(ABC):
+    """
+    Receives every finished span of a sampled trace. ``export`` runs on the
+    thread that ended the span, often the event loop, so it must not block:
+    exporters that ship spans elsewhere should hand them to a buffer.
+    """
+
+    @abstractmethod
+    def export(self, span: "Span") -> None: ...
+
+    def shutdown(self) -> None:  # noqa: B027 - optional hook
+        """Flush and release whatever the exporter holds."""
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps the last ``max_spans`` spans in process, for tests and debugging."""
+
+    def __init__(self, max_spans: int = 10_000) -> None:
+        self.spans: deque[Span] = deque(maxlen=max_spans)
+
+    def export(self, span: "Span") -> None:
+        self.spans.append(span)
+
+    def finished(self, name: str | None = None) -> list["Span"]:
+        """The finished spans, oldest first, optionally only those called ``name``."""
+        return [span for span in self.spans if name is None or span.name == name]
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+class LoggingExporter(SpanExporter):
+    """Logs each span as one JSON line, for log pipelines that collect traces."""
+
+    def __init__(self, logger: logging.Logger | None = None) -> None:
+        self.logger = logger or logging.getLogger("common.tracing")
+
+    def export(self, span: "Span") -> None:
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("span %s", dumps(span.to_dict()).decode())
+
+
+def create_exporter(name: str) -> SpanExporter | None:
+    """The exporter named by TRACING_EXPORTER; None for ``none``."""
+    name = name.lower()
+    if name == "log":
+        return LoggingExporter()
+    if name == "memory":
+        return InMemoryExporter()
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown tracing exporter '{name}'.")
@@ -0,0 +1,299 @@
+import random
+import re
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Protocol
+
+from common import config
+from common.config import TracingConfig
+from common.tracing.exporters import SpanExporter, create_exporter
+
+SERVER = "server"
+CLIENT = "client"
+INTERNAL = "internal"
+
+TRACEPARENT = "traceparent"
+# version-traceid-parentid-flags, lower-case hex (W3C Trace Context, level 1).
+_TRACEPARENT = re.compile(r"([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+_SAMPLED = 0x01
+
+_getrandbits = random.getrandbits
+
+
+@dataclass(frozen=True, slots=True)
+class SpanContext:
+    """What crosses process boundaries: the trace, the span and the sampling decision."""
+
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+_current: ContextVar[SpanContext | None] = ContextVar("current_span", default=None)
+
+
+def current_context() -> SpanContext | None:
+    """The context of the active span, if any."""
+    return _current.get()
+
+
+def parse_traceparent(header: str | None) -> SpanContext | None:
+    """
+    The caller's context from a ``traceparent`` header, or None when it is
+    missing or malformed (a new trace is started then, as the spec asks).
+    Versions after 00 are read as 00, ignoring any extra fields.
+    """
+    if not header:
+        return None
+    header = header.strip()
+    match = _TRACEPARENT.match(header)
+    if match is None:
+        return None
+    version, trace_id, span_id, flags = match.groups()
+    rest = header[match.end() :]
+    if version == "ff" or (rest and (version == "00" or not rest.startswith("-"))):
+        return None
+    if trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return SpanContext(trace_id, span_id, bool(int(flags, 16) & _SAMPLED))
+
+
+def inject(headers: dict[str, str] | None = None) -> dict[str, str] | None:
+    """
+    ``headers`` plus the ``traceparent`` of the active span. Returned as is
+    (possibly None) outside any trace, so untraced calls are not changed.
+    """
+    context = _current.get()
+    if context is None:
+        return headers
+    traceparent = context.traceparent()
+    return {**headers, TRACEPARENT: traceparent} if headers else {TRACEPARENT: traceparent}
+
+
+def new_trace_id() -> str:
+    return f"{_getrandbits(128) or 1:032x}"
+
+
+def new_span_id() -> str:
+    return f"{_getrandbits(64) or 1:016x}"
+
+
+class Sampler(Protocol):
+    def should_sample(self, trace_id: str) -> bool: ...
+
+
+class RatioSampler:
+    """
+    Keeps ``ratio`` of new traces, decided from the trace id alone, so every
+    service with the same ratio makes the same choice for a trace.
+    """
+
+    def __init__(self, ratio: float) -> None:
+        if not 0 <= ratio <= 1:
+            raise ValueError("ratio must be between 0 and 1")
+        self.ratio = ratio
+        self._bound = round(ratio * 2**64)
+
+    def should_sample(self, trace_id: str) -> bool:
+        return int(trace_id[16:], 16) < self._bound
+
+
+class Span:
+    """
+    A timed operation of a sampled trace. Used as a context manager: it is
+    the active span inside the ``with`` block, records the exception that
+    ends the block, if any, and goes to the exporter when the block exits.
+    """
+
+    __slots__ = (
+        "name",
+        "kind",
+        "context",
+        "parent_id",
+        "attributes",
+        "start_ns",
+        "end_ns",
+        "error",
+        "_exporter",
+        "_token",
+    )
+
+    recording = True
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        context: SpanContext,
+        parent_id: str | None,
+        exporter: SpanExporter,
+        attributes: dict[str, Any] | None = None,
+    ) -> None:
+        self.name = name
+        self.kind = kind
+        self.context = context
+        self.parent_id = parent_id
+        self.attributes: dict[str, Any] = attributes if attributes is not None else {}
+        self.start_ns = 0
+        self.end_ns = 0
+        self.error: str | None = None
+        self._exporter = exporter
+        self._token: Token[SpanContext | None] | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration(self) -> float:
+        """Seconds between start and end."""
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration * 1000, 3),
+            "status": "error" if self.error is not None else "ok",
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self.context)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.end_ns = time.time_ns()
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+        if exc_type is not None:
+            self.error = exc_type.__name__ if not str(exc) else f"{exc_type.__name__}: {exc}"
+        self._exporter.export(self)
+
+
+class NonRecordingSpan:
+    """
+    Stands in for a span that is not sampled: nothing is timed or exported,
+    but a ``context``, if given, is made active so it still propagates
+    (with the sampled flag off) to the services called inside the block.
+    """
+
+    __slots__ = ("context", "_token")
+
+    recording = False
+
+    def __init__(self, context: SpanContext | None) -> None:
+        self.context = context
+        self._token: Token[SpanContext | None] | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "NonRecordingSpan":
+        if self.context is not None:
+            self._token = _current.set(self.context)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+
+
+# Internal spans outside a sampled trace: shared, since it holds no state.
+_NOOP = NonRecordingSpan(None)
+
+
+class Tracer:
+    """
+    Starts spans as children of the active one, or of ``parent`` when given
+    (the context a request arrived with). Only server spans start new
+    traces, which the ``sampler`` keeps or drops; other spans follow their
+    parent's decision and are no-ops outside a trace. Unsampled work costs
+    a few attribute reads: only server and client spans even allocate
+    anything, to carry the trace id to downstream services.
+    Without an exporter no new trace is sampled, and only the caller's
+    decision is passed on.
+    """
+
+    def __init__(self, exporter: SpanExporter | None, sampler: Sampler) -> None:
+        self.exporter = exporter
+        self.sampler = sampler
+
+    def start_span(
+        self,
+        name: str,
+        kind: str = INTERNAL,
+        parent: SpanContext | None = None,
+        attributes: dict[str, Any] | None = None,
+    ) -> Span | NonRecordingSpan:
+        exporter = self.exporter
+        if parent is None:
+            parent = _current.get()
+        if parent is None:
+            if kind != SERVER:
+                return _NOOP  # traces start where requests come in
+            trace_id = new_trace_id()
+            context = SpanContext(trace_id, new_span_id(), self.sampler.should_sample(trace_id))
+            if exporter is None or not context.sampled:
+                return NonRecordingSpan(SpanContext(trace_id, context.span_id, False))
+            return Span(name, kind, context, None, exporter, attributes)
+        if exporter is None or not parent.sampled:
+            return _NOOP if kind == INTERNAL else NonRecordingSpan(parent)
+        context = SpanContext(parent.trace_id, new_span_id(), True)
+        return Span(name, kind, context, parent.span_id, exporter, attributes)
+
+    def shutdown(self) -> None:
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+
+def create_tracer(settings: TracingConfig | None = None) -> Tracer:
+    settings = settings or config.tracing_setting
+    return Tracer(
+        create_exporter(settings.TRACING_EXPORTER), RatioSampler(settings.TRACING_SAMPLE_RATIO)
+    )
+
+
+_tracer: Tracer | None = None
+
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer, built from the TRACING_* settings on first use."""
+    global _tracer
+    if _tracer is None:
+        _tracer = create_tracer()
+    return _tracer
+
+
+def use_tracer(tracer: Tracer | None) -> Tracer | None:
+    """
+    Replace the process-wide tracer (None: rebuild it from the settings on
+    next use) and return the previous one, e.g. to restore it after a test.
+    """
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
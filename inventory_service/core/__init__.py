@@ -2,6 +2,21 @@
 Core setup and startup logic.
 """
 
-from .db_init import init_inventory
+from .db_init import ensure_inventory, init_inventory
+from .events import InventoryEvents, get_inventory_events
+from .payloads import PayloadCache, get_payload_cache
+from .reservations import ReservationService, get_reservation_service
+from .search import SearchIndex, get_search_index
 
-__all__ = ["init_inventory"]
+__all__ = [
+    "init_inventory",
+    "ensure_inventory",
+    "ReservationService",
+    "get_reservation_service",
+    "SearchIndex",
+    "get_search_index",
+    "PayloadCache",
+    "get_payload_cache",
+    "InventoryEvents",
+    "get_inventory_events",
+]
@@ -1,51 +1,201 @@
-import random
+"""
+Catalog seeding (CLI: ``python -m inventory_service.seed``).
 
-from faker import Faker
-from tinydb import TinyDB
+Categories are generated in parallel and streamed to storage as they complete.
+Every category draws from its own random stream, seeded from ``seed`` and the
+category id, so a catalog is reproducible for a given seed regardless of how
+many workers built it.
+"""
 
-from inventory_service.db import get_db
-from inventory_service.models import CategoryWithItems, Item
-from inventory_service.providers.fake_apparel_provider import ApparelProvider
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any
 
-db = get_db()
+from common import config
+from common.config import InventorySeedConfig
+from inventory_service.db import InventoryStorage, get_storage
+from inventory_service.db.storage import SEED_FINGERPRINT_KEY
+from inventory_service.models import CategoryWithItems
+from inventory_service.providers.apparel_vocabulary import ADJECTIVES, TYPES_BY_CATEGORY
 
+if TYPE_CHECKING:
+    from faker import Faker
 
-def build_category(cid: int, name: str, items_per_cat: int = 5) -> CategoryWithItems:
-    fake = Faker()
-    fake.add_provider(ApparelProvider)
+logger = logging.getLogger(__name__)
 
-    items: list[Item] = []
+CATEGORY_TYPES = list(TYPES_BY_CATEGORY)
+# Below this many items a process pool costs more to start than it saves.
+PARALLEL_MIN_ITEMS = 50_000
+# Bump when generate_category produces different output for the same inputs.
+GENERATOR_VERSION = 1
+STARTUP_MODES = ("reuse", "reseed", "skip")
+
+_faker: "Faker | None" = None
+
+
+def _worker_faker() -> "Faker":
+    """One Faker per process; reseeded for every category."""
+    global _faker
+    if _faker is None:
+        # Faker is only needed to generate data, so it is not imported with the service.
+        from faker import Faker
+
+        from inventory_service.providers.fake_apparel_provider import ApparelProvider
+
+        _faker = Faker()
+        _faker.add_provider(ApparelProvider)
+    return _faker
+
+
+def category_name(cid: int) -> tuple[str, str]:
+    """
+    Return ``(name, apparel type)`` for category ``cid``. The first categories
+    are the apparel types themselves; after that they repeat with a series number.
+    """
+    kind = CATEGORY_TYPES[(cid - 1) % len(CATEGORY_TYPES)]
+    series = (cid - 1) // len(CATEGORY_TYPES)
+    return (f"{kind} {series + 1}" if series else kind), kind
+
+
+def generate_category(
+    seed: int, cid: int, items_per_cat: int, name: str | None = None
+) -> dict[str, Any]:
+    """
+    Build category ``cid`` as a plain dict, deterministically for ``seed``.
+    ``name`` overrides the name from ``category_name`` and must be an apparel
+    type, which then also picks the items.
+    """
+    fake = _worker_faker()
+    fake.seed_instance(f"{seed}:{cid}")
+    rng = fake.random
+    if name is None:
+        name, kind = category_name(cid)
+    else:
+        kind = name
+
+    items = []
     for iid in range(1, items_per_cat + 1):
-        item_id = f"{cid}-{iid}"
-        item_name = fake.item_name(name)
+        item_name = fake.item_name(kind)
         items.append(
-            Item(
-                id=item_id,
-                name=item_name,
-                description=fake.item_description(name, item_name),
-                price=fake.item_price(name),
-                stock=random.randint(5, 50),
-            )
+            {
+                "id": f"{cid}-{iid}",
+                "name": item_name,
+                "description": fake.item_description(kind, item_name),
+                "price": fake.item_price(kind),
+                "stock": rng.randint(5, 50),
+            }
         )
-    return CategoryWithItems(id=cid, name=name, items=items)
+    return {"id": cid, "name": name, "items": items}
+
+
+def build_category(
+    cid: int, name: str, items_per_cat: int = 5, seed: int = 42
+) -> CategoryWithItems:
+    """Category ``cid`` of apparel type ``name`` (e.g. "Footwear") as a model."""
+    return CategoryWithItems(**generate_category(seed, cid, items_per_cat, name))
+
 
+def generate_catalog(
+    categories: int, items_per_cat: int, seed: int, workers: int = 1
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield categories 1..``categories`` in order. With ``workers > 1`` they are
+    built in a process pool that runs at most ``2 * workers`` categories ahead
+    of the consumer, so memory stays bounded for large catalogs.
+    """
+    if workers <= 1 or categories <= 1:
+        for cid in range(1, categories + 1):
+            yield generate_category(seed, cid, items_per_cat)
+        return
 
-def init_inventory(seed: int = 42) -> TinyDB:
-    random.seed(seed)
-    Faker.seed(seed)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque[Future[dict[str, Any]]] = deque()
+        next_cid = 1
+        while next_cid <= categories or pending:
+            while next_cid <= categories and len(pending) < 2 * workers:
+                pending.append(pool.submit(generate_category, seed, next_cid, items_per_cat))
+                next_cid += 1
+            yield pending.popleft().result()
 
-    db.drop_tables()
 
-    categories = list(ApparelProvider.types_by_category.keys())
-    payload = []
-    for cid, cat_name in enumerate(categories, start=1):
-        cat_model = build_category(cid, cat_name)
-        payload.append(cat_model.model_dump())  # Pydantic v2 dict
+def catalog_fingerprint(seed: int, categories: int, items_per_cat: int) -> str:
+    """
+    Hash of everything the generated catalog depends on: the size and seed,
+    the generator version and the provider's vocabulary.
+    """
+    inputs = {
+        "generator": GENERATOR_VERSION,
+        "seed": seed,
+        "categories": categories,
+        "items_per_category": items_per_cat,
+        "types": TYPES_BY_CATEGORY,
+        "adjectives": ADJECTIVES,
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
 
-    db.insert_multiple(payload)
-    print(f"Inventory initialized with {len(payload)} categories and {len(payload)*5} items.")
-    return db
 
+def init_inventory(
+    seed: int | None = None,
+    storage: InventoryStorage | None = None,
+    settings: InventorySeedConfig | None = None,
+) -> InventoryStorage:
+    settings = settings or config.inventory_seed_setting
+    seed = settings.INVENTORY_SEED if seed is None else seed
+    workers = settings.INVENTORY_SEED_WORKERS or os.cpu_count() or 1
+    categories = settings.INVENTORY_SEED_CATEGORIES
+    items_per_cat = settings.INVENTORY_SEED_ITEMS_PER_CATEGORY
 
-if __name__ == "__main__":
-    init_inventory()
+    storage = storage if storage is not None else get_storage()
+
+    started = time.perf_counter()
+    if categories * items_per_cat < PARALLEL_MIN_ITEMS:
+        workers = 1
+    storage.replace_all(
+        generate_catalog(categories, items_per_cat, seed, workers),
+        batch_size=settings.INVENTORY_SEED_BATCH_SIZE,
+    )
+    storage.set_meta(SEED_FINGERPRINT_KEY, catalog_fingerprint(seed, categories, items_per_cat))
+    logger.info(
+        "Inventory initialized with %d categories and %d items in %.2fs.",
+        categories,
+        categories * items_per_cat,
+        time.perf_counter() - started,
+    )
+    return storage
+
+
+def ensure_inventory(
+    storage: InventoryStorage | None = None, settings: InventorySeedConfig | None = None
+) -> bool:
+    """
+    Seed ``storage`` on startup according to INVENTORY_STARTUP_MODE and return
+    whether it was (re)seeded. In ``reuse`` mode a catalog whose stored
+    fingerprint matches the current settings is kept as is, together with its
+    stock levels and outstanding reservations, which both backends store, so
+    holds taken before the restart are still released or expire.
+    """
+    settings = settings or config.inventory_seed_setting
+    storage = storage if storage is not None else get_storage()
+    mode = settings.INVENTORY_STARTUP_MODE.lower()
+    if mode not in STARTUP_MODES:
+        raise ValueError(f"Unknown inventory startup mode '{mode}'.")
+    if mode == "skip":
+        logger.info("Startup mode 'skip': keeping the stored catalog.")
+        return False
+    if mode == "reuse":
+        expected = catalog_fingerprint(
+            settings.INVENTORY_SEED,
+            settings.INVENTORY_SEED_CATEGORIES,
+            settings.INVENTORY_SEED_ITEMS_PER_CATEGORY,
+        )
+        if storage.get_meta(SEED_FINGERPRINT_KEY) == expected:
+            logger.info("Stored catalog matches the seed settings; not reseeding.")
+            return False
+    init_inventory(storage=storage, settings=settings)
+    return True
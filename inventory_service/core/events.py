@@ -0,0 +1,94 @@
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from common import config
+from common.events import EventPublisher, create_event_publisher
+from inventory_service.core.payloads import item_payload
+from inventory_service.db import InventoryStorage
+
+_event_publisher: EventPublisher | None = None
+
+
+def get_event_publisher() -> EventPublisher:
+    """
+    Provides the process-wide publisher for inventory events (EVENTS_* settings).
+    """
+    global _event_publisher
+    if _event_publisher is None:
+        _event_publisher = create_event_publisher()
+    return _event_publisher
+
+
+class InventoryEvents:
+    """
+    Publishes what clients caching inventory data need to stay fresh:
+
+    - INVENTORY_STOCK_TOPIC: ``stock_changed`` with the item after every stock
+      change (reserve, release, expiry), ``catalog_reset`` on a reseed;
+    - INVENTORY_RESERVED_TOPIC: ``reserved`` for every new reservation;
+    - INVENTORY_FAIL_TOPIC: ``reservation_failed`` when stock ran short.
+
+    Item events are keyed by item id, so each item's events stay in order.
+    As a ``CatalogListener`` it is called while the storage write is held,
+    which costs no more than appending to the publisher's buffer. Must be
+    used from the event loop the publisher runs on.
+    """
+
+    def __init__(self, publisher: EventPublisher) -> None:
+        self.publisher = publisher
+
+    def reserved(self, reservation: dict[str, Any]) -> None:
+        self.publisher.publish(
+            config.events_setting.INVENTORY_RESERVED_TOPIC,
+            {
+                "type": "reserved",
+                "reservation_id": reservation["id"],
+                "item_id": reservation["item_id"],
+                "quantity": reservation["quantity"],
+                "remaining_stock": reservation["remaining_stock"],
+            },
+            key=reservation["item_id"],
+        )
+
+    def reservation_failed(self, item_id: str, requested: int, available: int) -> None:
+        self.publisher.publish(
+            config.events_setting.INVENTORY_FAIL_TOPIC,
+            {
+                "type": "reservation_failed",
+                "item_id": item_id,
+                "requested": requested,
+                "available": available,
+            },
+            key=item_id,
+        )
+
+    # CatalogListener
+
+    def catalog_cleared(self) -> None:
+        self.publisher.publish(
+            config.events_setting.INVENTORY_STOCK_TOPIC, {"type": "catalog_reset"}
+        )
+
+    def category_added(self, category: dict[str, Any]) -> None:
+        pass  # covered by the catalog_reset that precedes it
+
+    def item_changed(self, item: dict[str, Any]) -> None:
+        self.publisher.publish(
+            config.events_setting.INVENTORY_STOCK_TOPIC,
+            {"type": "stock_changed", "item_id": item["id"], "item": item_payload(item)},
+            key=item["id"],
+        )
+
+
+_events: "WeakKeyDictionary[InventoryStorage, InventoryEvents]" = WeakKeyDictionary()
+
+
+def get_inventory_events(storage: InventoryStorage) -> InventoryEvents:
+    """
+    Provides the InventoryEvents for ``storage``, subscribed to its changes.
+    """
+    events = _events.get(storage)
+    if events is None:
+        events = _events[storage] = InventoryEvents(get_event_publisher())
+        storage.add_listener(events)
+    return events
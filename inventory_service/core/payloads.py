@@ -0,0 +1,93 @@
+from threading import Lock
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from common.serialization import dumps
+from inventory_service.db import InventoryStorage
+
+# Fields of the public Item schema, in schema order.
+ITEM_FIELDS = ("id", "name", "description", "price", "stock")
+
+
+def item_payload(item: dict[str, Any]) -> dict[str, Any]:
+    """The API shape of a stored item (storage rows may carry extra columns)."""
+    return {field: item[field] for field in ITEM_FIELDS}
+
+
+class PayloadCache:
+    """
+    Serialized JSON bodies of the read-only catalog responses: the category
+    list and each category's full item listing.
+
+    Stored data was validated when it was written, so these bodies are built
+    straight from storage dicts. Each body is kept together with the storage
+    version it was built at (``catalog_version`` / ``category_version``) and
+    reused while the caller's freshly read version still matches. Versions
+    live in storage, so a change made by another process invalidates the
+    body too. As a ``CatalogListener`` the cache also drops everything on a
+    reseed, so bodies of deleted categories do not linger.
+    """
+
+    def __init__(self, storage: InventoryStorage) -> None:
+        self._storage = storage
+        self._lock = Lock()
+        self._categories: tuple[str, bytes] | None = None
+        self._items: dict[int, tuple[str, bytes]] = {}
+
+    def categories(self, version: str) -> bytes:
+        """
+        The category list. ``version`` must be read from storage before
+        calling, so a body is never labelled newer than its data.
+        """
+        cached = self._categories
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        cats = [{"id": c["id"], "name": c["name"]} for c in self._storage.list_categories()]
+        body = dumps({"categories": cats})
+        with self._lock:
+            self._categories = (version, body)
+        return body
+
+    def category_items(self, category_id: int, version: str) -> bytes | None:
+        """
+        The full listing of ``category_id`` at ``version`` (see ``categories``);
+        None if there is no such category.
+        """
+        cached = self._items.get(category_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        cat = self._storage.get_category(category_id)
+        if cat is None:
+            return None
+        items = [item_payload(i) for i in cat["items"]]
+        body = dumps({"category": {"id": cat["id"], "name": cat["name"]}, "items": items})
+        with self._lock:
+            self._items[category_id] = (version, body)
+        return body
+
+    # CatalogListener
+
+    def catalog_cleared(self) -> None:
+        with self._lock:
+            self._categories = None
+            self._items.clear()
+
+    def category_added(self, category: dict[str, Any]) -> None:
+        pass  # a new catalog epoch already invalidates every body
+
+    def item_changed(self, item: dict[str, Any]) -> None:
+        pass  # the category version already changed
+
+
+_caches: "WeakKeyDictionary[InventoryStorage, PayloadCache]" = WeakKeyDictionary()
+
+
+def get_payload_cache(storage: InventoryStorage) -> PayloadCache:
+    """
+    Provides the PayloadCache for ``storage``, subscribed to its changes.
+    """
+    cache = _caches.get(storage)
+    if cache is None:
+        cache = _caches[storage] = PayloadCache(storage)
+        storage.add_listener(cache)
+    return cache
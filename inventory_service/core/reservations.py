@@ -0,0 +1,82 @@
+import asyncio
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from common import config
+from common.config import InventoryReservationConfig
+from inventory_service.db import InventoryStorage
+from inventory_service.db.storage import InsufficientStock
+
+
+class ReservationService:
+    """
+    Stock holds with a time-to-live.
+
+    Each reservation is a single atomic write in the storage backend (under
+    its lock or transaction), so two reservations can never both take the last
+    unit. The writes run on the event loop because the storage listeners
+    publish events, which must happen there. Expired holds are released by the
+    periodic ``run_sweeper`` task, and right away when they are what keeps a
+    reservation from being served.
+    """
+
+    def __init__(
+        self,
+        storage: InventoryStorage,
+        settings: InventoryReservationConfig | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.storage = storage
+        self.settings = settings or config.inventory_reservation_setting
+        self._clock = clock
+
+    async def reserve(
+        self, item_id: str, quantity: int, ttl_seconds: float | None = None
+    ) -> dict[str, Any]:
+        ttl = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else self.settings.RESERVATION_DEFAULT_TTL_SECONDS
+        )
+        if ttl > self.settings.RESERVATION_MAX_TTL_SECONDS:
+            raise ValueError(
+                f"ttl_seconds must not exceed {self.settings.RESERVATION_MAX_TTL_SECONDS}."
+            )
+        now = self._clock()
+        try:
+            return self.storage.reserve(uuid.uuid4().hex, item_id, quantity, now + ttl)
+        except InsufficientStock:
+            # Holds past their expiry may be what is missing, if the sweeper has not run yet.
+            if not self.storage.expire_reservations(now):
+                raise
+        return self.storage.reserve(uuid.uuid4().hex, item_id, quantity, now + ttl)
+
+    async def release(self, reservation_id: str) -> dict[str, Any]:
+        return self.storage.release(reservation_id)
+
+    async def expire(self) -> list[dict[str, Any]]:
+        return self.storage.expire_reservations(self._clock())
+
+    async def run_sweeper(self) -> None:
+        """
+        Release expired holds every RESERVATION_SWEEP_INTERVAL_SECONDS until cancelled.
+        """
+        while True:
+            await asyncio.sleep(self.settings.RESERVATION_SWEEP_INTERVAL_SECONDS)
+            await self.expire()
+
+
+_services: "WeakKeyDictionary[InventoryStorage, ReservationService]" = WeakKeyDictionary()
+
+
+def get_reservation_service(storage: InventoryStorage) -> ReservationService:
+    """
+    Provides the ReservationService bound to ``storage`` (one per backend).
+    """
+    service = _services.get(storage)
+    if service is None:
+        service = _services[storage] = ReservationService(storage)
+    return service
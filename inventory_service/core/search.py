@@ -0,0 +1,295 @@
+import heapq
+import re
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from inventory_service.db import InventoryStorage
+
+_TOKEN = re.compile(r"\w+")
+# Query terms shorter than this only match whole tokens, so "a" does not expand
+# to half the vocabulary. Longer terms match every token they are a prefix of:
+# the union costs at most the postings of those tokens, like a very common word,
+# and the query length limit of the route bounds how many terms a query has.
+MIN_PREFIX_LENGTH = 2
+RESULT_CACHE_SIZE = 1024
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.casefold())
+
+
+@dataclass
+class SearchHits:
+    total: int
+    item_ids: list[str] = field(default_factory=list)
+
+
+@dataclass
+class _Tier:
+    """Documents in ``include`` but not in ``exclude``; ``size`` is precomputed."""
+
+    include: set[int]
+    exclude: set[int] | None
+    size: int
+
+    def __contains__(self, doc: int) -> bool:
+        return doc in self.include and (self.exclude is None or doc not in self.exclude)
+
+    def members(self) -> set[int]:
+        return self.include - self.exclude if self.exclude else self.include
+
+
+class SearchIndex:
+    """
+    In-process inverted index over item ``name`` and ``description``.
+
+    Every item gets a dense document number in catalog order. Each token maps
+    to the set of documents containing it (and, separately, to those having it
+    in the name); the vocabulary is kept sorted so a query term also matches
+    every token it is a prefix of. All query terms must match. Results are
+    ranked in tiers, items whose name matches every term first, then items
+    whose name matches some term, then description-only matches; ties keep
+    catalog order. Set algebra does the heavy lifting, so a query costs about
+    the size of its rarest term's postings rather than the catalog size.
+
+    The index registers as a ``CatalogListener`` and updates incrementally:
+    a reseed clears it and re-adds categories as they are written, and a
+    changed item is re-indexed only if its name or description changed
+    (stock updates are free).
+    """
+
+    def __init__(self, cache_size: int = RESULT_CACHE_SIZE) -> None:
+        self._lock = Lock()
+        self._cache_size = cache_size
+        self._clear()
+
+    def _clear(self) -> None:
+        self._docs: dict[str, int] = {}
+        self._ids: list[str | None] = []
+        self._text: list[tuple[str, str] | None] = []
+        self._any: dict[str, set[int]] = {}
+        self._name: dict[str, set[int]] = {}
+        self._vocab: list[str] = []
+        # Set while categories stream in; the vocabulary is re-sorted once on next use.
+        self._vocab_dirty = False
+        self._cache: OrderedDict[tuple[tuple[str, ...], int, int], SearchHits] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # CatalogListener
+
+    def catalog_cleared(self) -> None:
+        with self._lock:
+            self._clear()
+
+    def category_added(self, category: dict[str, Any]) -> None:
+        with self._lock:
+            for item in category.get("items", []):
+                self._add(item["id"], item["name"], item["description"])
+            self._vocab_dirty = True
+            self._cache.clear()
+
+    def item_changed(self, item: dict[str, Any]) -> None:
+        self.upsert(item)
+
+    # Maintenance
+
+    def build(self, categories: Iterable[dict[str, Any]]) -> None:
+        with self._lock:
+            self._clear()
+            for cat in categories:
+                for item in cat.get("items", []):
+                    self._add(item["id"], item["name"], item["description"])
+            self._vocab = sorted(self._any)
+
+    def _sorted_vocab(self) -> list[str]:
+        if self._vocab_dirty:
+            self._vocab = sorted(self._any)
+            self._vocab_dirty = False
+        return self._vocab
+
+    def upsert(self, item: dict[str, Any]) -> None:
+        with self._lock:
+            text = (item["name"], item["description"])
+            doc = self._docs.get(item["id"])
+            if doc is not None and self._text[doc] == text:
+                return
+            if doc is not None:
+                self._remove(doc)
+            for token in self._add(item["id"], *text):
+                insort(self._sorted_vocab(), token)
+            self._cache.clear()
+
+    def remove(self, item_id: str) -> None:
+        with self._lock:
+            doc = self._docs.get(item_id)
+            if doc is not None:
+                self._remove(doc)
+                self._cache.clear()
+
+    def _add(self, item_id: str, name: str, description: str) -> list[str]:
+        """Index a new document; returns the tokens that are new to the vocabulary."""
+        doc = len(self._ids)
+        self._docs[item_id] = doc
+        self._ids.append(item_id)
+        self._text.append((name, description))
+        name_tokens = set(tokenize(name))
+        tokens = name_tokens | set(tokenize(description))
+        for token in name_tokens:
+            self._name.setdefault(token, set()).add(doc)
+        new_tokens = [t for t in tokens if t not in self._any]
+        for token in tokens:
+            self._any.setdefault(token, set()).add(doc)
+        return new_tokens
+
+    def _remove(self, doc: int) -> None:
+        text = self._text[doc]
+        item_id = self._ids[doc]
+        assert text is not None and item_id is not None
+        name, description = text
+        for token in set(tokenize(name)):
+            self._discard(self._name, token, doc)
+        for token in set(tokenize(name)) | set(tokenize(description)):
+            if self._discard(self._any, token, doc):
+                vocab = self._sorted_vocab()
+                del vocab[bisect_left(vocab, token)]
+        del self._docs[item_id]
+        self._ids[doc] = None
+        self._text[doc] = None
+
+    @staticmethod
+    def _discard(postings: dict[str, set[int]], token: str, doc: int) -> bool:
+        """Drop ``doc`` from ``token``'s postings; True if the token is now unused."""
+        docs = postings.get(token)
+        if docs is None:
+            return False
+        docs.discard(doc)
+        if not docs:
+            del postings[token]
+            return True
+        return False
+
+    # Queries
+
+    def search(self, query: str, offset: int = 0, limit: int = 20) -> SearchHits:
+        terms = tuple(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return SearchHits(total=0)
+        key = (terms, offset, limit)
+        with self._lock:
+            hits = self._cache.get(key)
+            if hits is not None:
+                self._cache.move_to_end(key)
+                return hits
+            hits = self._search(terms, offset, limit)
+            self._cache[key] = hits
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+            return hits
+
+    def _expand(self, term: str) -> list[str]:
+        if len(term) < MIN_PREFIX_LENGTH:
+            return [term] if term in self._any else []
+        vocab = self._sorted_vocab()
+        start = bisect_left(vocab, term)
+        return vocab[start : bisect_left(vocab, term + "\U0010ffff")]
+
+    def _search(self, terms: tuple[str, ...], offset: int, limit: int) -> SearchHits:
+        any_sets: list[set[int]] = []
+        name_sets: list[set[int]] = []
+        for term in terms:
+            tokens = self._expand(term)
+            if not tokens:
+                return SearchHits(total=0)
+            any_sets.append(_union(self._any[t] for t in tokens))
+            name_sets.append(_union(self._name.get(t, set()) for t in tokens))
+
+        # A term present in every document (e.g. "designed") does not narrow the match.
+        live = len(self._docs)
+        narrowing = sorted((s for s in any_sets if len(s) < live), key=len)
+        if not narrowing:
+            matched = any_sets[0]
+        elif len(narrowing) == 1:
+            matched = narrowing[0]
+        else:
+            matched = narrowing[0].intersection(*narrowing[1:])
+        if not matched:
+            return SearchHits(total=0)
+
+        if len(name_sets) == 1:
+            in_name = name_sets[0]  # name tokens are a subset of the matched tokens
+            tiers = [
+                _Tier(in_name, None, len(in_name)),
+                _Tier(matched, in_name, len(matched) - len(in_name)),
+            ]
+        else:
+            # Restrict to ``matched`` first so the cost follows the result size,
+            # not the (possibly huge) postings of common name words.
+            in_names = sorted((s & matched for s in name_sets), key=len)
+            all_names = in_names[0].intersection(*in_names[1:])
+            some_names = _union(in_names)
+            tiers = [
+                _Tier(all_names, None, len(all_names)),
+                _Tier(some_names, all_names, len(some_names) - len(all_names)),
+                _Tier(matched, some_names, len(matched) - len(some_names)),
+            ]
+
+        docs: list[int] = []
+        skip = offset
+        for tier in tiers:
+            if len(docs) == limit:
+                break
+            if skip >= tier.size:
+                skip -= tier.size
+                continue
+            docs.extend(self._first(tier, skip + limit - len(docs))[skip:])
+            skip = 0
+        # Matched documents are live, so their ids are never None.
+        item_ids = [item_id for d in docs if (item_id := self._ids[d]) is not None]
+        return SearchHits(total=len(matched), item_ids=item_ids)
+
+    def _first(self, tier: _Tier, count: int) -> list[int]:
+        """The ``count`` lowest document numbers in ``tier``, ascending."""
+        if count >= tier.size:
+            return sorted(tier.members())
+        if count * 8 < tier.size:
+            # Items of a category are numbered contiguously, so a large tier is
+            # usually dense from its lowest member on: walking document numbers
+            # from there beats touching every member. Give up if it turns out sparse.
+            found: list[int] = []
+            start = min(tier.include)
+            for doc in range(start, min(start + count * 64, len(self._ids))):
+                if doc in tier:
+                    found.append(doc)
+                    if len(found) == count:
+                        return found
+        return heapq.nsmallest(count, tier.members())
+
+
+def _union(sets: Iterable[set[int]]) -> set[int]:
+    sets = list(sets)
+    if len(sets) == 1:
+        return sets[0]
+    return set().union(*sets)
+
+
+_indexes: "WeakKeyDictionary[InventoryStorage, SearchIndex]" = WeakKeyDictionary()
+
+
+def get_search_index(storage: InventoryStorage) -> SearchIndex:
+    """
+    Provides the SearchIndex for ``storage``, building it from the current
+    catalog and subscribing it to later changes on first use.
+    """
+    index = _indexes.get(storage)
+    if index is None:
+        index = _indexes[storage] = SearchIndex()
+        index.build(storage.all_categories())
+        storage.add_listener(index)
+    return index
@@ -1,7 +1,17 @@
 """
-Database artifacts for TinyDB.
+Database artifacts: storage backends for TinyDB and SQLite.
 """
 
-from .init import get_db
+from .init import create_storage, get_db, get_storage, use_storage
+from .item_index import ItemIndex, get_item_index
+from .storage import InventoryStorage
 
-__all__ = ["get_db"]
+__all__ = [
+    "get_db",
+    "get_storage",
+    "create_storage",
+    "use_storage",
+    "get_item_index",
+    "InventoryStorage",
+    "ItemIndex",
+]
@@ -2,9 +2,16 @@ from threading import Lock
 
 from tinydb import TinyDB
 
-DB_PATH = "inventory_service/db/inventory_db.json"
+from common import config
+from inventory_service.db.item_index import get_item_index
+from inventory_service.db.storage import InventoryStorage
+
+# Defaults to INVENTORY_TINYDB_PATH, read when the database is first opened.
+DB_PATH: str | None = None
 _db = None
+_storage: InventoryStorage | None = None
 _lock = Lock()
+_storage_lock = Lock()
 
 
 def get_db() -> TinyDB:
@@ -12,5 +19,40 @@ def get_db() -> TinyDB:
     if _db is None:
         with _lock:
             if _db is None:
-                _db = TinyDB(DB_PATH)
+                _db = TinyDB(DB_PATH or config.inventory_storage_setting.INVENTORY_TINYDB_PATH)
     return _db
+
+
+def create_storage(backend: str | None = None) -> InventoryStorage:
+    """
+    Build the storage backend named by ``backend`` or INVENTORY_STORAGE_BACKEND.
+    """
+    settings = config.inventory_storage_setting
+    backend = (backend or settings.INVENTORY_STORAGE_BACKEND).lower()
+    if backend == "tinydb":
+        from inventory_service.db.tinydb_storage import TinyDBStorage
+
+        return TinyDBStorage(get_db(), get_item_index())
+    if backend == "sqlite":
+        from inventory_service.db.sqlite_storage import SQLiteStorage
+
+        return SQLiteStorage(settings.INVENTORY_SQLITE_PATH)
+    raise ValueError(f"Unknown inventory storage backend '{backend}'.")
+
+
+def get_storage() -> InventoryStorage:
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = create_storage()
+    return _storage
+
+
+def use_storage(storage: InventoryStorage) -> None:
+    """
+    Install ``storage`` as the process-wide backend (tools and benchmarks).
+    """
+    global _storage
+    with _storage_lock:
+        _storage = storage
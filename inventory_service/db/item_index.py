@@ -0,0 +1,71 @@
+from collections.abc import Iterable
+from threading import Lock
+from typing import Any
+
+from tinydb import TinyDB
+
+IndexEntry = tuple[int, dict[str, Any]]
+
+
+class ItemIndex:
+    """
+    In-memory item_id -> (category_id, item) lookup table.
+
+    The index is built from the category documents stored in TinyDB and
+    remembers which database it was built from, so a lookup against any
+    other database (or after ``invalidate``) is reported as stale.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, IndexEntry] = {}
+        self._source: TinyDB | None = None
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def build(self, db: TinyDB) -> None:
+        """
+        Rebuild the index from every category document in ``db``.
+        """
+        entries = _entries_from(db.all())
+        with self._lock:
+            self._entries = entries
+            self._source = db
+
+    def is_stale(self, db: TinyDB) -> bool:
+        return self._source is not db
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self._source = None
+
+    def get(self, item_id: str) -> IndexEntry | None:
+        return self._entries.get(item_id)
+
+    def upsert(self, category_id: int, item: dict[str, Any]) -> None:
+        """
+        Add or replace a single item after it has been written to the database.
+        """
+        with self._lock:
+            self._entries[item["id"]] = (category_id, item)
+
+    def remove(self, item_id: str) -> None:
+        with self._lock:
+            self._entries.pop(item_id, None)
+
+
+def _entries_from(categories: Iterable[dict[str, Any]]) -> dict[str, IndexEntry]:
+    entries: dict[str, IndexEntry] = {}
+    for cat in categories:
+        for item in cat.get("items", []):
+            entries[item["id"]] = (cat["id"], item)
+    return entries
+
+
+_item_index = ItemIndex()
+
+
+def get_item_index() -> ItemIndex:
+    return _item_index
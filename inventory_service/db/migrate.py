@@ -0,0 +1,55 @@
+"""
+Copy an existing TinyDB inventory file into the SQLite backend.
+
+    python -m inventory_service.db.migrate \
+        --source inventory_service/db/inventory_db.json \
+        --target inventory_service/db/inventory.sqlite3
+"""
+
+import argparse
+from pathlib import Path
+
+from tinydb import TinyDB
+
+from common import config
+from inventory_service.db.sqlite_storage import SQLiteStorage
+from inventory_service.db.storage import SEED_FINGERPRINT_KEY
+from inventory_service.db.tinydb_storage import TinyDBStorage
+
+
+def migrate(source: str, target: str) -> int:
+    """
+    Replace the catalog in ``target`` with the one in ``source``, keeping its
+    seed fingerprint so startup does not regenerate the migrated catalog.
+    Returns the number of migrated items.
+    """
+    if not Path(source).exists():
+        raise FileNotFoundError(f"TinyDB file '{source}' does not exist.")
+
+    src = TinyDBStorage(TinyDB(source))
+    dst = SQLiteStorage(target)
+    try:
+        categories = src.all_categories()
+        dst.replace_all(categories)
+        fingerprint = src.get_meta(SEED_FINGERPRINT_KEY)
+        if fingerprint is not None:
+            dst.set_meta(SEED_FINGERPRINT_KEY, fingerprint)
+    finally:
+        src.close()
+        dst.close()
+    return sum(len(c.get("items", [])) for c in categories)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Migrate the TinyDB inventory to SQLite.")
+    settings = config.inventory_storage_setting
+    parser.add_argument("--source", default=settings.INVENTORY_TINYDB_PATH)
+    parser.add_argument("--target", default=settings.INVENTORY_SQLITE_PATH)
+    args = parser.parse_args(argv)
+
+    count = migrate(args.source, args.target)
+    print(f"Migrated {count} items from {args.source} to {args.target}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import base64
+import binascii
+import json
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+SortField = Literal["position", "price", "name"]
+SortKey = tuple[Any, str]
+
+# JSON types a cursor's key may have, per sort field.
+_KEY_TYPES: dict[str, tuple[type, ...]] = {
+    "position": (int,),
+    "price": (int, float),
+    "name": (str,),
+}
+
+# Sorts after every real item id, for "everything with this key" bisects.
+_MAX_ID = chr(0x10FFFF)
+
+
+@dataclass(frozen=True)
+class ItemQuery:
+    """
+    Filters, sort order and page window for listing one category's items.
+    ``limit=None`` returns every matching item.
+    """
+
+    sort: SortField = "position"
+    descending: bool = False
+    min_price: float | None = None
+    max_price: float | None = None
+    in_stock: bool = False
+    cursor: str | None = None
+    limit: int | None = None
+
+    def matches(self, item: dict[str, Any]) -> bool:
+        if self.in_stock and item["stock"] <= 0:
+            return False
+        if self.min_price is not None and item["price"] < self.min_price:
+            return False
+        if self.max_price is not None and item["price"] > self.max_price:
+            return False
+        return True
+
+    def after(self) -> SortKey | None:
+        """The (key, item_id) the page starts after, decoded from ``cursor``."""
+        return decode_cursor(self.cursor, self.sort) if self.cursor else None
+
+
+@dataclass
+class ItemPage:
+    category: dict[str, Any]
+    items: list[dict[str, Any]] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+def encode_cursor(sort: SortField, key: SortKey) -> str:
+    raw = json.dumps([sort, key[0], key[1]], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: SortField) -> SortKey:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, key, item_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor.") from e
+    if cursor_sort != sort:
+        raise ValueError("Cursor does not match the requested sort order.")
+    # Keys are compared with stored ones (bisect, SQL bounds), so their types must match.
+    if not isinstance(key, _KEY_TYPES[sort]) or isinstance(key, bool):
+        raise ValueError("Invalid cursor.")
+    if not isinstance(item_id, str):
+        raise ValueError("Invalid cursor.")
+    return key, item_id
+
+
+def sort_key(sort: SortField, item: dict[str, Any], position: int) -> SortKey:
+    if sort == "position":
+        return position, item["id"]
+    return item[sort], item["id"]
+
+
+class SortedItemIndex:
+    """
+    Per-category sort keys, one ascending list of ``(key, item_id)`` per sort field.
+    A page is found by bisecting to the cursor and walking forward, so it costs
+    O(log n + page size) when no filter rejects items along the way.
+    """
+
+    def __init__(self, items: Iterable[dict[str, Any]]) -> None:
+        items = list(items)
+        self.keys: dict[SortField, list[SortKey]] = {
+            "position": [sort_key("position", item, pos) for pos, item in enumerate(items)],
+            "price": sorted(sort_key("price", item, 0) for item in items),
+            "name": sorted(sort_key("name", item, 0) for item in items),
+        }
+
+    def page(
+        self, query: ItemQuery, resolve: Callable[[str], dict[str, Any] | None]
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        keys = self.keys[query.sort]
+        after = query.after()
+        by_price = query.sort == "price"
+
+        if not query.descending:
+            start = bisect_right(keys, after) if after else 0
+            if by_price and query.min_price is not None:
+                start = max(start, bisect_left(keys, (query.min_price, "")))
+            positions: Iterable[int] = range(start, len(keys))
+        else:
+            start = bisect_left(keys, after) - 1 if after else len(keys) - 1
+            if by_price and query.max_price is not None:
+                start = min(start, bisect_right(keys, (query.max_price, _MAX_ID)) - 1)
+            positions = range(start, -1, -1)
+
+        page: list[dict[str, Any]] = []
+        last: SortKey | None = None
+        exhausted = True
+        for pos in positions:
+            key = keys[pos]
+            if by_price and _past_price_window(query, key[0]):
+                break
+            if query.limit is not None and len(page) == query.limit:
+                exhausted = False
+                break
+            item = resolve(key[1])
+            if item is not None and query.matches(item):
+                page.append(item)
+                last = key
+        next_cursor = encode_cursor(query.sort, last) if not exhausted and last else None
+        return page, next_cursor
+
+
+def _past_price_window(query: ItemQuery, price: float) -> bool:
+    if query.descending:
+        return query.min_price is not None and price < query.min_price
+    return query.max_price is not None and price > query.max_price
@@ -0,0 +1,376 @@
+import sqlite3
+import uuid
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any
+
+from inventory_service.db.pagination import ItemPage, ItemQuery, encode_cursor
+from inventory_service.db.storage import (
+    CATALOG_EPOCH_KEY,
+    INSERT_BATCH_SIZE,
+    InsufficientStock,
+    InventoryStorage,
+    ItemNotFound,
+    ReservationNotFound,
+    timed,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    id       INTEGER PRIMARY KEY,
+    name     TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    version  INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS items (
+    id          TEXT PRIMARY KEY,
+    category_id INTEGER NOT NULL REFERENCES categories(id),
+    position    INTEGER NOT NULL,
+    name        TEXT NOT NULL,
+    description TEXT NOT NULL,
+    price       REAL NOT NULL,
+    stock       INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_items_category ON items (category_id, position);
+CREATE INDEX IF NOT EXISTS idx_items_category_price ON items (category_id, price, id);
+CREATE INDEX IF NOT EXISTS idx_items_category_name ON items (category_id, name, id);
+CREATE TABLE IF NOT EXISTS reservations (
+    id         TEXT PRIMARY KEY,
+    item_id    TEXT NOT NULL,
+    quantity   INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reservations_expiry ON reservations (expires_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+ITEM_COLUMNS = "id, name, description, price, stock"
+# Stay well below SQLITE_MAX_VARIABLE_NUMBER for IN (...) lookups.
+LOOKUP_CHUNK_SIZE = 500
+# Bumps the version of the category holding item ``?``; run with every stock change.
+BUMP_CATEGORY_VERSION = (
+    "UPDATE categories SET version = version + 1"
+    " WHERE id = (SELECT category_id FROM items WHERE id = ?)"
+)
+
+
+class SQLiteStorage(InventoryStorage):
+    """
+    SQLite backend with indexed ``categories`` and ``items`` tables.
+    Item lookups use the primary key and category listings use
+    ``idx_items_category``, so neither scans the whole catalog.
+
+    Stock changes run in ``BEGIN IMMEDIATE`` transactions with a conditional
+    ``UPDATE``, so they stay atomic when several processes share the file.
+    They also bump ``categories.version``, so every process sees the same
+    category versions.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = Lock()
+        with self._lock:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            columns = {r["name"] for r in self._conn.execute("PRAGMA table_info(categories)")}
+            if "version" not in columns:  # files created before versions existed
+                self._conn.execute(
+                    "ALTER TABLE categories ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+                )
+
+    @timed
+    def list_categories(self) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, name FROM categories ORDER BY position"
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    @timed
+    def get_category(self, category_id: int) -> dict[str, Any] | None:
+        with self._lock:
+            cat = self._conn.execute(
+                "SELECT id, name FROM categories WHERE id = ?", (category_id,)
+            ).fetchone()
+            if cat is None:
+                return None
+            items = self._conn.execute(
+                f"SELECT {ITEM_COLUMNS} FROM items WHERE category_id = ? ORDER BY position",
+                (category_id,),
+            ).fetchall()
+        return {**dict(cat), "items": [dict(i) for i in items]}
+
+    @timed
+    def list_items(self, category_id: int, query: ItemQuery) -> ItemPage | None:
+        """
+        Keyset pagination over ``idx_items_category*``: the cursor becomes a
+        ``(key, id) > (?, ?)`` bound, so a page never reads the rows before it.
+        """
+        column = query.sort
+        direction, compare = ("DESC", "<") if query.descending else ("ASC", ">")
+        clauses = ["category_id = ?"]
+        params: list[Any] = [category_id]
+        after = query.after()
+        if after is not None:
+            clauses.append(f"({column}, id) {compare} (?, ?)")
+            params.extend(after)
+        if query.min_price is not None:
+            clauses.append("price >= ?")
+            params.append(query.min_price)
+        if query.max_price is not None:
+            clauses.append("price <= ?")
+            params.append(query.max_price)
+        if query.in_stock:
+            clauses.append("stock > 0")
+        sql = (
+            f"SELECT {ITEM_COLUMNS}, position FROM items WHERE {' AND '.join(clauses)}"
+            f" ORDER BY {column} {direction}, id {direction}"
+        )
+        if query.limit is not None:
+            sql += " LIMIT ?"
+            params.append(query.limit + 1)
+
+        with self._lock:
+            cat = self._conn.execute(
+                "SELECT id, name FROM categories WHERE id = ?", (category_id,)
+            ).fetchone()
+            if cat is None:
+                return None
+            rows = [dict(r) for r in self._conn.execute(sql, params).fetchall()]
+
+        next_cursor = None
+        if query.limit is not None and len(rows) > query.limit:
+            rows = rows[: query.limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(query.sort, (last[column], last["id"]))
+        for row in rows:
+            del row["position"]
+        return ItemPage(dict(cat), rows, next_cursor)
+
+    @timed
+    def find_item(self, item_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {ITEM_COLUMNS} FROM items WHERE id = ?", (item_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    @timed
+    def find_items(self, item_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        ids = list(dict.fromkeys(item_ids))
+        found: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+                chunk = ids[start : start + LOOKUP_CHUNK_SIZE]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT {ITEM_COLUMNS} FROM items WHERE id IN ({placeholders})", chunk
+                ).fetchall()
+                found.update((r["id"], dict(r)) for r in rows)
+        return found
+
+    def all_categories(self) -> list[dict[str, Any]]:
+        return [
+            cat for c in self.list_categories() if (cat := self.get_category(c["id"])) is not None
+        ]
+
+    @timed
+    def replace_all(
+        self, categories: Iterable[dict[str, Any]], batch_size: int = INSERT_BATCH_SIZE
+    ) -> None:
+        """
+        Streams ``categories`` into one transaction, ``batch_size`` item rows
+        per ``executemany``; listeners see each category as it is written.
+        """
+        try:
+            with self._transaction():
+                self._conn.execute("DELETE FROM meta")
+                self._conn.execute(
+                    "INSERT INTO meta (key, value) VALUES (?, ?)",
+                    (CATALOG_EPOCH_KEY, uuid.uuid4().hex),
+                )
+                self._conn.execute("DELETE FROM reservations")
+                self._conn.execute("DELETE FROM items")
+                self._conn.execute("DELETE FROM categories")
+                self._notify_cleared()
+                self._insert(categories, start=0, batch_size=batch_size)
+        except BaseException:
+            self._notify_reloaded()
+            raise
+
+    @timed
+    def reserve(
+        self, reservation_id: str, item_id: str, quantity: int, expires_at: float
+    ) -> dict[str, Any]:
+        with self._transaction():
+            updated = self._conn.execute(
+                "UPDATE items SET stock = stock - ? WHERE id = ? AND stock >= ?",
+                (quantity, item_id, quantity),
+            ).rowcount
+            row = self._conn.execute(
+                f"SELECT {ITEM_COLUMNS} FROM items WHERE id = ?", (item_id,)
+            ).fetchone()
+            if row is None:
+                raise ItemNotFound(item_id)
+            if not updated:
+                raise InsufficientStock(item_id, quantity, row["stock"])
+            self._conn.execute(BUMP_CATEGORY_VERSION, (item_id,))
+            self._conn.execute(
+                "INSERT INTO reservations (id, item_id, quantity, expires_at) VALUES (?, ?, ?, ?)",
+                (reservation_id, item_id, quantity, expires_at),
+            )
+        self._notify_item_changed(dict(row))
+        return {
+            "id": reservation_id,
+            "item_id": item_id,
+            "quantity": quantity,
+            "expires_at": expires_at,
+            "remaining_stock": row["stock"],
+        }
+
+    @timed
+    def release(self, reservation_id: str) -> dict[str, Any]:
+        with self._transaction():
+            row = self._conn.execute(
+                "SELECT id, item_id, quantity, expires_at FROM reservations WHERE id = ?",
+                (reservation_id,),
+            ).fetchone()
+            if row is None:
+                raise ReservationNotFound(reservation_id)
+            return self._restock(dict(row))
+
+    @timed
+    def expire_reservations(self, now: float) -> list[dict[str, Any]]:
+        with self._transaction():
+            rows = self._conn.execute(
+                "SELECT id, item_id, quantity, expires_at FROM reservations"
+                " WHERE expires_at <= ? ORDER BY expires_at",
+                (now,),
+            ).fetchall()
+            return [self._restock(dict(r)) for r in rows]
+
+    def _restock(self, reservation: dict[str, Any]) -> dict[str, Any]:
+        self._conn.execute("DELETE FROM reservations WHERE id = ?", (reservation["id"],))
+        self._conn.execute(
+            "UPDATE items SET stock = stock + ? WHERE id = ?",
+            (reservation["quantity"], reservation["item_id"]),
+        )
+        self._conn.execute(BUMP_CATEGORY_VERSION, (reservation["item_id"],))
+        row = self._conn.execute(
+            f"SELECT {ITEM_COLUMNS} FROM items WHERE id = ?", (reservation["item_id"],)
+        ).fetchone()
+        if row is None:
+            return {**reservation, "remaining_stock": 0}
+        self._notify_item_changed(dict(row))
+        return {**reservation, "remaining_stock": row["stock"]}
+
+    def get_meta(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return str(row["value"]) if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._transaction():
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+    def catalog_version(self) -> str:
+        epoch = self.get_meta(CATALOG_EPOCH_KEY)
+        if epoch is None:  # a file written before epochs existed
+            with self._transaction():
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO meta (key, value) VALUES (?, ?)",
+                    (CATALOG_EPOCH_KEY, uuid.uuid4().hex),
+                )
+            epoch = self.get_meta(CATALOG_EPOCH_KEY)
+        return str(epoch)
+
+    def category_version(self, category_id: int) -> str | None:
+        return self._version(
+            "SELECT c.version, m.value AS epoch FROM categories c"
+            " LEFT JOIN meta m ON m.key = ? WHERE c.id = ?",
+            category_id,
+        )
+
+    def item_version(self, item_id: str) -> str | None:
+        return self._version(
+            "SELECT c.version, m.value AS epoch FROM items i"
+            " JOIN categories c ON c.id = i.category_id"
+            " LEFT JOIN meta m ON m.key = ? WHERE i.id = ?",
+            item_id,
+        )
+
+    def _version(self, sql: str, key: int | str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(sql, (CATALOG_EPOCH_KEY, key)).fetchone()
+        if row is None:
+            return None
+        epoch = row["epoch"] if row["epoch"] is not None else self.catalog_version()
+        return f"{epoch}-{row['version']}"
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _insert(
+        self,
+        categories: Iterable[dict[str, Any]],
+        start: int,
+        batch_size: int = INSERT_BATCH_SIZE,
+    ) -> None:
+        rows: list[tuple[Any, ...]] = []
+        for position, cat in enumerate(categories, start=start):
+            self._conn.execute(
+                "INSERT INTO categories (id, name, position) VALUES (?, ?, ?)",
+                (cat["id"], cat["name"], position),
+            )
+            rows.extend(
+                (
+                    item["id"],
+                    cat["id"],
+                    pos,
+                    item["name"],
+                    item["description"],
+                    item["price"],
+                    item["stock"],
+                )
+                for pos, item in enumerate(cat.get("items", []))
+            )
+            if len(rows) >= batch_size:
+                self._insert_items(rows)
+                rows = []
+            self._notify_category_added(cat)
+        if rows:
+            self._insert_items(rows)
+
+    def _insert_items(self, rows: list[tuple[Any, ...]]) -> None:
+        self._conn.executemany(
+            "INSERT INTO items (id, category_id, position, name, description, price, stock)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,276 @@
+import functools
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, ClassVar, Protocol, TypeVar, cast
+
+from common.metrics import FAST_BUCKETS, Histogram
+from common.tracing import get_tracer
+from inventory_service.db.pagination import ItemPage, ItemQuery, SortedItemIndex
+
+# Items written per statement batch by backends that load incrementally.
+INSERT_BATCH_SIZE = 10_000
+# Metadata key recording which generated catalog the storage holds.
+SEED_FINGERPRINT_KEY = "seed_fingerprint"
+# Metadata key of a random token that changes with every ``replace_all``.
+CATALOG_EPOCH_KEY = "catalog_epoch"
+
+STORAGE_LATENCY = Histogram(
+    "inventory_storage_operation_seconds",
+    "Duration of inventory storage operations.",
+    ("backend", "operation"),
+    buckets=FAST_BUCKETS,
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+# Set while a @timed call runs, per thread and task, so concurrent calls are all recorded.
+_in_timed_call: ContextVar[bool] = ContextVar("in_timed_storage_call", default=False)
+
+
+def timed(method: F) -> F:
+    """
+    Record each call of a storage method in STORAGE_LATENCY, labelled with
+    the backend and the method name, and as a ``storage.<method>`` span when
+    the request is traced. Failed calls are timed too; timed calls made
+    inside another one (``find_items`` looking up each item) are part of the
+    outer operation and not recorded again.
+    """
+    operation = method.__name__
+    span_name = f"storage.{operation}"
+
+    @functools.wraps(method)
+    def wrapper(self: "InventoryStorage", *args: Any, **kwargs: Any) -> Any:
+        if _in_timed_call.get():
+            return method(self, *args, **kwargs)
+        token = _in_timed_call.set(True)
+        started = perf_counter()
+        try:
+            with get_tracer().start_span(span_name) as span:
+                span.set_attribute("db.system", self.backend)
+                return method(self, *args, **kwargs)
+        finally:
+            _in_timed_call.reset(token)
+            STORAGE_LATENCY.labels(self.backend, operation).observe(perf_counter() - started)
+
+    return cast(F, wrapper)
+
+
+class ItemNotFound(LookupError):
+    def __init__(self, item_id: str) -> None:
+        super().__init__(f"Item '{item_id}' not found.")
+        self.item_id = item_id
+
+
+class InsufficientStock(ValueError):
+    def __init__(self, item_id: str, requested: int, available: int) -> None:
+        super().__init__(f"Item '{item_id}' has {available} in stock, cannot reserve {requested}.")
+        self.item_id = item_id
+        self.requested = requested
+        self.available = available
+
+
+class ReservationNotFound(LookupError):
+    def __init__(self, reservation_id: str) -> None:
+        super().__init__(f"Reservation '{reservation_id}' not found or already expired.")
+        self.reservation_id = reservation_id
+
+
+class CatalogListener(Protocol):
+    """
+    Receives catalog changes from a storage backend, e.g. to keep a derived
+    index in sync. Called synchronously while the write is held, so keep it cheap.
+    """
+
+    def catalog_cleared(self) -> None: ...
+
+    def category_added(self, category: dict[str, Any]) -> None: ...
+
+    def item_changed(self, item: dict[str, Any]) -> None: ...
+
+
+class _CategoryPages:
+    """A category's header, items by id and sort keys, as read at one version."""
+
+    __slots__ = ("header", "items", "index")
+
+    def __init__(self, category: dict[str, Any]) -> None:
+        self.header = {"id": category["id"], "name": category["name"]}
+        self.items = {item["id"]: item for item in category["items"]}
+        self.index = SortedItemIndex(category["items"])
+
+
+class InventoryStorage(ABC):
+    """
+    Storage interface used by the inventory routers.
+
+    Categories are exchanged as plain dicts shaped like ``CategoryWithItems``
+    (``{"id": 1, "name": "...", "items": [...]}``) and items as dicts shaped
+    like ``Item``, so backends stay independent of the Pydantic schemas.
+
+    Backends report every ``replace_all`` (as a clear followed by one event
+    per category) and every changed item to the listeners registered with
+    ``add_listener``. Reads and writes are timed with ``@timed``, labelled
+    with ``backend``.
+    """
+
+    backend: ClassVar[str] = "custom"
+
+    def __init__(self) -> None:
+        self._listeners: list[CatalogListener] = []
+        # category_id -> (category_version, page of the category built at that version)
+        self._pages: dict[int, tuple[str, _CategoryPages]] = {}
+
+    def add_listener(self, listener: CatalogListener) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: CatalogListener) -> None:
+        self._listeners.remove(listener)
+
+    def _notify_cleared(self) -> None:
+        self._pages.clear()
+        for listener in self._listeners:
+            listener.catalog_cleared()
+
+    def _notify_category_added(self, category: dict[str, Any]) -> None:
+        for listener in self._listeners:
+            listener.category_added(category)
+
+    def _notify_reloaded(self) -> None:
+        """Replay the stored catalog, e.g. after a failed ``replace_all`` rolled back."""
+        if self._listeners:
+            self._notify_cleared()
+            for category in self.all_categories():
+                self._notify_category_added(category)
+
+    def _notify_item_changed(self, item: dict[str, Any]) -> None:
+        for listener in self._listeners:
+            listener.item_changed(item)
+
+    @abstractmethod
+    def list_categories(self) -> list[dict[str, Any]]:
+        """Return ``{"id", "name"}`` for every category, in insertion order."""
+
+    @abstractmethod
+    def get_category(self, category_id: int) -> dict[str, Any] | None:
+        """Return a category together with its items, or None."""
+
+    @timed
+    def list_items(self, category_id: int, query: ItemQuery) -> ItemPage | None:
+        """
+        Return one page of a category's items, filtered and sorted per ``query``,
+        or None if the category does not exist. Raises ValueError for a bad cursor.
+
+        The sort keys and items of a category are kept until its version
+        changes, so only the first page after a change reads the category.
+        """
+        version = self.category_version(category_id)
+        if version is None:
+            return None
+        cached = self._pages.get(category_id)
+        if cached is not None and cached[0] == version:
+            pages = cached[1]
+        else:
+            cat = self.get_category(category_id)
+            if cat is None:
+                return None
+            pages = _CategoryPages(cat)
+            self._pages[category_id] = (version, pages)
+        page, next_cursor = pages.index.page(query, pages.items.get)
+        return ItemPage(pages.header, page, next_cursor)
+
+    @abstractmethod
+    def find_item(self, item_id: str) -> dict[str, Any] | None:
+        """Return a single item by id, or None."""
+
+    @timed
+    def find_items(self, item_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """
+        Return the items that exist among ``item_ids``, keyed by id.
+        """
+        found: dict[str, dict[str, Any]] = {}
+        for item_id in item_ids:
+            item = self.find_item(item_id)
+            if item is not None:
+                found[item_id] = item
+        return found
+
+    @abstractmethod
+    def all_categories(self) -> list[dict[str, Any]]:
+        """Return every category together with its items."""
+
+    @abstractmethod
+    def replace_all(
+        self, categories: Iterable[dict[str, Any]], batch_size: int = INSERT_BATCH_SIZE
+    ) -> None:
+        """
+        Drop the current catalog and store ``categories`` instead.
+        ``categories`` may be a generator and is consumed once; backends that
+        can load incrementally write every ``batch_size`` items, so the whole
+        catalog never has to be in memory.
+        """
+
+    @abstractmethod
+    def reserve(
+        self, reservation_id: str, item_id: str, quantity: int, expires_at: float
+    ) -> dict[str, Any]:
+        """
+        Atomically take ``quantity`` units of ``item_id`` out of stock and record
+        a hold that expires at ``expires_at`` (epoch seconds).
+        Returns the reservation including the item's ``remaining_stock``.
+        Raises ItemNotFound or InsufficientStock.
+        """
+
+    @abstractmethod
+    def release(self, reservation_id: str) -> dict[str, Any]:
+        """
+        Drop a hold and put its units back in stock.
+        Raises ReservationNotFound.
+        """
+
+    @abstractmethod
+    def expire_reservations(self, now: float) -> list[dict[str, Any]]:
+        """
+        Release every hold that expired at or before ``now`` and return them.
+        """
+
+    @abstractmethod
+    def get_meta(self, key: str) -> str | None:
+        """Return a stored metadata value (e.g. the seed fingerprint), or None."""
+
+    @abstractmethod
+    def set_meta(self, key: str, value: str) -> None:
+        """
+        Store a metadata value. ``replace_all`` clears all metadata, since it
+        describes the catalog that was replaced.
+        """
+
+    @abstractmethod
+    def catalog_version(self) -> str:
+        """
+        Opaque token that changes whenever the catalog is replaced, i.e. the
+        category list changes.
+        """
+
+    @abstractmethod
+    def category_version(self, category_id: int) -> str | None:
+        """
+        Opaque token that changes whenever the category or any of its items
+        changes (including stock); None if there is no such category.
+        """
+
+    @abstractmethod
+    def item_version(self, item_id: str) -> str | None:
+        """The ``category_version`` of the category holding ``item_id``, or None."""
+
+    def index_is_stale(self) -> bool:
+        """
+        Whether the next item lookup has to rebuild an in-memory index first.
+        Backends that are indexed natively never report a stale index.
+        """
+        return False
+
+    def close(self) -> None:  # noqa: B027 - optional hook
+        """Release any resources held by the backend."""
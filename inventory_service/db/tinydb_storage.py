@@ -0,0 +1,229 @@
+import heapq
+import uuid
+from collections.abc import Iterable
+from threading import Lock
+from typing import Any
+
+from tinydb import Query, TinyDB
+
+from inventory_service.db.item_index import ItemIndex
+from inventory_service.db.pagination import ItemPage, ItemQuery, SortedItemIndex
+from inventory_service.db.storage import (
+    INSERT_BATCH_SIZE,
+    InsufficientStock,
+    InventoryStorage,
+    ItemNotFound,
+    ReservationNotFound,
+    timed,
+)
+
+META_TABLE = "meta"
+# Outstanding reservation holds, so a restart can still release or expire them.
+RESERVATIONS_TABLE = "reservations"
+
+
+class TinyDBStorage(InventoryStorage):
+    """
+    Default backend: one TinyDB document per category with embedded items.
+    Item lookups go through an in-memory ``ItemIndex`` instead of a full scan.
+
+    Reservation holds are stored in their own table and reloaded on open, so
+    they can still be released or expire after a restart. Category versions
+    and the expiry queue live in memory, so this backend is only correct when
+    a single process owns the database file; use SQLite for multi-process
+    setups.
+    """
+
+    backend = "tinydb"
+
+    def __init__(self, db: TinyDB, index: ItemIndex | None = None) -> None:
+        super().__init__()
+        self.db = db
+        self.index = index if index is not None else ItemIndex()
+        self._write_lock = Lock()
+        self._holds: dict[str, dict[str, Any]] = {
+            hold["id"]: dict(hold) for hold in self.db.table(RESERVATIONS_TABLE).all()
+        }
+        self._expiry: list[tuple[float, str]] = [
+            (hold["expires_at"], reservation_id) for reservation_id, hold in self._holds.items()
+        ]
+        heapq.heapify(self._expiry)
+        # category_id -> (category header, sort keys); prices and names only change on reseed.
+        self._sorted: dict[int, tuple[dict[str, Any], SortedItemIndex]] = {}
+        # Category versions, counted from the last index rebuild; ``_epoch``
+        # changes with every rebuild so tokens from before it never match.
+        self._epoch = uuid.uuid4().hex
+        self._versions: dict[int, int] | None = None
+
+    @timed
+    def list_categories(self) -> list[dict[str, Any]]:
+        return [{"id": c["id"], "name": c["name"]} for c in self.db.all()]
+
+    @timed
+    def get_category(self, category_id: int) -> dict[str, Any] | None:
+        CategoryQ = Query()
+        cat = self.db.get(CategoryQ.id == category_id)
+        return dict(cat) if cat else None
+
+    @timed
+    def find_item(self, item_id: str) -> dict[str, Any] | None:
+        entry = self._entry(item_id)
+        return entry[1] if entry else None
+
+    @timed
+    def list_items(self, category_id: int, query: ItemQuery) -> ItemPage | None:
+        """
+        Pages come from cached per-category sort keys and the item index, so
+        neither the JSON file nor the whole category is read per request.
+        """
+        if self.index.is_stale(self.db):
+            self._rebuild_indexes()
+        cached = self._sorted.get(category_id)
+        if cached is None:
+            cat = self.get_category(category_id)
+            if cat is None:
+                return None
+            cached = ({"id": cat["id"], "name": cat["name"]}, SortedItemIndex(cat["items"]))
+            self._sorted[category_id] = cached
+        header, sorted_index = cached
+        page, next_cursor = sorted_index.page(query, self.find_item)
+        return ItemPage(header, page, next_cursor)
+
+    def _entry(self, item_id: str) -> tuple[int, dict[str, Any]] | None:
+        if self.index.is_stale(self.db):
+            self._rebuild_indexes()
+        return self.index.get(item_id)
+
+    def _rebuild_indexes(self) -> None:
+        self.index.build(self.db)
+        self._sorted.clear()
+        self._epoch = uuid.uuid4().hex
+        self._versions = dict.fromkeys((c["id"] for c in self.db.all()), 0)
+
+    def _category_versions(self) -> dict[int, int]:
+        if self._versions is None or self.index.is_stale(self.db):
+            self._rebuild_indexes()
+        assert self._versions is not None
+        return self._versions
+
+    def all_categories(self) -> list[dict[str, Any]]:
+        return [dict(c) for c in self.db.all()]
+
+    @timed
+    def replace_all(
+        self, categories: Iterable[dict[str, Any]], batch_size: int = INSERT_BATCH_SIZE
+    ) -> None:
+        """
+        TinyDB rewrites the whole JSON file on every write, so the catalog is
+        collected and written once; ``batch_size`` does not apply.
+        """
+        categories = list(categories)
+        with self._write_lock:
+            self.db.drop_tables()
+            self.db.insert_multiple(categories)
+            self._rebuild_indexes()
+            self._holds.clear()
+            self._expiry.clear()
+            self._notify_cleared()
+            for category in categories:
+                self._notify_category_added(category)
+
+    @timed
+    def reserve(
+        self, reservation_id: str, item_id: str, quantity: int, expires_at: float
+    ) -> dict[str, Any]:
+        with self._write_lock:
+            entry = self._entry(item_id)
+            if entry is None:
+                raise ItemNotFound(item_id)
+            category_id, item = entry
+            if item["stock"] < quantity:
+                raise InsufficientStock(item_id, quantity, item["stock"])
+
+            remaining = self._set_stock(category_id, item, item["stock"] - quantity)
+            reservation = {
+                "id": reservation_id,
+                "item_id": item_id,
+                "quantity": quantity,
+                "expires_at": expires_at,
+            }
+            self.db.table(RESERVATIONS_TABLE).insert(reservation)
+            self._holds[reservation_id] = reservation
+            heapq.heappush(self._expiry, (expires_at, reservation_id))
+        return {**reservation, "remaining_stock": remaining}
+
+    @timed
+    def release(self, reservation_id: str) -> dict[str, Any]:
+        with self._write_lock:
+            reservation = self._holds.pop(reservation_id, None)
+            if reservation is None:
+                raise ReservationNotFound(reservation_id)
+            self._forget_holds([reservation_id])
+            return self._restock(reservation)
+
+    @timed
+    def expire_reservations(self, now: float) -> list[dict[str, Any]]:
+        expired: list[dict[str, Any]] = []
+        with self._write_lock:
+            while self._expiry and self._expiry[0][0] <= now:
+                _, reservation_id = heapq.heappop(self._expiry)
+                reservation = self._holds.pop(reservation_id, None)
+                if reservation is not None:  # already released otherwise
+                    expired.append(self._restock(reservation))
+            if expired:
+                self._forget_holds([r["id"] for r in expired])
+        return expired
+
+    def _forget_holds(self, reservation_ids: list[str]) -> None:
+        HoldQ = Query()
+        self.db.table(RESERVATIONS_TABLE).remove(HoldQ.id.one_of(reservation_ids))
+
+    def _restock(self, reservation: dict[str, Any]) -> dict[str, Any]:
+        entry = self._entry(reservation["item_id"])
+        if entry is None:  # item disappeared with a reseed; nothing to give back
+            return {**reservation, "remaining_stock": 0}
+        category_id, item = entry
+        remaining = self._set_stock(category_id, item, item["stock"] + reservation["quantity"])
+        return {**reservation, "remaining_stock": remaining}
+
+    def _set_stock(self, category_id: int, item: dict[str, Any], stock: int) -> int:
+        CategoryQ = Query()
+        cat = self.db.get(CategoryQ.id == category_id)
+        if cat is None:
+            raise ItemNotFound(item["id"])
+        items = [dict(i, stock=stock) if i["id"] == item["id"] else i for i in cat["items"]]
+        self.db.update({"items": items}, doc_ids=[cat.doc_id])
+        updated = {**item, "stock": stock}
+        self.index.upsert(category_id, updated)
+        if self._versions is not None:
+            self._versions[category_id] = self._versions.get(category_id, 0) + 1
+        self._notify_item_changed(updated)
+        return stock
+
+    def get_meta(self, key: str) -> str | None:
+        MetaQ = Query()
+        docs = self.db.table(META_TABLE).search(MetaQ.key == key)
+        return str(docs[0]["value"]) if docs else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        MetaQ = Query()
+        with self._write_lock:
+            self.db.table(META_TABLE).upsert({"key": key, "value": value}, MetaQ.key == key)
+
+    def catalog_version(self) -> str:
+        self._category_versions()
+        return self._epoch
+
+    def category_version(self, category_id: int) -> str | None:
+        version = self._category_versions().get(category_id)
+        return None if version is None else f"{self._epoch}-{version}"
+
+    def item_version(self, item_id: str) -> str | None:
+        entry = self._entry(item_id)
+        return None if entry is None else self.category_version(entry[0])
+
+    def index_is_stale(self) -> bool:
+        return self.index.is_stale(self.db)
+
+    def close(self) -> None:
+        self.db.close()
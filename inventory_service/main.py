@@ -1,18 +1,75 @@
-from collections.abc import AsyncGenerator
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import AsyncGenerator, Iterator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from inventory_service.core.db_init import init_inventory
+from common.metrics.asgi import MetricsMiddleware, metrics
+from common.profiling.asgi import ProfilingMiddleware
+from common.tracing import get_tracer
+from common.tracing.asgi import TracingMiddleware
+from inventory_service.core.db_init import ensure_inventory
+from inventory_service.core.events import get_event_publisher, get_inventory_events
+from inventory_service.core.reservations import get_reservation_service
+from inventory_service.core.search import get_search_index
+from inventory_service.db import get_storage
 from inventory_service.routers import inventory
 
+logger = logging.getLogger(__name__)
+
+
+@contextlib.contextmanager
+def _phase(name: str, timings: dict[str, float]) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - started
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    init_inventory()  # seed db on startup
+    timings: dict[str, float] = {}
+    with _phase("storage", timings):
+        storage = get_storage()
+    await get_event_publisher().start()
+    get_inventory_events(storage)  # publish stock changes, including a reseed below
+    with _phase("catalog", timings):
+        seeded = ensure_inventory(storage)  # seed db on startup unless unchanged
+    with _phase("search_index", timings):
+        get_search_index(storage)  # build the search index before taking traffic
+    app.state.startup_timings = timings
+    logger.info(
+        "Inventory startup (%s) in %.3fs: %s",
+        "seeded" if seeded else "reused catalog",
+        sum(timings.values()),
+        ", ".join(f"{name}={seconds:.3f}s" for name, seconds in timings.items()),
+    )
+
+    sweeper = asyncio.create_task(get_reservation_service(storage).run_sweeper())
     yield
-    # Shutdown logic (optional)
+    sweeper.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await sweeper
+    await get_event_publisher().aclose()  # sends what is still buffered
+    get_tracer().shutdown()
+
+
+def create_app() -> FastAPI:
+    """
+    Build the inventory app. Storage, seeding and indexes are set up by the
+    lifespan hook, so building (or importing) the app does no I/O.
+    """
+    app = FastAPI(title="Inventory Service", lifespan=lifespan)
+    app.add_middleware(ProfilingMiddleware, service="inventory")  # innermost
+    app.add_middleware(TracingMiddleware, service="inventory")
+    app.add_middleware(MetricsMiddleware)
+    app.add_api_route("/metrics", metrics, include_in_schema=False)
+    app.include_router(inventory.router, prefix="", tags=["Inventory"])
+    return app
 
 
-app = FastAPI(title="Inventory Service", lifespan=lifespan)
-app.include_router(inventory.router, prefix="", tags=["Inventory"])
+app = create_app()
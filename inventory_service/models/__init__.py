@@ -2,6 +2,28 @@
 Pydantic schemas for API I/O.
 """
 
-from .schemas import Category, CategoryList, CategoryWithItems, Item, ItemsInCategory
+from .schemas import (
+    Category,
+    CategoryList,
+    CategoryWithItems,
+    Item,
+    ItemBatchRequest,
+    ItemBatchResponse,
+    ItemsInCategory,
+    Reservation,
+    ReserveRequest,
+    SearchResults,
+)
 
-__all__ = ["Item", "Category", "CategoryWithItems", "CategoryList", "ItemsInCategory"]
+__all__ = [
+    "Item",
+    "Category",
+    "CategoryWithItems",
+    "CategoryList",
+    "ItemsInCategory",
+    "ItemBatchRequest",
+    "ItemBatchResponse",
+    "ReserveRequest",
+    "Reservation",
+    "SearchResults",
+]
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+MAX_BATCH_SIZE = 1000
 
 
 class Category(BaseModel):
@@ -25,3 +27,36 @@ class CategoryList(BaseModel):
 class ItemsInCategory(BaseModel):
     category: Category
     items: list[Item]
+    next_cursor: str | None = None
+
+
+class SearchResults(BaseModel):
+    query: str
+    total: int = Field(..., description="Number of matching items across all pages")
+    offset: int
+    limit: int
+    items: list[Item]
+
+
+class ItemBatchRequest(BaseModel):
+    ids: list[str] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class ItemBatchResponse(BaseModel):
+    items: list[Item]
+    missing: list[str]
+
+
+class ReserveRequest(BaseModel):
+    quantity: int = Field(..., gt=0, description="Units to hold")
+    ttl_seconds: float | None = Field(
+        default=None, gt=0, description="Hold lifetime; the service default when omitted"
+    )
+
+
+class Reservation(BaseModel):
+    id: str
+    item_id: str
+    quantity: int
+    expires_at: float = Field(..., description="Expiry as a Unix timestamp")
+    remaining_stock: int
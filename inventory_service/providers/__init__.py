@@ -2,6 +2,18 @@
 Faker custom providers for apparel data.
 """
 
-from .fake_apparel_provider import ApparelProvider
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .fake_apparel_provider import ApparelProvider
 
 __all__ = ["ApparelProvider"]
+
+
+def __getattr__(name: str) -> Any:
+    # Imported on demand: the provider pulls in Faker, which only seeding needs.
+    if name == "ApparelProvider":
+        from .fake_apparel_provider import ApparelProvider
+
+        return ApparelProvider
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
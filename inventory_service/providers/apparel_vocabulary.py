@@ -0,0 +1,25 @@
+"""
+Word lists behind the generated apparel catalog. Kept free of Faker so code
+that only needs the vocabulary (category names, fingerprints) stays cheap to import.
+"""
+
+TYPES_BY_CATEGORY: dict[str, list[str]] = {
+    "Tops": ["Tee", "Oxford Shirt", "Polo", "Henley", "Linen Shirt", "Hoodie", "Sweatshirt"],
+    "Bottoms": ["Chinos", "Jeans", "Trousers", "Joggers", "Shorts", "Cargo Pants"],
+    "Dresses": ["Wrap Dress", "Maxi Dress", "Slip Dress", "Shirt Dress", "A-line Dress"],
+    "Outerwear": ["Denim Jacket", "Bomber Jacket", "Puffer Jacket", "Wool Coat", "Trench"],
+    "Activewear": [
+        "Training Tee",
+        "Leggings",
+        "Running Shorts",
+        "Track Jacket",
+        "Compression Top",
+    ],
+    "Footwear": ["Sneakers", "Running Shoes", "Loafers", "Chelsea Boots", "Slides", "Sandals"],
+    "Accessories": ["Leather Belt", "Scarf", "Cap", "Beanie", "Sunglasses"],
+    "Swimwear": ["Swim Trunks", "One-piece", "Bikini Set", "Rash Guard"],
+    "Sleepwear": ["Pajama Set", "Sleep Tee", "Robe", "Slippers", "Short Pajamas"],
+    "Kids": ["Graphic Tee", "Joggers", "Hoodie", "Denim", "Sneakers"],
+}
+
+ADJECTIVES = ["Classic", "Premium", "Essential", "Urban", "Heritage", "Athletic"]
@@ -1,35 +1,23 @@
-import random
-
 from faker.providers import BaseProvider
 
+from inventory_service.providers.apparel_vocabulary import ADJECTIVES, TYPES_BY_CATEGORY
+
 
 class ApparelProvider(BaseProvider):
-    types_by_category = {
-        "Tops": ["Tee", "Oxford Shirt", "Polo", "Henley", "Linen Shirt", "Hoodie", "Sweatshirt"],
-        "Bottoms": ["Chinos", "Jeans", "Trousers", "Joggers", "Shorts", "Cargo Pants"],
-        "Dresses": ["Wrap Dress", "Maxi Dress", "Slip Dress", "Shirt Dress", "A-line Dress"],
-        "Outerwear": ["Denim Jacket", "Bomber Jacket", "Puffer Jacket", "Wool Coat", "Trench"],
-        "Activewear": [
-            "Training Tee",
-            "Leggings",
-            "Running Shorts",
-            "Track Jacket",
-            "Compression Top",
-        ],
-        "Footwear": ["Sneakers", "Running Shoes", "Loafers", "Chelsea Boots", "Slides", "Sandals"],
-        "Accessories": ["Leather Belt", "Scarf", "Cap", "Beanie", "Sunglasses"],
-        "Swimwear": ["Swim Trunks", "One-piece", "Bikini Set", "Rash Guard"],
-        "Sleepwear": ["Pajama Set", "Sleep Tee", "Robe", "Slippers", "Short Pajamas"],
-        "Kids": ["Graphic Tee", "Joggers", "Hoodie", "Denim", "Sneakers"],
-    }
+    """
+    Apparel names, descriptions and prices. Draws from the owning Faker's
+    random instance, so ``Faker.seed_instance`` makes the output reproducible.
+    """
+
+    types_by_category = TYPES_BY_CATEGORY
 
     def item_name(self, category: str) -> str:
-        base = random.choice(self.types_by_category[category])
-        adj = random.choice(["Classic", "Premium", "Essential", "Urban", "Heritage", "Athletic"])
+        base = self.generator.random.choice(self.types_by_category[category])
+        adj = self.generator.random.choice(ADJECTIVES)
         return f"{adj} {base}"
 
     def item_description(self, category: str, name: str) -> str:
         return f"{name} designed for comfort and everyday wear."
 
     def item_price(self, category: str) -> float:
-        return round(random.uniform(15, 150), 2)
+        return round(float(self.generator.random.uniform(15, 150)), 2)
@@ -1,46 +1,162 @@
-from fastapi import APIRouter, HTTPException
-from tinydb import Query
+from typing import Literal, cast
 
-from inventory_service.db import get_db
-from inventory_service.models import Category, CategoryList, Item, ItemsInCategory
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from common import config
+from common.responses import FastJSONResponse, RawJSONResponse
+from inventory_service.core.events import get_inventory_events
+from inventory_service.core.payloads import get_payload_cache, item_payload
+from inventory_service.core.reservations import get_reservation_service
+from inventory_service.core.search import get_search_index
+from inventory_service.db import get_storage
+from inventory_service.db.pagination import ItemQuery, SortField
+from inventory_service.db.storage import InsufficientStock, ItemNotFound, ReservationNotFound
+from inventory_service.models import (
+    Category,
+    CategoryList,
+    Item,
+    ItemBatchRequest,
+    ItemBatchResponse,
+    ItemsInCategory,
+    Reservation,
+    ReserveRequest,
+    SearchResults,
+)
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+SortParam = Literal["price", "-price", "name", "-name"]
+
+
+def _fast_responses() -> bool:
+    """
+    Whether read routes serialize storage dicts directly (SERVER_FAST_RESPONSES)
+    instead of building models that FastAPI validates again via response_model.
+    """
+    return config.server_setting.SERVER_FAST_RESPONSES
+
+
+def _validators(version: str) -> dict[str, str]:
+    """
+    ETag and Cache-Control headers for a body at storage ``version``. The ETag
+    is weak: fast and validated responses are equal as JSON, not byte for byte.
+    """
+    return {
+        "ETag": f'W/"{version}"',
+        "Cache-Control": config.inventory_http_setting.INVENTORY_HTTP_CACHE_CONTROL,
+    }
+
+
+def _not_modified(request: Request, headers: dict[str, str]) -> Response | None:
+    """A 304 response if the request's If-None-Match matches ``headers``' ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in tags or headers["ETag"].removeprefix("W/") in tags:
+        return Response(status_code=304, headers=headers)
+    return None
+
 
 @router.get("/categories", response_model=CategoryList)
-async def get_categories() -> CategoryList:
+async def get_categories(request: Request, response: Response) -> CategoryList | Response:
     """
     Retrieve all categories in the inventory.
+    Answers 304 when If-None-Match carries the current ETag.
     """
-    db = get_db()
-    categories = [Category(id=c["id"], name=c["name"]) for c in db.all()]
+    storage = get_storage()
+    version = storage.catalog_version()
+    headers = _validators(version)
+    if (not_modified := _not_modified(request, headers)) is not None:
+        return not_modified
+    if _fast_responses():
+        return RawJSONResponse(get_payload_cache(storage).categories(version), headers=headers)
+    response.headers.update(headers)
+    categories = [Category(id=c["id"], name=c["name"]) for c in storage.list_categories()]
     return CategoryList(categories=categories)
 
 
-@router.get("/categories/{category_id}/items", response_model=ItemsInCategory)
-async def get_items(category_id: int) -> ItemsInCategory:
+@router.get(
+    "/categories/{category_id}/items",
+    response_model=ItemsInCategory,
+    response_model_exclude_none=True,
+)
+async def get_items(
+    request: Request,
+    response: Response,
+    category_id: int,
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    min_price: float | None = Query(None, ge=0),
+    max_price: float | None = Query(None, ge=0),
+    in_stock: bool = Query(False, description="Only items with stock > 0"),
+    sort: SortParam | None = Query(None, description="price, -price, name or -name"),
+) -> ItemsInCategory | Response:
     """
-    Retrieve all items in the category.
+    Retrieve the items in the category.
+    Without query parameters every item is returned in catalog order. With any
+    of them the result is filtered, sorted and paginated (DEFAULT_PAGE_SIZE per
+    page unless ``limit`` is given); follow ``next_cursor`` for the next page.
+    The ETag follows the category's version, so any item change (stock
+    included) changes it; If-None-Match with the current ETag answers 304.
     """
-    db = get_db()
-    CategoryQ = Query()
-    cat = db.get(CategoryQ.id == category_id)
-    if not cat:
+    storage = get_storage()
+    version = storage.category_version(category_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Category not found")
+    headers = _validators(version)
+    if (not_modified := _not_modified(request, headers)) is not None:
+        return not_modified
+
+    paged = in_stock or any(p is not None for p in (cursor, limit, min_price, max_price, sort))
+    if not paged and _fast_responses():
+        body = get_payload_cache(storage).category_items(category_id, version)
+        if body is None:
+            raise HTTPException(status_code=404, detail="Category not found")
+        return RawJSONResponse(body, headers=headers)
+
+    query = ItemQuery(
+        sort=cast(SortField, sort.lstrip("-")) if sort else "position",
+        descending=bool(sort and sort.startswith("-")),
+        min_price=min_price,
+        max_price=max_price,
+        in_stock=in_stock,
+        cursor=cursor,
+        limit=(limit or DEFAULT_PAGE_SIZE) if paged else None,
+    )
+    try:
+        page = storage.list_items(category_id, query)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve)) from ve
+    if page is None:
+        raise HTTPException(status_code=404, detail="Category not found")
+    if _fast_responses():
+        content = {
+            "category": {"id": page.category["id"], "name": page.category["name"]},
+            "items": [item_payload(i) for i in page.items],
+        }
+        if page.next_cursor is not None:
+            content["next_cursor"] = page.next_cursor
+        return FastJSONResponse(content, headers=headers)
+    response.headers.update(headers)
     return ItemsInCategory(
-        category=Category(id=cat["id"], name=cat["name"]),
-        items=[Item(**i) for i in cat["items"]],
+        category=Category(**page.category),
+        items=[Item(**i) for i in page.items],
+        next_cursor=page.next_cursor,
     )
 
 
 @router.get("/categories/{category_id}/items/{item_id}", response_model=Item)
-async def get_item_detail(category_id: int, item_id: str) -> Item:
+async def get_item_detail(category_id: int, item_id: str) -> Item | Response:
     """
     Retrieve details of a specific item in a category.
     """
-    db = get_db()
-    CategoryQ = Query()
-    cat = db.get(CategoryQ.id == category_id)
+    storage = get_storage()
+    cat = storage.get_category(category_id)
     if not cat:
         raise HTTPException(status_code=404, detail="Category not found")
 
@@ -48,17 +164,123 @@ async def get_item_detail(category_id: int, item_id: str) -> Item:
     if not item_data:
         raise HTTPException(status_code=404, detail="Item not found")
 
+    if _fast_responses():
+        return FastJSONResponse(item_payload(item_data))
     return Item(**item_data)
 
 
 @router.get("/items/{item_id}", response_model=Item)
-async def find_item_detail(item_id: str) -> Item:
+async def find_item_detail(item_id: str, request: Request, response: Response) -> Item | Response:
     """
     Find item by item id.
+    The X-Item-Index header reports whether the backend had to rebuild its
+    in-memory item index before answering. The ETag follows the version of
+    the item's category; If-None-Match with the current ETag answers 304.
+    """
+    storage = get_storage()
+    index_state = "stale" if storage.index_is_stale() else "fresh"
+    version = storage.item_version(item_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    headers = {**_validators(version), "X-Item-Index": index_state}
+    if (not_modified := _not_modified(request, headers)) is not None:
+        return not_modified
+
+    item = storage.find_item(item_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    if _fast_responses():
+        return FastJSONResponse(item_payload(item), headers=headers)
+    response.headers.update(headers)
+    return Item(**item)
+
+
+@router.get("/search", response_model=SearchResults)
+async def search_items(
+    q: str = Query(..., min_length=1, max_length=200, description="Words or word prefixes"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+) -> SearchResults | Response:
+    """
+    Full-text search over item names and descriptions.
+    Every word in ``q`` must match a word (or the start of one) in the item.
+    Items matching in the name rank first; page with ``offset`` and ``limit``.
+    """
+    storage = get_storage()
+    hits = get_search_index(storage).search(q, offset, limit)
+    found = storage.find_items(hits.item_ids)
+    if _fast_responses():
+        return FastJSONResponse(
+            {
+                "query": q,
+                "total": hits.total,
+                "offset": offset,
+                "limit": limit,
+                "items": [item_payload(found[i]) for i in hits.item_ids if i in found],
+            }
+        )
+    return SearchResults(
+        query=q,
+        total=hits.total,
+        offset=offset,
+        limit=limit,
+        items=[Item(**found[i]) for i in hits.item_ids if i in found],
+    )
+
+
+@router.post("/items:batch", response_model=ItemBatchResponse)
+async def find_items_batch(data: ItemBatchRequest) -> ItemBatchResponse | Response:
+    """
+    Find many items by id in one round trip.
+    Returns the items that exist, in request order, and the ids that do not.
+    """
+    storage = get_storage()
+    ids = list(dict.fromkeys(data.ids))
+    found = storage.find_items(ids)
+    if _fast_responses():
+        return FastJSONResponse(
+            {
+                "items": [item_payload(found[i]) for i in ids if i in found],
+                "missing": [i for i in ids if i not in found],
+            }
+        )
+    return ItemBatchResponse(
+        items=[Item(**found[i]) for i in ids if i in found],
+        missing=[i for i in ids if i not in found],
+    )
+
+
+@router.post("/items/{item_id}/reserve", response_model=Reservation, status_code=201)
+async def reserve_item(item_id: str, data: ReserveRequest) -> Reservation:
+    """
+    Atomically take units out of stock and hold them until the reservation
+    is released or expires. Published to INVENTORY_RESERVED_TOPIC, or to
+    INVENTORY_FAIL_TOPIC when there is not enough stock.
+    """
+    storage = get_storage()
+    events = get_inventory_events(storage)
+    reservations = get_reservation_service(storage)
+    try:
+        reservation = await reservations.reserve(item_id, data.quantity, data.ttl_seconds)
+    except ItemNotFound as nf:
+        raise HTTPException(status_code=404, detail="Item not found") from nf
+    except InsufficientStock as ins:
+        events.reservation_failed(ins.item_id, ins.requested, ins.available)
+        raise HTTPException(status_code=409, detail=str(ins)) from ins
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve)) from ve
+    events.reserved(reservation)
+    return Reservation(**reservation)
+
+
+@router.post("/reservations/{reservation_id}/release", response_model=Reservation)
+async def release_reservation(reservation_id: str) -> Reservation:
+    """
+    Release a reservation and put its units back in stock.
     """
-    db = get_db()
-    for cat in db.all():
-        for item in cat.get("items", []):
-            if item["id"] == item_id:
-                return Item(**item)
-    raise HTTPException(status_code=404, detail="Item not found")
+    reservations = get_reservation_service(get_storage())
+    try:
+        reservation = await reservations.release(reservation_id)
+    except ReservationNotFound as nf:
+        raise HTTPException(status_code=404, detail=str(nf)) from nf
+    return Reservation(**reservation)
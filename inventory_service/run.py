@@ -1,10 +1,39 @@
-import uvicorn
+import os
+
+from common import config
+from common.config import ServerConfig
+from common.launcher import serve, worker_count
+
+
+def prepare_workers(settings: ServerConfig) -> None:
+    """
+    Make the inventory safe to serve from several processes.
+
+    TinyDB keeps reservation holds in process memory and rewrites its whole
+    file on each write, so multiple workers need the SQLite backend, whose
+    stock updates are atomic across processes. The catalog is seeded once
+    here, and the workers start with INVENTORY_STARTUP_MODE=skip so none of
+    them reseeds underneath the others.
+    """
+    if worker_count(settings) <= 1:
+        return
+    backend = config.inventory_storage_setting.INVENTORY_STORAGE_BACKEND.lower()
+    if backend != "sqlite":
+        raise ValueError(
+            f"Running {worker_count(settings)} workers needs INVENTORY_STORAGE_BACKEND=sqlite; "
+            f"the '{backend}' backend keeps per-process state."
+        )
+
+    from inventory_service.core.db_init import ensure_inventory
+    from inventory_service.db import create_storage
+
+    storage = create_storage(backend)
+    try:
+        ensure_inventory(storage)
+    finally:
+        storage.close()
+    os.environ["INVENTORY_STARTUP_MODE"] = "skip"
+
 
 if __name__ == "__main__":
-    # Run the FastAPI app with Uvicorn
-    uvicorn.run(
-        "inventory_service.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-    )
+    serve("inventory_service.main:app", port=8000, prepare=prepare_workers)
@@ -0,0 +1,55 @@
+"""
+Seed (or explicitly reseed) the inventory catalog from the command line.
+
+    python -m inventory_service.seed --categories 100 --items-per-category 10000 --backend sqlite
+
+Options default to the INVENTORY_SEED* settings and INVENTORY_STORAGE_BACKEND.
+The catalog is always regenerated unless --if-changed is given, in which case
+a stored catalog built from the same settings is kept.
+"""
+
+import argparse
+import logging
+import os
+
+from common import config
+from inventory_service.core.db_init import ensure_inventory
+from inventory_service.db import create_storage
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed the inventory catalog.")
+    parser.add_argument("--categories", type=int, help="number of categories")
+    parser.add_argument("--items-per-category", type=int, help="items in each category")
+    parser.add_argument("--seed", type=int, help="random seed; same seed, same catalog")
+    parser.add_argument("--workers", type=int, help="generator processes; 0 = one per CPU")
+    parser.add_argument("--batch-size", type=int, help="item rows per insert batch")
+    parser.add_argument("--backend", choices=["tinydb", "sqlite"], help="storage backend")
+    parser.add_argument(
+        "--if-changed",
+        action="store_true",
+        help="keep the stored catalog if it was generated from the same settings",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(message)s")
+
+    overrides = {
+        "INVENTORY_SEED": args.seed,
+        "INVENTORY_SEED_CATEGORIES": args.categories,
+        "INVENTORY_SEED_ITEMS_PER_CATEGORY": args.items_per_category,
+        "INVENTORY_SEED_WORKERS": args.workers,
+        "INVENTORY_SEED_BATCH_SIZE": args.batch_size,
+        "INVENTORY_STARTUP_MODE": "reuse" if args.if_changed else "reseed",
+    }
+    settings = config.inventory_seed_setting.model_copy(
+        update={k: v for k, v in overrides.items() if v is not None}
+    )
+    storage = create_storage(args.backend)
+    try:
+        ensure_inventory(storage=storage, settings=settings)
+    finally:
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
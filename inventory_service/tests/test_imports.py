@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+import inventory_service
+
+
+def _loaded_after_import(module: str) -> set[str]:
+    out = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print(' '.join(sys.modules))"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return set(out.split())
+
+
+def test_package_import_does_not_load_the_app() -> None:
+    loaded = _loaded_after_import("inventory_service")
+    assert "fastapi" not in loaded
+    assert "inventory_service.main" not in loaded
+
+
+def test_storage_and_core_do_not_load_faker_or_fastapi() -> None:
+    loaded = _loaded_after_import("inventory_service.core")
+    assert "faker" not in loaded
+    assert "fastapi" not in loaded
+
+
+def test_app_and_factory_are_exported_lazily() -> None:
+    from inventory_service.main import app
+
+    assert inventory_service.app is app
+    assert inventory_service.create_app() is not app
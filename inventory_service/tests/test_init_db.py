@@ -1,20 +1,178 @@
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
 import pytest
+from pytest import MonkeyPatch
 from tinydb import TinyDB
 
-from inventory_service.core.db_init import init_inventory
+from common.config import InventorySeedConfig, InventoryStorageConfig, ServerConfig
+from inventory_service.core.db_init import (
+    build_category,
+    catalog_fingerprint,
+    category_name,
+    ensure_inventory,
+    generate_catalog,
+    init_inventory,
+)
+from inventory_service.db.sqlite_storage import SQLiteStorage
+from inventory_service.db.tinydb_storage import TinyDBStorage
+from inventory_service.main import app
 from inventory_service.models import CategoryWithItems
+from inventory_service.providers.apparel_vocabulary import TYPES_BY_CATEGORY
+from inventory_service.run import prepare_workers
 
 
-def test_init_inventory(monkeypatch: pytest.MonkeyPatch) -> None:
-    tmp_db = TinyDB("test_inventory.json")
-    # Patch the function used by the code under test
-    monkeypatch.setattr("inventory_service.db.get_db", lambda: tmp_db)
+def test_init_inventory(tmp_path: Path) -> None:
+    tmp_db = TinyDB(tmp_path / "test_inventory.json")
 
-    db = init_inventory(seed=123)
+    storage = init_inventory(seed=123, storage=TinyDBStorage(tmp_db))
 
-    data = db.all()
+    data = storage.all_categories()
 
     assert len(data) == 10
     for cat in data:
         m = CategoryWithItems(**cat)
         assert len(m.items) == 5
+
+
+def test_init_inventory_uses_configured_size(tmp_path: Path) -> None:
+    settings = InventorySeedConfig(
+        INVENTORY_SEED=7,
+        INVENTORY_SEED_CATEGORIES=13,
+        INVENTORY_SEED_ITEMS_PER_CATEGORY=40,
+        INVENTORY_SEED_WORKERS=1,
+        INVENTORY_SEED_BATCH_SIZE=100,
+    )
+
+    storage = init_inventory(storage=SQLiteStorage(":memory:"), settings=settings)
+
+    data = storage.all_categories()
+    assert len(data) == 13
+    assert {len(c["items"]) for c in data} == {40}
+    assert data[10]["name"] == "Tops 2"
+    assert storage.find_item("13-40") is not None
+
+
+def test_same_seed_same_catalog() -> None:
+    first = list(generate_catalog(3, 20, seed=5))
+    assert list(generate_catalog(3, 20, seed=5)) == first
+    assert list(generate_catalog(3, 20, seed=6)) != first
+
+
+def test_catalog_does_not_depend_on_worker_count() -> None:
+    assert list(generate_catalog(4, 10, seed=1, workers=2)) == list(generate_catalog(4, 10, seed=1))
+
+
+def test_category_is_independent_of_the_others() -> None:
+    # Category 3 draws from its own stream, so it does not shift with the catalog size.
+    assert list(generate_catalog(3, 5, seed=9))[2] == list(generate_catalog(8, 5, seed=9))[2]
+
+
+def test_category_names_repeat_with_series_number() -> None:
+    assert category_name(1) == ("Tops", "Tops")
+    assert category_name(10) == ("Kids", "Kids")
+    assert category_name(11) == ("Tops 2", "Tops")
+    assert category_name(26) == ("Footwear 3", "Footwear")
+
+
+def test_build_category() -> None:
+    cat = build_category(2, "Footwear", items_per_cat=3, seed=4)
+    assert cat.name == "Footwear"
+    assert [i.id for i in cat.items] == ["2-1", "2-2", "2-3"]
+    assert all(5 <= i.stock <= 50 and 15 <= i.price <= 150 for i in cat.items)
+    # Items follow the given type, not category 2's default ("Bottoms").
+    assert all(i.name.split(" ", 1)[1] in TYPES_BY_CATEGORY["Footwear"] for i in cat.items)
+
+
+def seed_settings(**overrides: Any) -> InventorySeedConfig:
+    values: dict[str, Any] = {
+        "INVENTORY_SEED": 1,
+        "INVENTORY_SEED_CATEGORIES": 2,
+        "INVENTORY_SEED_ITEMS_PER_CATEGORY": 3,
+        "INVENTORY_SEED_WORKERS": 1,
+        "INVENTORY_STARTUP_MODE": "reuse",
+    }
+    return InventorySeedConfig(**{**values, **overrides})
+
+
+def test_ensure_inventory_reuses_unchanged_catalog() -> None:
+    storage = SQLiteStorage(":memory:")
+    assert ensure_inventory(storage, seed_settings()) is True
+    storage.reserve("r1", "1-1", 1, expires_at=1e12)
+    stock = storage.find_item("1-1")
+
+    assert ensure_inventory(storage, seed_settings()) is False
+    assert storage.find_item("1-1") == stock
+
+
+def test_ensure_inventory_reseeds_when_settings_change() -> None:
+    storage = SQLiteStorage(":memory:")
+    ensure_inventory(storage, seed_settings())
+
+    assert ensure_inventory(storage, seed_settings(INVENTORY_SEED_ITEMS_PER_CATEGORY=4)) is True
+    assert storage.find_item("2-4") is not None
+
+
+def test_ensure_inventory_reseed_and_skip_modes() -> None:
+    storage = SQLiteStorage(":memory:")
+    assert ensure_inventory(storage, seed_settings(INVENTORY_STARTUP_MODE="skip")) is False
+    assert storage.list_categories() == []
+
+    ensure_inventory(storage, seed_settings())
+    assert ensure_inventory(storage, seed_settings(INVENTORY_STARTUP_MODE="reseed")) is True
+
+    with pytest.raises(ValueError):
+        ensure_inventory(storage, seed_settings(INVENTORY_STARTUP_MODE="sometimes"))
+
+
+def test_fingerprint_depends_on_every_input() -> None:
+    base = catalog_fingerprint(1, 2, 3)
+    assert catalog_fingerprint(1, 2, 3) == base
+    assert len({base, catalog_fingerprint(2, 2, 3), catalog_fingerprint(1, 3, 3)}) == 3
+    assert catalog_fingerprint(1, 2, 4) != base
+
+
+@pytest.mark.asyncio
+async def test_lifespan_records_startup_timings(
+    tmp_path: Path, monkeypatch: MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    storage = SQLiteStorage(str(tmp_path / "inventory.sqlite3"))
+    monkeypatch.setattr("inventory_service.main.get_storage", lambda: storage)
+    monkeypatch.setattr("common.config.inventory_seed_setting", seed_settings())
+
+    with caplog.at_level(logging.INFO, logger="inventory_service"):
+        async with app.router.lifespan_context(app):
+            assert set(app.state.startup_timings) == {"storage", "catalog", "search_index"}
+        async with app.router.lifespan_context(app):
+            pass
+
+    messages = [r.getMessage() for r in caplog.records if r.name == "inventory_service.main"]
+    assert "(seeded)" in messages[0]
+    assert "(reused catalog)" in messages[1]
+
+
+def test_multi_worker_launch_requires_sqlite_and_seeds_once(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    prod = ServerConfig(SERVER_PROFILE="prod", SERVER_WORKERS=2)
+    monkeypatch.setattr(
+        "common.config.inventory_storage_setting",
+        InventoryStorageConfig(INVENTORY_STORAGE_BACKEND="tinydb"),
+    )
+    with pytest.raises(ValueError, match="sqlite"):
+        prepare_workers(prod)
+
+    path = str(tmp_path / "inventory.sqlite3")
+    monkeypatch.setattr(
+        "common.config.inventory_storage_setting",
+        InventoryStorageConfig(INVENTORY_STORAGE_BACKEND="sqlite", INVENTORY_SQLITE_PATH=path),
+    )
+    monkeypatch.setattr("common.config.inventory_seed_setting", seed_settings())
+    monkeypatch.setenv("INVENTORY_STARTUP_MODE", "reseed")
+
+    prepare_workers(prod)
+
+    assert len(SQLiteStorage(path).list_categories()) == 2
+    assert os.environ["INVENTORY_STARTUP_MODE"] == "skip"
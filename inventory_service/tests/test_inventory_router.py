@@ -1,10 +1,18 @@
+import json
 from pathlib import Path
+from typing import Any
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 from pytest import MonkeyPatch
 from tinydb import TinyDB
 
+from common.config import InventoryHTTPConfig, ServerConfig
+from common.events import EventPublisher, InMemoryBroker
+from common.tracing import InMemoryExporter, RatioSampler, Tracer, use_tracer
+from inventory_service.db.pagination import SortField, encode_cursor
+from inventory_service.db.sqlite_storage import SQLiteStorage
+from inventory_service.db.tinydb_storage import TinyDBStorage
 from inventory_service.main import app  # use the same app the service runs
 
 
@@ -35,7 +43,8 @@ def fake_db(tmp_path: Path, monkeypatch: MonkeyPatch) -> TinyDB:
         }
     )
 
-    monkeypatch.setattr("inventory_service.routers.inventory.get_db", lambda: test_db)
+    storage = TinyDBStorage(test_db)
+    monkeypatch.setattr("inventory_service.routers.inventory.get_storage", lambda: storage)
 
     return test_db
 
@@ -109,6 +118,18 @@ async def test_find_item_by_id_success(fake_db: TinyDB) -> None:
     assert data["name"] == "Sneaker"
 
 
+@pytest.mark.asyncio
+async def test_find_item_by_id_reports_index_state(fake_db: TinyDB) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        first = await ac.get("/items/1-2")
+        second = await ac.get("/items/1-2")
+
+    assert first.headers["X-Item-Index"] == "stale"
+    assert second.headers["X-Item-Index"] == "fresh"
+    assert second.json()["name"] == "Loafer"
+
+
 @pytest.mark.asyncio
 async def test_find_item_by_id_not_found(fake_db: TinyDB) -> None:
     transport = ASGITransport(app=app)
@@ -116,3 +137,222 @@ async def test_find_item_by_id_not_found(fake_db: TinyDB) -> None:
         r = await ac.get("/items/not-here")
     assert r.status_code == 404
     assert r.json()["detail"] == "Item not found"
+
+
+@pytest.mark.asyncio
+async def test_find_items_batch(fake_db: TinyDB) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        r = await ac.post("/items:batch", json={"ids": ["1-2", "nope", "1-1", "1-2"]})
+
+    assert r.status_code == 200
+    data = r.json()
+    assert [i["id"] for i in data["items"]] == ["1-2", "1-1"]
+    assert data["missing"] == ["nope"]
+
+
+@pytest.mark.asyncio
+async def test_find_items_batch_rejects_empty_request(fake_db: TinyDB) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        r = await ac.post("/items:batch", json={"ids": []})
+
+    assert r.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_items_without_parameters_keeps_shape(fake_db: TinyDB) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/categories/1/items")
+
+    assert set(response.json()) == {"category", "items"}
+
+
+@pytest.mark.asyncio
+async def test_get_items_paginated(fake_db: TinyDB) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        first = await ac.get("/categories/1/items", params={"sort": "-price", "limit": 1})
+        second = await ac.get(
+            "/categories/1/items",
+            params={"sort": "-price", "limit": 1, "cursor": first.json()["next_cursor"]},
+        )
+        filtered = await ac.get("/categories/1/items", params={"max_price": 60})
+        bad = await ac.get("/categories/1/items", params={"cursor": "garbage"})
+
+    assert [i["id"] for i in first.json()["items"]] == ["1-2"]
+    assert [i["id"] for i in second.json()["items"]] == ["1-1"]
+    assert "next_cursor" not in second.json()
+    assert [i["id"] for i in filtered.json()["items"]] == ["1-1"]
+    assert bad.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["tinydb", "sqlite"])
+async def test_cursor_keys_of_the_wrong_type_are_rejected(
+    backend: str, fake_db: TinyDB, tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    if backend == "sqlite":
+        storage = SQLiteStorage(str(tmp_path / "inventory.sqlite3"))
+        storage.replace_all(fake_db.all())
+        monkeypatch.setattr("inventory_service.routers.inventory.get_storage", lambda: storage)
+    cases: list[tuple[SortField, Any, Any]] = [
+        ("price", "abc", "x"),
+        ("price", [1], "x"),
+        ("price", True, "x"),
+        ("name", 1, 2),
+        ("name", "Loafer", 2),
+        ("position", "0", "1-1"),
+    ]
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        for sort, key, item_id in cases:
+            params = {"cursor": encode_cursor(sort, (key, item_id))}
+            if sort != "position":
+                params["sort"] = sort
+            response = await ac.get("/categories/1/items", params=params)
+            assert response.status_code == 400, (sort, key, item_id)
+
+
+@pytest.mark.asyncio
+async def test_fast_responses_match_validated_responses(
+    fake_db: TinyDB, monkeypatch: MonkeyPatch
+) -> None:
+    paths = [
+        "/categories",
+        "/categories/1/items",
+        "/categories/1/items?sort=-price&limit=1",
+        "/categories/1/items/1-2",
+        "/items/1-1",
+        "/search?q=shoe",
+    ]
+    bodies: dict[bool, list[Any]] = {}
+    for fast in (True, False):
+        monkeypatch.setattr(
+            "common.config.server_setting", ServerConfig(SERVER_FAST_RESPONSES=fast)
+        )
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            responses = [await ac.get(path) for path in paths]
+            batch = await ac.post("/items:batch", json={"ids": ["1-2", "9-9"]})
+        assert all(r.status_code == 200 for r in responses)
+        assert responses[4].headers["X-Item-Index"] == "fresh"
+        bodies[fast] = [r.json() for r in responses] + [batch.json()]
+
+    assert bodies[True] == bodies[False]
+
+
+@pytest.mark.asyncio
+async def test_cached_listing_follows_stock_changes(fake_db: TinyDB) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        before = await ac.get("/categories/1/items")
+        await ac.post("/items/1-1/reserve", json={"quantity": 3})
+        after = await ac.get("/categories/1/items")
+        missing = await ac.get("/categories/9/items")
+
+    assert before.json()["items"][0]["stock"] == 10
+    assert after.json()["items"][0]["stock"] == 7
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_metrics_cover_routes_and_storage(fake_db: TinyDB) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        await ac.get("/items/1-1")
+        response = await ac.get("/metrics")
+
+    assert response.status_code == 200
+    assert 'http_requests_total{method="GET",route="/items/{item_id}",status="200"}' in (
+        response.text
+    )
+    assert 'inventory_storage_operation_seconds_count{backend="tinydb",operation="find_item"}' in (
+        response.text
+    )
+
+
+@pytest.mark.asyncio
+async def test_stock_changes_are_published(fake_db: TinyDB, monkeypatch: MonkeyPatch) -> None:
+    broker = InMemoryBroker()
+    publisher = EventPublisher(broker, linger=0)
+    monkeypatch.setattr("inventory_service.core.events._event_publisher", publisher)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        created = await ac.post("/items/1-2/reserve", json={"quantity": 2})
+        refused = await ac.post("/items/1-2/reserve", json={"quantity": 9})
+        await ac.post(f"/reservations/{created.json()['id']}/release")
+    await publisher.aclose()
+
+    assert refused.status_code == 409
+    stock = [json.loads(m.value) for m in broker.messages("inventory.stock_changed")]
+    assert [(e["type"], e["item"]["stock"]) for e in stock] == [
+        ("stock_changed", 3),
+        ("stock_changed", 5),
+    ]
+    assert broker.messages("inventory.stock_changed")[0].key == b"1-2"
+    (reserved,) = (json.loads(m.value) for m in broker.messages("inventory.reserved"))
+    assert (reserved["item_id"], reserved["remaining_stock"]) == ("1-2", 3)
+    (failed,) = (json.loads(m.value) for m in broker.messages("inventory.failed"))
+    assert (failed["requested"], failed["available"]) == (9, 3)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fast", [True, False])
+async def test_catalog_routes_answer_304_until_the_category_changes(
+    fake_db: TinyDB, monkeypatch: MonkeyPatch, fast: bool
+) -> None:
+    monkeypatch.setattr("common.config.server_setting", ServerConfig(SERVER_FAST_RESPONSES=fast))
+    monkeypatch.setattr(
+        "common.config.inventory_http_setting",
+        InventoryHTTPConfig(INVENTORY_HTTP_CACHE_CONTROL="public, max-age=10"),
+    )
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        for path in [
+            "/categories",
+            "/categories/1/items",
+            "/categories/1/items?limit=1",
+            "/items/1-2",
+        ]:
+            first = await ac.get(path)
+            etag = first.headers["ETag"]
+            assert first.headers["Cache-Control"] == "public, max-age=10"
+
+            again = await ac.get(path, headers={"If-None-Match": f'"other", {etag}'})
+            assert again.status_code == 304
+            assert again.content == b""
+            assert again.headers["ETag"] == etag
+
+        listing = await ac.get("/categories/1/items")
+        await ac.post("/items/1-1/reserve", json={"quantity": 1})
+        changed = await ac.get(
+            "/categories/1/items", headers={"If-None-Match": listing.headers["ETag"]}
+        )
+        wildcard = await ac.get("/categories", headers={"If-None-Match": "*"})
+
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != listing.headers["ETag"]
+    assert changed.json()["items"][0]["stock"] == 9
+    assert wildcard.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_storage_access_is_traced(fake_db: TinyDB) -> None:
+    exporter = InMemoryExporter()
+    previous = use_tracer(Tracer(exporter, RatioSampler(1.0)))
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            await ac.get("/items/1-1")
+    finally:
+        use_tracer(previous)
+
+    storage, server = exporter.finished()
+    assert server.name == "GET /items/{item_id}"
+    assert storage.name == "storage.find_item"
+    assert storage.parent_id == server.context.span_id
+    assert storage.attributes == {"db.system": "tinydb"}
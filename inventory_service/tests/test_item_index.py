@@ -0,0 +1,58 @@
+from pathlib import Path
+
+from tinydb import TinyDB
+
+from inventory_service.db import ItemIndex
+
+
+def _seed(db: TinyDB) -> None:
+    db.insert_multiple(
+        [
+            {
+                "id": 1,
+                "name": "Footwear",
+                "items": [{"id": "1-1", "name": "Sneaker"}, {"id": "1-2", "name": "Loafer"}],
+            },
+            {"id": 2, "name": "Tops", "items": [{"id": "2-1", "name": "Tee"}]},
+        ]
+    )
+
+
+def test_build_indexes_every_item(tmp_path: Path) -> None:
+    db = TinyDB(tmp_path / "db.json")
+    _seed(db)
+    index = ItemIndex()
+
+    index.build(db)
+
+    assert len(index) == 3
+    assert index.get("2-1") == (2, {"id": "2-1", "name": "Tee"})
+    assert index.get("missing") is None
+
+
+def test_is_stale_tracks_source_db(tmp_path: Path) -> None:
+    db = TinyDB(tmp_path / "db.json")
+    other = TinyDB(tmp_path / "other.json")
+    index = ItemIndex()
+
+    assert index.is_stale(db)
+    index.build(db)
+    assert not index.is_stale(db)
+    assert index.is_stale(other)
+
+    index.invalidate()
+    assert index.is_stale(db)
+    assert len(index) == 0
+
+
+def test_upsert_and_remove(tmp_path: Path) -> None:
+    db = TinyDB(tmp_path / "db.json")
+    _seed(db)
+    index = ItemIndex()
+    index.build(db)
+
+    index.upsert(2, {"id": "2-2", "name": "Polo"})
+    index.remove("1-1")
+
+    assert index.get("2-2") == (2, {"id": "2-2", "name": "Polo"})
+    assert index.get("1-1") is None
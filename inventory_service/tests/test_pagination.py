@@ -0,0 +1,133 @@
+import random
+from pathlib import Path
+from typing import Any
+
+import pytest
+from tinydb import TinyDB
+
+from inventory_service.db import InventoryStorage
+from inventory_service.db.pagination import ItemQuery, encode_cursor
+from inventory_service.db.sqlite_storage import SQLiteStorage
+from inventory_service.db.tinydb_storage import TinyDBStorage
+
+rng = random.Random(7)
+ITEMS: list[dict[str, Any]] = [
+    {
+        "id": f"1-{i}",
+        "name": rng.choice(["Tee", "Polo", "Hoodie", "Scarf"]) + f" {rng.randint(1, 9)}",
+        "description": "x",
+        "price": float(rng.choice([10, 15, 20, 25, 30])),
+        "stock": rng.choice([0, 3, 8]),
+    }
+    for i in range(1, 41)
+]
+
+
+@pytest.fixture(params=["tinydb", "sqlite"])
+def storage(request: pytest.FixtureRequest, tmp_path: Path) -> InventoryStorage:
+    backend: InventoryStorage
+    if request.param == "tinydb":
+        backend = TinyDBStorage(TinyDB(tmp_path / "inventory.json"))
+    else:
+        backend = SQLiteStorage(str(tmp_path / "inventory.sqlite3"))
+    backend.replace_all([{"id": 1, "name": "Tops", "items": ITEMS}])
+    return backend
+
+
+def _walk(storage: InventoryStorage, query: ItemQuery) -> list[dict[str, Any]]:
+    """Follow next_cursor until the last page and return every item seen."""
+    seen: list[dict[str, Any]] = []
+    cursor = None
+    while True:
+        page = storage.list_items(1, ItemQuery(**{**query.__dict__, "cursor": cursor}))
+        assert page is not None
+        assert query.limit is None or len(page.items) <= query.limit
+        seen.extend(page.items)
+        if page.next_cursor is None:
+            return seen
+        cursor = page.next_cursor
+
+
+@pytest.mark.parametrize(
+    "sort, descending",
+    [("position", False), ("price", False), ("price", True), ("name", False), ("name", True)],
+)
+def test_pages_cover_every_item_in_order(
+    storage: InventoryStorage, sort: Any, descending: bool
+) -> None:
+    def key(item: dict[str, Any]) -> Any:
+        return (ITEMS.index(item), item["id"]) if sort == "position" else (item[sort], item["id"])
+
+    expected = sorted(ITEMS, key=key, reverse=descending)
+
+    assert _walk(storage, ItemQuery(sort=sort, descending=descending, limit=7)) == expected
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_filters(storage: InventoryStorage, descending: bool) -> None:
+    query = ItemQuery(
+        sort="price", descending=descending, min_price=15, max_price=25, in_stock=True, limit=4
+    )
+    expected = sorted(
+        (i for i in ITEMS if 15 <= i["price"] <= 25 and i["stock"] > 0),
+        key=lambda i: (i["price"], i["id"]),
+        reverse=descending,
+    )
+
+    assert _walk(storage, query) == expected
+
+
+def test_unpaged_query_returns_whole_category(storage: InventoryStorage) -> None:
+    page = storage.list_items(1, ItemQuery())
+
+    assert page is not None
+    assert page.category == {"id": 1, "name": "Tops"}
+    assert page.items == ITEMS
+    assert page.next_cursor is None
+    assert storage.list_items(99, ItemQuery()) is None
+
+
+def test_bad_cursors_are_rejected(storage: InventoryStorage) -> None:
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        storage.list_items(1, ItemQuery(cursor="not-a-cursor", limit=5))
+    with pytest.raises(ValueError, match="does not match"):
+        storage.list_items(
+            1, ItemQuery(sort="name", cursor=encode_cursor("price", (10.0, "1-1")), limit=5)
+        )
+
+
+def test_stock_changes_show_up_in_pages(storage: InventoryStorage) -> None:
+    in_stock = next(i for i in ITEMS if i["stock"] > 0)
+    storage.reserve("r1", in_stock["id"], in_stock["stock"], expires_at=1e12)
+
+    page = storage.list_items(1, ItemQuery(in_stock=True))
+
+    assert page is not None
+    assert in_stock["id"] not in {i["id"] for i in page.items}
+
+
+def test_default_list_items_reads_a_category_once_per_version(storage: InventoryStorage) -> None:
+    reads: list[int] = []
+    get_category = storage.get_category
+
+    def counting_get_category(category_id: int) -> dict[str, Any] | None:
+        reads.append(category_id)
+        return get_category(category_id)
+
+    storage.get_category = counting_get_category  # type: ignore[method-assign]
+
+    def default_page(query: ItemQuery) -> list[dict[str, Any]]:
+        page = InventoryStorage.list_items(storage, 1, query)
+        assert page is not None
+        return page.items
+
+    first = default_page(ItemQuery(sort="price", limit=5))
+    by_name = default_page(ItemQuery(sort="name", limit=5))
+    assert first == sorted(ITEMS, key=lambda i: (i["price"], i["id"]))[:5]
+    assert by_name == sorted(ITEMS, key=lambda i: (i["name"], i["id"]))[:5]
+    assert reads == [1]
+
+    storage.reserve("r1", first[0]["id"], 1, expires_at=1e12)
+    assert default_page(ItemQuery(sort="price", limit=1))[0]["stock"] == first[0]["stock"] - 1
+    assert reads == [1, 1]
+    assert InventoryStorage.list_items(storage, 99, ItemQuery()) is None
@@ -0,0 +1,139 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from pytest import MonkeyPatch
+from tinydb import TinyDB
+
+from common.config import InventoryReservationConfig
+from inventory_service.core.reservations import ReservationService
+from inventory_service.db.storage import InsufficientStock
+from inventory_service.db.tinydb_storage import TinyDBStorage
+from inventory_service.main import app
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def storage(tmp_path: Path, monkeypatch: MonkeyPatch) -> TinyDBStorage:
+    backend = TinyDBStorage(TinyDB(tmp_path / "inventory.json"))
+    backend.replace_all(
+        [
+            {
+                "id": 1,
+                "name": "Footwear",
+                "items": [
+                    {
+                        "id": "1-1",
+                        "name": "Sneaker",
+                        "description": "Running shoe",
+                        "price": 59.99,
+                        "stock": 500,
+                    }
+                ],
+            }
+        ]
+    )
+    monkeypatch.setattr("inventory_service.routers.inventory.get_storage", lambda: backend)
+    return backend
+
+
+@pytest.fixture
+def settings() -> InventoryReservationConfig:
+    return InventoryReservationConfig(
+        RESERVATION_DEFAULT_TTL_SECONDS=60,
+        RESERVATION_MAX_TTL_SECONDS=120,
+        RESERVATION_SWEEP_INTERVAL_SECONDS=0.01,
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reservations_never_oversell(
+    storage: TinyDBStorage, settings: InventoryReservationConfig
+) -> None:
+    service = ReservationService(storage, settings)
+
+    async def attempt() -> bool:
+        try:
+            await service.reserve("1-1", 1)
+            return True
+        except InsufficientStock:
+            return False
+
+    results = await asyncio.gather(*(attempt() for _ in range(1_000)))
+
+    assert sum(results) == 500
+    assert storage.find_item("1-1")["stock"] == 0  # type: ignore[index]
+
+
+@pytest.mark.asyncio
+async def test_holds_expire_on_their_own(
+    storage: TinyDBStorage, settings: InventoryReservationConfig
+) -> None:
+    clock = FakeClock()
+    service = ReservationService(storage, settings, clock=clock)
+    reservation = await service.reserve("1-1", 10, ttl_seconds=30)
+    assert reservation["expires_at"] == 1_030.0
+
+    sweeper = asyncio.create_task(service.run_sweeper())
+    clock.now = 1_030.0
+    await asyncio.sleep(0.05)
+    sweeper.cancel()
+
+    assert storage.find_item("1-1")["stock"] == 500  # type: ignore[index]
+
+
+@pytest.mark.asyncio
+async def test_expired_holds_are_released_when_stock_runs_short(
+    storage: TinyDBStorage, settings: InventoryReservationConfig
+) -> None:
+    clock = FakeClock()
+    service = ReservationService(storage, settings, clock=clock)
+    await service.reserve("1-1", 400, ttl_seconds=30)
+    await service.reserve("1-1", 50, ttl_seconds=90)
+
+    clock.now = 1_030.0
+    reservation = await service.reserve("1-1", 100)
+
+    assert reservation["remaining_stock"] == 350  # the first hold expired, the second did not
+    with pytest.raises(InsufficientStock):
+        await service.reserve("1-1", 351)
+
+
+@pytest.mark.asyncio
+async def test_ttl_above_maximum_is_rejected(
+    storage: TinyDBStorage, settings: InventoryReservationConfig
+) -> None:
+    service = ReservationService(storage, settings)
+
+    with pytest.raises(ValueError, match="must not exceed 120"):
+        await service.reserve("1-1", 1, ttl_seconds=121)
+
+
+@pytest.mark.asyncio
+async def test_reserve_and_release_endpoints(storage: TinyDBStorage) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        reserved = await ac.post("/items/1-1/reserve", json={"quantity": 5, "ttl_seconds": 60})
+        too_many = await ac.post("/items/1-1/reserve", json={"quantity": 1_000})
+        missing = await ac.post("/items/9-9/reserve", json={"quantity": 1})
+        too_long = await ac.post("/items/1-1/reserve", json={"quantity": 1, "ttl_seconds": 1e9})
+        reservation_id = reserved.json()["id"]
+        released = await ac.post(f"/reservations/{reservation_id}/release")
+        released_again = await ac.post(f"/reservations/{reservation_id}/release")
+
+    assert reserved.status_code == 201
+    assert reserved.json()["remaining_stock"] == 495
+    assert too_many.status_code == 409
+    assert missing.status_code == 404
+    assert too_long.status_code == 400
+    assert released.status_code == 200
+    assert released.json()["remaining_stock"] == 500
+    assert released_again.status_code == 404
@@ -0,0 +1,175 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from pytest import MonkeyPatch
+from tinydb import TinyDB
+
+from inventory_service.core.search import SearchIndex, get_search_index, tokenize
+from inventory_service.db.tinydb_storage import TinyDBStorage
+from inventory_service.main import app
+
+
+def item(item_id: str, name: str, description: str = "", stock: int = 5) -> dict[str, Any]:
+    return {"id": item_id, "name": name, "description": description, "price": 10.0, "stock": stock}
+
+
+CATALOG: list[dict[str, Any]] = [
+    {
+        "id": 1,
+        "name": "Tops",
+        "items": [
+            item("1-1", "Classic Tee", "Classic Tee designed for comfort"),
+            item("1-2", "Premium Hoodie", "Soft fleece, pairs with a classic tee"),
+            item("1-3", "Classic Polo", "Polo designed for comfort"),
+        ],
+    },
+    {
+        "id": 2,
+        "name": "Footwear",
+        "items": [
+            item("2-1", "Running Shoes", "Lightweight runner"),
+            item("2-2", "Classic Sneakers", "Everyday sneaker designed for comfort"),
+        ],
+    },
+]
+
+
+@pytest.fixture
+def index() -> SearchIndex:
+    idx = SearchIndex()
+    idx.build(CATALOG)
+    return idx
+
+
+def test_tokenize_lowercases_and_splits_on_punctuation() -> None:
+    assert tokenize("Slip-Dress, A-LINE!") == ["slip", "dress", "a", "line"]
+
+
+def test_all_terms_must_match(index: SearchIndex) -> None:
+    hits = index.search("classic tee")
+    assert hits.total == 2
+    assert set(hits.item_ids) == {"1-1", "1-2"}
+
+
+def test_name_matches_rank_before_description_matches(index: SearchIndex) -> None:
+    # 1-1 has both words in its name, 1-2 only in its description.
+    assert index.search("classic tee").item_ids == ["1-1", "1-2"]
+    # Name matches keep catalog order, then the description-only match.
+    assert index.search("polo").item_ids == ["1-3"]
+    assert index.search("comfort").item_ids == ["1-1", "1-3", "2-2"]
+
+
+def test_prefix_matching(index: SearchIndex) -> None:
+    assert index.search("sneak").item_ids == ["2-2"]
+    assert index.search("run").item_ids == ["2-1"]  # "running" and "runner"
+    assert index.search("cl te").total == 2
+
+
+def test_prefixes_match_every_token_they_start() -> None:
+    idx = SearchIndex()
+    idx.build([{"id": 1, "items": [item(str(n), f"model{n:03}") for n in range(200)]}])
+
+    hits = idx.search("model", limit=200)
+
+    assert hits.total == 200
+    assert hits.item_ids == [str(n) for n in range(200)]
+
+
+def test_single_letter_terms_match_whole_tokens_only(index: SearchIndex) -> None:
+    assert index.search("c").total == 0
+    assert index.search("a").item_ids == ["1-2"]
+
+
+def test_no_match_and_empty_query(index: SearchIndex) -> None:
+    assert index.search("tuxedo").total == 0
+    assert index.search("  !! ").total == 0
+
+
+def test_pagination_spans_tiers(index: SearchIndex) -> None:
+    all_ids = index.search("classic", limit=10).item_ids
+    assert all_ids == ["1-1", "1-3", "2-2", "1-2"]
+
+    pages = [index.search("classic", offset=o, limit=2) for o in (0, 2, 4)]
+    assert [p.item_ids for p in pages] == [["1-1", "1-3"], ["2-2", "1-2"], []]
+    assert {p.total for p in pages} == {4}
+
+
+def test_dense_tier_scan_matches_sorted_order() -> None:
+    idx = SearchIndex()
+    idx.build([{"id": 1, "items": [item(str(n), f"thing {n % 3}") for n in range(300)]}])
+    assert idx.search("thing", offset=5, limit=3).item_ids == ["5", "6", "7"]
+    assert idx.search("0", limit=3).item_ids == ["0", "3", "6"]
+
+
+def test_upsert_reindexes_changed_text_only(index: SearchIndex) -> None:
+    index.search("hoodie")  # populate the result cache
+
+    index.upsert(item("1-2", "Premium Hoodie", "Soft fleece, pairs with a classic tee", stock=0))
+    assert index.search("hoodie").item_ids == ["1-2"]
+
+    index.upsert(item("1-2", "Zip Sweatshirt", "Soft fleece"))
+    assert index.search("hoodie").total == 0
+    assert index.search("zip").item_ids == ["1-2"]
+    assert index.search("classic tee").item_ids == ["1-1"]
+
+    index.upsert(item("3-1", "Zipper Pouch"))
+    assert index.search("zip").item_ids == ["1-2", "3-1"]
+    assert len(index) == 6
+
+
+def test_remove_drops_item_and_unused_tokens(index: SearchIndex) -> None:
+    index.remove("2-1")
+    assert index.search("running").total == 0
+    assert index.search("run").total == 0
+    assert len(index) == 4
+
+
+def test_index_follows_storage_changes(tmp_path: Path) -> None:
+    storage = TinyDBStorage(TinyDB(tmp_path / "inventory.json"))
+    storage.replace_all(CATALOG)
+    index = get_search_index(storage)
+    assert get_search_index(storage) is index
+    assert index.search("sneakers").item_ids == ["2-2"]
+
+    storage.replace_all([{"id": 9, "name": "Kids", "items": [item("9-1", "Graphic Tee")]}])
+    assert index.search("sneakers").total == 0
+    assert index.search("graphic").item_ids == ["9-1"]
+
+
+@pytest.fixture
+def storage(tmp_path: Path, monkeypatch: MonkeyPatch) -> TinyDBStorage:
+    backend = TinyDBStorage(TinyDB(tmp_path / "inventory.json"))
+    backend.replace_all(CATALOG)
+    monkeypatch.setattr("inventory_service.routers.inventory.get_storage", lambda: backend)
+    return backend
+
+
+@pytest.mark.asyncio
+async def test_search_endpoint(storage: TinyDBStorage) -> None:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        r = await ac.get("/search", params={"q": "Classic", "limit": 2, "offset": 1})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["total"] == 4
+    assert (body["query"], body["offset"], body["limit"]) == ("Classic", 1, 2)
+    assert [i["id"] for i in body["items"]] == ["1-3", "2-2"]
+    assert body["items"][0]["name"] == "Classic Polo"
+
+
+@pytest.mark.asyncio
+async def test_search_endpoint_returns_current_stock(storage: TinyDBStorage) -> None:
+    storage.reserve("r1", "2-1", 2, expires_at=1e12)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        r = await ac.get("/search", params={"q": "running"})
+    assert [i["stock"] for i in r.json()["items"]] == [3]
+
+
+@pytest.mark.asyncio
+async def test_search_endpoint_validates_params(storage: TinyDBStorage) -> None:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        assert (await ac.get("/search")).status_code == 422
+        assert (await ac.get("/search", params={"q": "tee", "limit": 0})).status_code == 422
+        r = await ac.get("/search", params={"q": "tuxedo"})
+    assert r.json() == {"query": "tuxedo", "total": 0, "offset": 0, "limit": 20, "items": []}
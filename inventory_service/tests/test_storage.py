@@ -0,0 +1,308 @@
+import sqlite3
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from tinydb import TinyDB
+
+from inventory_service.db import InventoryStorage, create_storage
+from inventory_service.db.migrate import migrate
+from inventory_service.db.sqlite_storage import SQLiteStorage
+from inventory_service.db.storage import (
+    STORAGE_LATENCY,
+    InsufficientStock,
+    ItemNotFound,
+    ReservationNotFound,
+)
+from inventory_service.db.tinydb_storage import TinyDBStorage
+
+CATALOG: list[dict[str, Any]] = [
+    {
+        "id": 1,
+        "name": "Footwear",
+        "items": [
+            {"id": "1-1", "name": "Sneaker", "description": "Running", "price": 59.99, "stock": 10},
+            {"id": "1-2", "name": "Loafer", "description": "Casual", "price": 89.99, "stock": 5},
+        ],
+    },
+    {
+        "id": 2,
+        "name": "Tops",
+        "items": [{"id": "2-1", "name": "Tee", "description": "Cotton", "price": 15.0, "stock": 7}],
+    },
+]
+
+
+@pytest.fixture(params=["tinydb", "sqlite"])
+def storage(request: pytest.FixtureRequest, tmp_path: Path) -> InventoryStorage:
+    backend: InventoryStorage
+    if request.param == "tinydb":
+        backend = TinyDBStorage(TinyDB(tmp_path / "inventory.json"))
+    else:
+        backend = SQLiteStorage(str(tmp_path / "inventory.sqlite3"))
+    backend.replace_all(CATALOG)
+    return backend
+
+
+def test_list_categories(storage: InventoryStorage) -> None:
+    assert storage.list_categories() == [{"id": 1, "name": "Footwear"}, {"id": 2, "name": "Tops"}]
+
+
+def test_get_category(storage: InventoryStorage) -> None:
+    cat = storage.get_category(1)
+
+    assert cat is not None
+    assert cat["name"] == "Footwear"
+    assert [i["id"] for i in cat["items"]] == ["1-1", "1-2"]
+    assert storage.get_category(99) is None
+
+
+def test_find_item(storage: InventoryStorage) -> None:
+    assert storage.find_item("2-1") == CATALOG[1]["items"][0]
+    assert storage.find_item("missing") is None
+    assert not storage.index_is_stale()
+
+
+def test_replace_all_drops_previous_catalog(storage: InventoryStorage) -> None:
+    storage.replace_all(CATALOG[1:])
+
+    assert storage.all_categories() == CATALOG[1:]
+    assert storage.find_item("1-1") is None
+
+
+def test_create_storage_rejects_unknown_backend() -> None:
+    with pytest.raises(ValueError, match="Unknown inventory storage backend 'mongo'."):
+        create_storage("mongo")
+
+
+def test_migrate_tinydb_to_sqlite(tmp_path: Path) -> None:
+    source = tmp_path / "inventory.json"
+    target = tmp_path / "inventory.sqlite3"
+    src = TinyDBStorage(TinyDB(source))
+    src.replace_all(CATALOG)
+    src.set_meta("seed_fingerprint", "abc")
+    src.close()
+
+    count = migrate(str(source), str(target))
+
+    assert count == 3
+    dst = SQLiteStorage(str(target))
+    assert dst.all_categories() == CATALOG
+    assert dst.get_meta("seed_fingerprint") == "abc"
+
+
+def test_migrate_missing_source(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        migrate(str(tmp_path / "nope.json"), str(tmp_path / "out.sqlite3"))
+
+
+def test_find_items(storage: InventoryStorage) -> None:
+    found = storage.find_items(["2-1", "missing", "1-1", "2-1"])
+
+    assert set(found) == {"1-1", "2-1"}
+    assert found["1-1"]["name"] == "Sneaker"
+
+
+def test_reserve_and_release(storage: InventoryStorage) -> None:
+    reservation = storage.reserve("r1", "1-2", 3, expires_at=100.0)
+
+    assert reservation == {
+        "id": "r1",
+        "item_id": "1-2",
+        "quantity": 3,
+        "expires_at": 100.0,
+        "remaining_stock": 2,
+    }
+    assert storage.find_item("1-2")["stock"] == 2  # type: ignore[index]
+    assert storage.get_category(1)["items"][1]["stock"] == 2  # type: ignore[index]
+
+    released = storage.release("r1")
+
+    assert released["remaining_stock"] == 5
+    assert storage.find_item("1-2")["stock"] == 5  # type: ignore[index]
+    with pytest.raises(ReservationNotFound):
+        storage.release("r1")
+
+
+def test_reserve_rejects_missing_item_and_short_stock(storage: InventoryStorage) -> None:
+    with pytest.raises(ItemNotFound):
+        storage.reserve("r1", "missing", 1, expires_at=100.0)
+    with pytest.raises(InsufficientStock, match="has 5 in stock, cannot reserve 6"):
+        storage.reserve("r2", "1-2", 6, expires_at=100.0)
+
+    assert storage.find_item("1-2")["stock"] == 5  # type: ignore[index]
+
+
+def test_expire_reservations(storage: InventoryStorage) -> None:
+    storage.reserve("early", "1-1", 1, expires_at=10.0)
+    storage.reserve("late", "1-1", 2, expires_at=20.0)
+    storage.reserve("released", "1-1", 3, expires_at=5.0)
+    storage.release("released")
+
+    expired = storage.expire_reservations(now=10.0)
+
+    assert [r["id"] for r in expired] == ["early"]
+    assert storage.find_item("1-1")["stock"] == 8  # type: ignore[index]
+    assert storage.expire_reservations(now=10.0) == []
+
+
+def test_reservations_survive_a_restart(storage: InventoryStorage, tmp_path: Path) -> None:
+    storage.reserve("early", "1-1", 3, expires_at=10.0)
+    storage.reserve("late", "1-2", 2, expires_at=20.0)
+    storage.close()
+    reopened: InventoryStorage
+    if isinstance(storage, TinyDBStorage):
+        reopened = TinyDBStorage(TinyDB(tmp_path / "inventory.json"))
+    else:
+        reopened = SQLiteStorage(str(tmp_path / "inventory.sqlite3"))
+
+    assert reopened.find_item("1-1")["stock"] == 7  # type: ignore[index]
+    assert [r["id"] for r in reopened.expire_reservations(now=10.0)] == ["early"]
+    assert reopened.release("late")["remaining_stock"] == 5
+    assert reopened.find_item("1-1")["stock"] == 10  # type: ignore[index]
+    with pytest.raises(ReservationNotFound):
+        reopened.release("early")
+    reopened.close()
+
+
+class RecordingListener:
+    def __init__(self) -> None:
+        self.events: list[str] = []
+        self.changed: list[dict[str, Any]] = []
+
+    def catalog_cleared(self) -> None:
+        self.events.append("cleared")
+
+    def category_added(self, category: dict[str, Any]) -> None:
+        self.events.append(f"category {category['id']}")
+
+    def item_changed(self, item: dict[str, Any]) -> None:
+        self.changed.append(item)
+
+
+def test_listeners_see_reseeds_and_stock_changes(storage: InventoryStorage) -> None:
+    listener = RecordingListener()
+    storage.add_listener(listener)
+
+    storage.reserve("r1", "1-1", 4, expires_at=100.0)
+    storage.release("r1")
+    storage.replace_all(CATALOG)
+
+    assert [(i["id"], i["stock"]) for i in listener.changed] == [("1-1", 6), ("1-1", 10)]
+    assert listener.changed[0]["name"] == "Sneaker"
+    assert listener.events == ["cleared", "category 1", "category 2"]
+
+    storage.remove_listener(listener)
+    storage.reserve("r2", "1-1", 1, expires_at=100.0)
+    assert len(listener.changed) == 2
+
+
+def test_only_nested_storage_calls_go_unrecorded(tmp_path: Path) -> None:
+    storage = TinyDBStorage(TinyDB(tmp_path / "inventory.json"))
+    storage.replace_all(CATALOG)
+    find_item = STORAGE_LATENCY.labels("tinydb", "find_item")
+    before = find_item.count
+
+    class LookingUp(RecordingListener):
+        def item_changed(self, item: dict[str, Any]) -> None:
+            storage.find_item("2-1")  # nested in reserve: part of it
+            other = threading.Thread(target=storage.find_item, args=("2-1",))
+            other.start()  # overlapping, from another thread: recorded
+            other.join()
+
+    storage.add_listener(LookingUp())
+    storage.reserve("r1", "1-1", 1, expires_at=100.0)
+
+    assert find_item.count - before == 1
+
+
+def test_replace_all_streams_generator_in_batches(storage: InventoryStorage) -> None:
+    def categories() -> Iterator[dict[str, Any]]:
+        for cid in range(1, 4):
+            yield {
+                "id": cid,
+                "name": f"Category {cid}",
+                "items": [
+                    {"id": f"{cid}-{n}", "name": "x", "description": "", "price": 1.0, "stock": 1}
+                    for n in range(7)
+                ],
+            }
+
+    storage.replace_all(categories(), batch_size=5)
+
+    assert [c["id"] for c in storage.list_categories()] == [1, 2, 3]
+    assert len(storage.find_items(f"{c}-{n}" for c in range(1, 4) for n in range(7))) == 21
+
+
+def test_failed_sqlite_reseed_rolls_back_and_replays_listeners(tmp_path: Path) -> None:
+    storage = SQLiteStorage(str(tmp_path / "inventory.sqlite3"))
+    storage.replace_all(CATALOG)
+    listener = RecordingListener()
+    storage.add_listener(listener)
+
+    with pytest.raises(sqlite3.IntegrityError):
+        storage.replace_all([CATALOG[0], CATALOG[0]])  # duplicate category id
+
+    assert [c["id"] for c in storage.list_categories()] == [1, 2]
+    assert listener.events[-3:] == ["cleared", "category 1", "category 2"]
+
+
+def test_meta_round_trip_and_reset_on_replace_all(storage: InventoryStorage) -> None:
+    assert storage.get_meta("seed_fingerprint") is None
+    storage.set_meta("seed_fingerprint", "abc")
+    storage.set_meta("seed_fingerprint", "def")
+    assert storage.get_meta("seed_fingerprint") == "def"
+    assert storage.list_categories() == [{"id": 1, "name": "Footwear"}, {"id": 2, "name": "Tops"}]
+
+    storage.replace_all(CATALOG)
+    assert storage.get_meta("seed_fingerprint") is None
+
+
+def test_versions_follow_stock_changes_and_reseeds(storage: InventoryStorage) -> None:
+    catalog, footwear, tops = (
+        storage.catalog_version(),
+        storage.category_version(1),
+        storage.category_version(2),
+    )
+    assert storage.item_version("1-2") == footwear
+    assert storage.category_version(99) is None and storage.item_version("missing") is None
+
+    reservation = storage.reserve("r1", "1-1", 2, expires_at=1e12)
+    reserved = storage.category_version(1)
+    storage.release(reservation["id"])
+
+    assert len({footwear, reserved, storage.category_version(1)}) == 3
+    assert storage.category_version(2) == tops
+    assert storage.catalog_version() == catalog
+
+    storage.replace_all(CATALOG)
+    assert storage.catalog_version() != catalog
+    assert storage.category_version(2) != tops
+
+
+def test_sqlite_versions_are_shared_between_connections(tmp_path: Path) -> None:
+    path = str(tmp_path / "inventory.sqlite3")
+    first, second = SQLiteStorage(path), SQLiteStorage(path)
+    first.replace_all(CATALOG)
+    before = second.category_version(1)
+
+    first.reserve("r1", "1-1", 1, expires_at=1e12)
+
+    assert second.category_version(1) == first.category_version(1) != before
+
+
+def test_sqlite_adds_versions_to_existing_files(tmp_path: Path) -> None:
+    path = tmp_path / "legacy.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE categories (id INTEGER PRIMARY KEY, name TEXT NOT NULL,"
+        " position INTEGER NOT NULL);"
+        "INSERT INTO categories VALUES (1, 'Footwear', 0);"
+    )
+    conn.close()
+
+    storage = SQLiteStorage(str(path))
+
+    assert storage.category_version(1) == f"{storage.catalog_version()}-0"
@@ -12,6 +12,7 @@ TOPICS = [
     "payments.failed",
     "inventory.reserved",
     "inventory.failed",
+    "inventory.stock_changed",
     "shipping.started",
     "shipping.completed",
 ]